@@ -0,0 +1,319 @@
+"""
+Ağa çıkmadan hattın performansını ölçen benchmark. Yerel sahte Spotify sunucusunu (benchmarks.fake_spotify)
+ayrı bir süreçte başlatır ve motorun okuma/yazma adımlarını sentetik diskografilerle (sanatçı başına 10, 100,
+1000 albüm) soğuk önbellekle çalıştırır. Her senaryo için duvar saati süresi, istek/429/tekrar sayıları ve
+tracemalloc tepe belleği raporlanır; `--baseline` ile önceki bir sonuca göre gerileme varsa çıkış kodu 1 olur.
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --sizes 100 --latency-ms 30 --rate-limit-every 40 --json sonuc.json
+    python -m benchmarks.bench_pipeline --baseline sonuc.json
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import spotipy
+
+from benchmarks.fake_spotify import artist_id
+from paradox_async import AsyncHarvester, async_available
+from paradox_cache import MetadataCache
+from paradox_engine import HARVEST_WORKERS, JobSpec, PlaylistEngine, print_log
+from paradox_net import AdaptivePacer, RequestStats, TokenBucket, build_spotify_session
+from paradox_select import SELECTION_STRATEGIES
+
+DEFAULT_SIZES: Tuple[int, ...] = (10, 100, 1000)
+DEFAULT_ARTISTS: int = 2
+# Ölçülen şey hattın kendisi olsun diye hız sınırı varsayılan olarak çok yüksek tutulur;
+# gerçek sınırla ölçmek için --rps 15 verin (paradox_net.SPOTIFY_MAX_RPS)
+DEFAULT_RPS: float = 1000.0
+DEFAULT_TOLERANCE: float = 0.25
+# OVERWRITE senaryosunda playlist'in hedeften ne kadarının (karışık sırayla) zaten bulunduğu
+OVERWRITE_KEEP_RATIO: float = 0.7
+
+REPO_ROOT: Path = Path(__file__).resolve().parent.parent
+
+Measured = Callable[[], int]
+
+
+class StaticToken:
+    """Sahte sunucu token'ı doğrulamaz; async istemcinin beklediği arayüzü sağlar."""
+
+    def get_access_token(self, as_dict: bool = False) -> str:
+        return "bench"
+
+
+class BenchContext:
+    """Senaryoların ortak ayarları; her çağrıda soğuk önbellekli yeni bir motor kurar."""
+
+    def __init__(self, base_url: str, album_count: int, artists: int, workers: int, rps: float,
+                 work_dir: Path, verbose: bool = False):
+        self.base_url = base_url
+        self.album_count = album_count
+        self.artists = {artist_id(album_count, i): f"Artist {i}" for i in range(artists)}
+        self.workers = workers
+        self.rps = rps
+        self.work_dir = work_dir
+        self.log = print_log if verbose else (lambda message, type="info": None)
+        self._caches = 0
+
+    def job(self, **fields) -> JobSpec:
+        spec = JobSpec(artists=dict(self.artists), upload_cover=False, **fields)
+        spec.validate()
+        return spec
+
+    def new_cache(self) -> MetadataCache:
+        self._caches += 1
+        return MetadataCache(self.work_dir / f"cache-{self.album_count}-{self._caches}.sqlite")
+
+    def new_engine(self) -> PlaylistEngine:
+        stats = RequestStats()
+        self.bucket = TokenBucket(rate=self.rps, capacity=max(int(self.rps), 1))
+        session = build_spotify_session(self.bucket, pool_size=self.workers, write_pacer=AdaptivePacer(), request_stats=stats)
+        sp = spotipy.Spotify(auth="bench", requests_session=session)
+        sp.prefix = self.base_url
+        return PlaylistEngine(
+            sp, "bench", self.new_cache(), AdaptivePacer(), log=self.log, workers=self.workers, request_stats=stats
+        )
+
+
+# --- Senaryolar: hazırlığı yapar (ölçülmez), ölçülecek fonksiyonu döndürür; fonksiyon üretilen öğe sayısını verir ---
+
+def scenario_artist_albums(ctx: BenchContext) -> Tuple[PlaylistEngine, Measured]:
+    engine = ctx.new_engine()
+    return engine, lambda: sum(len(engine._get_artist_albums(a, ['album', 'single'])) for a in ctx.artists)
+
+
+def album_ids_of(engine: PlaylistEngine, ctx: BenchContext) -> List[str]:
+    return [album['id'] for a in ctx.artists for album in engine._get_artist_albums(a, ['album', 'single'])]
+
+
+def scenario_album_tracks(ctx: BenchContext) -> Tuple[PlaylistEngine, Measured]:
+    # `_get_tracks_from_album` tek albümlük sarmalayıcıdır; hat aynı yolu gruplar ve işçi havuzuyla kullanır
+    engine = ctx.new_engine()
+    album_ids = album_ids_of(engine, ctx)
+
+    def run() -> int:
+        with ThreadPoolExecutor(max_workers=engine.workers) as executor:
+            return sum(len(uris) for _, uris in engine._iter_tracks_from_albums(album_ids, True, executor))
+    return engine, run
+
+
+def scenario_iceberg(ctx: BenchContext) -> Tuple[PlaylistEngine, Measured]:
+    engine = ctx.new_engine()
+    job = ctx.job(sort_type="ICEBERG")
+    strategy = SELECTION_STRATEGIES[job.sort_type]
+    return engine, lambda: len(strategy.select(engine._build_candidate_table(job, strategy), job.max_tracks))
+
+
+def scenario_write_new(ctx: BenchContext) -> Tuple[PlaylistEngine, Measured]:
+    # Tam hat: toplama sürerken yeni playlist'e akışlı yazma
+    engine = ctx.new_engine()
+    job = ctx.job(sort_type="TRACK", playlist_mode="NEW", playlist_name=f"bench {ctx.album_count}")
+    return engine, lambda: engine.run(job).track_count
+
+
+def scenario_overwrite(ctx: BenchContext) -> Tuple[PlaylistEngine, Measured]:
+    # Fark yazma: hedefin bir kısmını karışık sırayla ve fazladan parçalar içeren playlist hedefe eşitlenir
+    setup = ctx.new_engine()
+    target = list(setup._iter_album_track_uris(ctx.job()))
+    rng = random.Random(ctx.album_count)
+    current = rng.sample(target, int(len(target) * OVERWRITE_KEEP_RATIO))
+    current += [uri.replace(":track:tr", ":track:tx") for uri in target[:len(target) // 10]]
+    rng.shuffle(current)
+    playlist_id = setup.sp.user_playlist_create("bench", f"bench overwrite {ctx.album_count}")['id']
+    for i in range(0, len(current), 100):
+        setup.sp.playlist_add_items(playlist_id, current[i:i + 100])
+    setup.metadata_cache.close()
+
+    engine = ctx.new_engine()
+    return engine, lambda: engine._sync_playlist_tracks(playlist_id, target)
+
+
+def scenario_async_harvest(ctx: BenchContext) -> Tuple[PlaylistEngine, Measured]:
+    engine = ctx.new_engine()
+    harvester = AsyncHarvester(
+        StaticToken(), ctx.bucket, engine.metadata_cache, log=ctx.log, request_stats=engine.request_stats,
+        api_prefix=ctx.base_url
+    )
+    artist_types = [(a, album_type) for a in ctx.artists for album_type in ('album', 'single')]
+
+    def run() -> int:
+        harvester.prefetch(artist_types)
+        return sum(len(albums) for albums in engine.metadata_cache.get_many(
+            'artist_albums', [f"{a}:{album_type}" for a, album_type in artist_types]
+        ).values())
+    return engine, run
+
+
+SCENARIOS: Dict[str, Callable[[BenchContext], Tuple[PlaylistEngine, Measured]]] = {
+    'artist_albums': scenario_artist_albums,
+    'album_tracks': scenario_album_tracks,
+    'iceberg': scenario_iceberg,
+    'write_new': scenario_write_new,
+    'overwrite': scenario_overwrite,
+    'async_harvest': scenario_async_harvest,
+}
+
+
+def measure(scenario: Callable[[BenchContext], Tuple[PlaylistEngine, Measured]], ctx: BenchContext,
+            trace_memory: bool) -> dict:
+    engine, run = scenario(ctx)
+    before = engine.request_stats.snapshot()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        items = run()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        engine.metadata_cache.close()
+    after = engine.request_stats.snapshot()
+    return {
+        'items': items,
+        'seconds': round(seconds, 4),
+        'requests': after['requests'] - before['requests'],
+        'rate_limited': after['rate_limited'] - before['rate_limited'],
+        'retries': after['retries'] - before['retries'],
+        'peak_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def run_benchmarks(args: argparse.Namespace, base_url: str, work_dir: Path) -> List[dict]:
+    results: List[dict] = []
+    for size in args.sizes:
+        ctx = BenchContext(base_url, size, args.artists, args.workers, args.rps, work_dir, verbose=args.verbose)
+        for name in args.scenarios:
+            # Süre tracemalloc olmadan ölçülür (izleme Python kodunu belirgin yavaşlatır); bellek ayrı bir turda
+            timings = [measure(SCENARIOS[name], ctx, trace_memory=False) for _ in range(args.repeat)]
+            result = min(timings, key=lambda timing: timing['seconds'])
+            if not args.no_memory:
+                result['peak_mb'] = measure(SCENARIOS[name], ctx, trace_memory=True)['peak_mb']
+            result = {'scenario': name, 'albums_per_artist': size, **result}
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def print_header():
+    print(f"{'Senaryo':<14} {'Albüm':>6} {'Öğe':>8} {'Süre (sn)':>10} {'İstek':>7} {'429':>5} {'Tekrar':>7} {'Tepe MB':>8}")
+
+
+def print_result(result: dict):
+    print(
+        f"{result['scenario']:<14} {result['albums_per_artist']:>6} {result['items']:>8} {result['seconds']:>10.3f} "
+        f"{result['requests']:>7} {result['rate_limited']:>5} {result['retries']:>7} {result['peak_mb']:>8.2f}",
+        flush=True
+    )
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Önceki sonuçlara göre gerilemeleri döndürür: istek sayısı artışı, süre/bellek için tolerans aşımı."""
+    previous = {(item['scenario'], item['albums_per_artist']): item for item in baseline}
+    regressions: List[str] = []
+    for result in results:
+        base = previous.get((result['scenario'], result['albums_per_artist']))
+        if not base:
+            continue
+        label = f"{result['scenario']} ({result['albums_per_artist']} albüm)"
+        if result['requests'] > base['requests']:
+            regressions.append(f"{label}: istek sayısı {base['requests']} -> {result['requests']}")
+        for key, unit in (('seconds', "sn"), ('peak_mb', "MB")):
+            if base[key] and result[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{label}: {key} {base[key]} -> {result[key]} {unit} (+{result[key] / base[key] - 1:.0%})")
+    return regressions
+
+
+def start_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """Sunucu ayrı süreçte çalışır; böylece ne CPU'su ne de belleği ölçümlere karışır."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.fake_spotify",
+            "--latency-ms", str(args.latency_ms), "--rate-limit-every", str(args.rate_limit_every),
+            "--retry-after", str(args.retry_after), "--tracks-per-album", str(args.tracks_per_album),
+        ],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True
+    )
+    base_url = process.stdout.readline().strip()
+    if not base_url:
+        process.kill()
+        raise RuntimeError("Sahte Spotify sunucusu başlatılamadı.")
+    return process, base_url
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bench_pipeline", description="PARADOX hattını yerel sahte Spotify sunucusuna karşı ölçer."
+    )
+    parser.add_argument(
+        "--sizes", type=lambda value: [int(item) for item in parse_list(value)], default=list(DEFAULT_SIZES),
+        help="Sanatçı başına albüm sayıları, virgülle ayrılmış (varsayılan: 10,100,1000)."
+    )
+    parser.add_argument("--artists", type=int, default=DEFAULT_ARTISTS, help="Senaryo başına sanatçı sayısı.")
+    parser.add_argument(
+        "--scenarios", type=parse_list, default=None, help=f"Çalıştırılacak senaryolar ({','.join(SCENARIOS)})."
+    )
+    parser.add_argument("--workers", type=int, default=HARVEST_WORKERS, help="Paralel işçi sayısı.")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS, help="İstemci tarafı istek/sn sınırı.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Sunucunun her isteğe eklediği gecikme.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Sunucu her N. isteği 429 ile reddeder.")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="429 yanıtlarındaki Retry-After (saniye).")
+    parser.add_argument("--tracks-per-album", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=1, help="Süre ölçümü tekrarı (en hızlısı raporlanır).")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc ile tepe bellek ölçümünü atla.")
+    parser.add_argument("--json", metavar="PATH", help="Sonuçları JSON olarak yaz (sonraki çalıştırmada --baseline).")
+    parser.add_argument("--baseline", metavar="PATH", help="Önceki JSON sonucu; gerileme varsa çıkış kodu 1.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Süre/bellek için izin verilen artış oranı.")
+    parser.add_argument("--verbose", action="store_true", help="Motor loglarını yazdır.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.scenarios = args.scenarios or [name for name in SCENARIOS if name != 'async_harvest' or async_available()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        print(f"Bilinmeyen senaryo: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    process, base_url = start_server(args)
+    try:
+        with tempfile.TemporaryDirectory(prefix="paradox-bench-") as work_dir:
+            print_header()
+            results = run_benchmarks(args, base_url, Path(work_dir))
+    finally:
+        process.terminate()
+        process.wait()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            'config': {key: value for key, value in vars(args).items() if key not in ('json', 'baseline', 'verbose')},
+            'results': results,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline['results'], args.tolerance)
+        for line in regressions:
+            print(f"GERİLEME: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("Gerileme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Arayüzün soğuk açılış ölçümü. Her tekrar yeni bir Python sürecinde yapılır: `paradox_spotify` modülünün
+yüklenme süresi (pencere açılmadan önce beklenen kısım) ve arka planda yüklenen ağ katmanının süresi
+ölçülür. Arayüz modülü ağır modüllerden (spotipy, requests, Pillow) birini yüklerse veya ortanca süre
+STARTUP_TARGET_SECONDS'ı aşarsa çıkış kodu 1 olur. Çalışan uygulama ayrıca her açılışta aşama bazlı
+açılış raporunu log paneline yazar.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --json acilis.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT: Path = Path(__file__).resolve().parent.parent
+
+DEFAULT_REPEAT: int = 5
+# Arayüz modülü yüklenirken bunların hiçbiri yüklenmemelidir (httpx Flet'in kendi bağımlılığıdır)
+LAZY_MODULES: Tuple[str, ...] = ("spotipy", "requests", "PIL", "paradox_engine", "paradox_net")
+
+PROBE: str = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {modules}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {lazy!r} if m in sys.modules]}}))\n"
+)
+
+TARGETS: Dict[str, str] = {
+    "ui": "paradox_spotify",
+    "backend": "paradox_engine, paradox_async",
+}
+
+
+def probe(modules: str) -> dict:
+    """Modülleri yeni bir süreçte yükler; süreyi ve yüklenen ağır modülleri döndürür."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(modules=modules, lazy=LAZY_MODULES)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(repeat: int) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for name, modules in TARGETS.items():
+        # İlk çalıştırma .pyc dosyalarını üretir; ölçüme katılmaz
+        probe(modules)
+        runs = [probe(modules) for _ in range(repeat)]
+        timings = [run['seconds'] for run in runs]
+        results[name] = {
+            'modules': modules,
+            'median': statistics.median(timings),
+            'min': min(timings),
+            'max': max(timings),
+            'loaded': runs[-1]['loaded'],
+        }
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Arayüzün soğuk açılış süresini ölçer.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Ölçüm başına yeni süreç sayısı.")
+    parser.add_argument("--json", metavar="PATH", help="Sonuçları JSON olarak yaz.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from paradox_spotify import STARTUP_TARGET_SECONDS
+
+    args = build_parser().parse_args(argv)
+    results = measure(max(args.repeat, 1))
+
+    print(f"{'Ölçüm':<10} {'Ortanca (sn)':>13} {'En az':>8} {'En çok':>8}  Modüller")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['median']:>13.3f} {result['min']:>8.3f} {result['max']:>8.3f}  {result['modules']}"
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    failures = []
+    ui = results['ui']
+    if ui['loaded']:
+        failures.append(f"arayüz modülü ağır modülleri erken yüklüyor: {', '.join(ui['loaded'])}")
+    if ui['median'] > STARTUP_TARGET_SECONDS:
+        failures.append(f"arayüz modülü {ui['median']:.3f} sn > hedef {STARTUP_TARGET_SECONDS:.3f} sn")
+    for line in failures:
+        print(f"HEDEF AŞILDI: {line}", file=sys.stderr)
+    if not failures:
+        print(f"Hedef tutuldu ({STARTUP_TARGET_SECONDS:.2f} sn; arayüz çizimi uygulama içi açılış raporunda).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+Yerel, sahte Spotify Web API sunucusu (benchmark için). Diskografiler sentetik ve deterministiktir:
+sanatçı ID'si sanatçı başına albüm sayısını taşır, böylece tek sunucu farklı boyutları (10, 100,
+1000 albüm) aynı anda sunar. Her isteğe gecikme eklenebilir ve her N. istek 429 ile reddedilebilir.
+
+Tek başına çalıştırıldığında dinlediği adresi ilk satırda yazdırır:
+
+    python -m benchmarks.fake_spotify --latency-ms 20 --rate-limit-every 50
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+DEFAULT_TRACKS_PER_ALBUM: int = 12
+# Her 4. albüm single'dır (2 parça); her 10. parça 60 saniyeden kısadır (filtreyi de çalıştırır)
+SINGLE_EVERY: int = 4
+SINGLE_TRACKS: int = 2
+SHORT_TRACK_EVERY: int = 10
+TOP_TRACKS: int = 10
+MAX_PAGE_SIZE: int = 50
+MAX_ALBUMS_PER_REQUEST: int = 20
+MAX_IDS_PER_REQUEST: int = 50
+MAX_PLAYLIST_PAGE_SIZE: int = 100
+
+
+def artist_id(album_count: int, index: int) -> str:
+    """22 karakterlik sanatçı ID'si: 'ar' + albüm sayısı + sıra."""
+    return f"ar{album_count:05d}{index:015d}"
+
+
+def album_id(album_count: int, artist: int, album: int) -> str:
+    return f"al{album_count:05d}{artist:05d}{album:010d}"
+
+
+def track_id(album_count: int, artist: int, album: int, number: int) -> str:
+    return f"tr{album_count:05d}{artist:05d}{album:06d}{number:04d}"
+
+
+def parse_artist(value: str) -> Tuple[int, int]:
+    return int(value[2:7]), int(value[7:])
+
+
+def parse_album(value: str) -> Tuple[int, int, int]:
+    return int(value[2:7]), int(value[7:12]), int(value[12:])
+
+
+def parse_track(value: str) -> Tuple[int, int, int, int]:
+    return int(value[2:7]), int(value[7:12]), int(value[12:18]), int(value[18:])
+
+
+class Discography:
+    """ID'lerden Spotify yanıt nesnelerini (sadece motorun okuduğu alanlarla) üretir."""
+
+    def __init__(self, tracks_per_album: int = DEFAULT_TRACKS_PER_ALBUM):
+        self.tracks_per_album = tracks_per_album
+
+    @staticmethod
+    def album_type(album: int) -> str:
+        return "single" if album % SINGLE_EVERY == SINGLE_EVERY - 1 else "album"
+
+    def track_count(self, album: int) -> int:
+        return SINGLE_TRACKS if self.album_type(album) == "single" else self.tracks_per_album
+
+    def artist(self, value: str) -> dict:
+        count, index = parse_artist(value)
+        return {'id': value, 'name': f"Artist {index} ({count})", 'images': [], 'followers': {'total': index}}
+
+    def simple_album(self, album_count: int, artist: int, album: int) -> dict:
+        return {
+            'id': album_id(album_count, artist, album),
+            'name': f"Album {artist}-{album}",
+            'album_type': self.album_type(album),
+            'album_group': self.album_type(album),
+            'release_date': f"{1960 + (album * 7) % 64}-{1 + album % 12:02d}-{1 + album % 28:02d}",
+            'release_date_precision': "day",
+            'total_tracks': self.track_count(album),
+        }
+
+    def track(self, album_count: int, artist: int, album: int, number: int, full: bool = False) -> dict:
+        value = track_id(album_count, artist, album, number)
+        track = {
+            'id': value,
+            'uri': f"spotify:track:{value}",
+            'name': f"Track {artist}-{album}-{number}",
+            'duration_ms': 45000 if number % SHORT_TRACK_EVERY == SHORT_TRACK_EVERY - 1 else 120000 + (number * 7919) % 180000,
+            'explicit': number % 3 == 0,
+            'disc_number': 1,
+            'track_number': number + 1,
+            'artists': [{'id': artist_id(album_count, artist)}],
+        }
+        if full:
+            track['popularity'] = (album * 31 + number * 17 + artist) % 100
+            track['external_ids'] = {'isrc': f"XX{value[-12:]}"}
+            track['album'] = self.simple_album(album_count, artist, album)
+        return track
+
+    def album_tracks(self, value: str) -> List[dict]:
+        album_count, artist, album = parse_album(value)
+        return [self.track(album_count, artist, album, n) for n in range(self.track_count(album))]
+
+    def full_album(self, value: str, page: Callable[[List[dict], int, int, str], dict]) -> dict:
+        album_count, artist, album = parse_album(value)
+        result = self.simple_album(album_count, artist, album)
+        result['popularity'] = (album * 37 + artist * 11) % 100
+        result['tracks'] = page(self.album_tracks(value), 0, MAX_PAGE_SIZE, f"albums/{value}/tracks")
+        return result
+
+    def artist_albums(self, value: str, groups: List[str]) -> List[dict]:
+        album_count, artist = parse_artist(value)
+        albums = (self.simple_album(album_count, artist, album) for album in range(album_count))
+        return [album for album in albums if not groups or album['album_type'] in groups]
+
+    def top_tracks(self, value: str) -> List[dict]:
+        album_count, artist = parse_artist(value)
+        return [
+            self.track(album_count, artist, album, 0, full=True)
+            for album in range(min(TOP_TRACKS, album_count))
+        ]
+
+
+class FakeSpotifyServer(ThreadingHTTPServer):
+    """Sentetik diskografiler ve bellek içi playlist'lerle Spotify Web API'nin motorun kullandığı alt kümesi."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, rate_limit_every: int = 0,
+                 retry_after: float = 0.0, tracks_per_album: int = DEFAULT_TRACKS_PER_ALBUM):
+        super().__init__(address, FakeSpotifyHandler)
+        self.discography = Discography(tracks_per_album)
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.playlists: Dict[str, dict] = {}
+        self.request_count: int = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+
+class FakeSpotifyHandler(BaseHTTPRequestHandler):
+    server: FakeSpotifyServer
+    protocol_version = "HTTP/1.1"  # keep-alive: istemci havuzu gerçek API'deki gibi bağlantıları yeniden kullanır
+
+    # (metot, yol, işleyici); yoldaki `id` grubu işleyiciye ilk argüman olarak verilir
+    ROUTES: List[Tuple[str, "re.Pattern", str]] = [
+        (method, re.compile(pattern), handler) for method, pattern, handler in (
+            ("GET", r"^me$", "_get_me"),
+            ("GET", r"^artists/?$", "_get_artists"),
+            ("GET", r"^artists/(?P<id>\w+)/albums$", "_get_artists"),
+            ("GET", r"^artists/(?P<id>\w+)/top-tracks$", "_get_artists"),
+            ("GET", r"^albums/?$", "_get_albums"),
+            ("GET", r"^albums/(?P<id>\w+)/tracks$", "_get_albums"),
+            ("GET", r"^tracks/?$", "_get_tracks"),
+            ("POST", r"^users/(?P<id>[^/]+)/playlists$", "_post_users"),
+            ("GET", r"^playlists/(?P<id>\w+)$", "_get_playlists"),
+            ("GET", r"^playlists/(?P<id>\w+)/(items|tracks)$", "_get_playlists"),
+            ("POST", r"^playlists/(?P<id>\w+)/(items|tracks)$", "_post_playlists"),
+            ("PUT", r"^playlists/(?P<id>\w+)/(items|tracks)$", "_put_playlists"),
+            ("DELETE", r"^playlists/(?P<id>\w+)/(items|tracks)$", "_delete_playlists"),
+            ("PUT", r"^playlists/(?P<id>\w+)/images$", "_put_playlists"),
+        )
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _send(self, status: int, body: Optional[dict] = None, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode('utf-8') if body is not None else b""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str):
+        self._send(status, {'error': {'status': status, 'message': message}})
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            rate_limited = server.rate_limit_every and server.request_count % server.rate_limit_every == 0
+        if server.latency:
+            time.sleep(server.latency)
+        if rate_limited:
+            return self._send(429, {'error': {'status': 429, 'message': "API rate limit exceeded"}},
+                              {'Retry-After': f"{server.retry_after:g}"})
+
+        url = urlsplit(self.path)
+        path = url.path[len('/v1/'):] if url.path.startswith('/v1/') else url.path.lstrip('/')
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(path) if route_method == method else None
+            if match:
+                try:
+                    body = json.loads(raw_body) if raw_body and self.headers.get('Content-Type') == 'application/json' else raw_body
+                    return getattr(self, handler)(match.groupdict().get('id'), path, body)
+                except (KeyError, ValueError) as ex:
+                    return self._error(400, f"Bad request: {ex}")
+        self._error(404, f"Not found: {method} {path}")
+
+    def _page(self, items: List[dict], offset: int, limit: int, path: str, **params) -> dict:
+        next_offset = offset + limit
+        return {
+            'items': items[offset:next_offset],
+            'total': len(items),
+            'limit': limit,
+            'offset': offset,
+            'next': (
+                f"{self.server.base_url}{path}?{urlencode({**params, 'offset': next_offset, 'limit': limit})}"
+                if next_offset < len(items) else None
+            ),
+        }
+
+    def _paged(self, items: List[dict], path: str, max_limit: int = MAX_PAGE_SIZE, **params) -> dict:
+        limit = min(int(self.query.get('limit', 20)), max_limit)
+        return self._page(items, int(self.query.get('offset', 0)), limit, path, **params)
+
+    def _ids(self, max_ids: int) -> List[str]:
+        ids = [value for value in self.query['ids'].split(',') if value]
+        if len(ids) > max_ids:
+            raise ValueError(f"en fazla {max_ids} ID")
+        return ids
+
+    # --- Okuma uç noktaları ---
+
+    def _get_me(self, _id, path, body):
+        self._send(200, {'id': "bench", 'display_name': "Benchmark"})
+
+    def _get_artists(self, value, path, body):
+        discography = self.server.discography
+        if value is None:
+            return self._send(200, {'artists': [discography.artist(v) for v in self._ids(MAX_IDS_PER_REQUEST)]})
+        if path.endswith('/top-tracks'):
+            return self._send(200, {'tracks': discography.top_tracks(value)})
+        groups = (self.query.get('include_groups') or self.query.get('album_type') or "").split(',')
+        albums = discography.artist_albums(value, [group for group in groups if group])
+        self._send(200, self._paged(albums, path, include_groups=",".join(groups)))
+
+    def _get_albums(self, value, path, body):
+        discography = self.server.discography
+        if value is None:
+            return self._send(200, {'albums': [
+                discography.full_album(v, self._page) for v in self._ids(MAX_ALBUMS_PER_REQUEST)
+            ]})
+        self._send(200, self._paged(discography.album_tracks(value), path))
+
+    def _get_tracks(self, _id, path, body):
+        discography = self.server.discography
+        self._send(200, {'tracks': [
+            discography.track(*parse_track(value), full=True) for value in self._ids(MAX_IDS_PER_REQUEST)
+        ]})
+
+    # --- Playlist uç noktaları ---
+
+    def _playlist_object(self, value: str) -> dict:
+        playlist = self.server.playlists[value]
+        total = len(playlist['uris'])
+        return {
+            'id': value,
+            'name': playlist['name'],
+            'public': playlist['public'],
+            'snapshot_id': f"snap-{playlist['version']}",
+            'external_urls': {'spotify': f"https://open.spotify.com/playlist/{value}"},
+            'images': [],
+            'tracks': {'total': total},
+            'items': {'total': total},
+        }
+
+    def _snapshot(self, value: str) -> dict:
+        playlist = self.server.playlists[value]
+        playlist['version'] += 1
+        return {'snapshot_id': f"snap-{playlist['version']}"}
+
+    def _post_users(self, user, path, body):
+        with self.server.lock:
+            value = f"pl{len(self.server.playlists) + 1:020d}"
+            self.server.playlists[value] = {
+                'name': body.get('name', ""), 'public': body.get('public', True), 'uris': [], 'version': 0
+            }
+            self._send(201, self._playlist_object(value))
+
+    def _get_playlists(self, value, path, body):
+        with self.server.lock:
+            if value not in self.server.playlists:
+                return self._error(404, "Playlist bulunamadı")
+            if path.endswith(('/items', '/tracks')):
+                items = [{'track': {'uri': uri}, 'item': {'uri': uri}} for uri in self.server.playlists[value]['uris']]
+                return self._send(200, self._paged(items, path, max_limit=MAX_PLAYLIST_PAGE_SIZE))
+            self._send(200, self._playlist_object(value))
+
+    def _post_playlists(self, value, path, body):
+        uris = body if isinstance(body, list) else body['uris']
+        with self.server.lock:
+            playlist = self.server.playlists[value]
+            position = self.query.get('position')
+            position = len(playlist['uris']) if position is None else int(position)
+            playlist['uris'][position:position] = uris
+            self._send(201, self._snapshot(value))
+
+    def _put_playlists(self, value, path, body):
+        with self.server.lock:
+            playlist = self.server.playlists[value]
+            if path.endswith('/images'):
+                playlist['image_bytes'] = len(body)
+                return self._send(202)
+            if 'uris' in body:
+                playlist['uris'] = list(body['uris'])
+            else:
+                start, length = body['range_start'], body.get('range_length', 1)
+                moved = playlist['uris'][start:start + length]
+                before = body['insert_before']
+                del playlist['uris'][start:start + length]
+                if before > start:
+                    before -= length
+                playlist['uris'][before:before] = moved
+            self._send(200, self._snapshot(value))
+
+    def _delete_playlists(self, value, path, body):
+        removed = {item['uri'] for item in body.get('items') or body.get('tracks') or []}
+        with self.server.lock:
+            playlist = self.server.playlists[value]
+            playlist['uris'] = [uri for uri in playlist['uris'] if uri not in removed]
+            self._send(200, self._snapshot(value))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark için yerel sahte Spotify Web API sunucusu.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0: boş bir port seç.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Her isteğe eklenen gecikme.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Her N. isteği 429 ile reddet (0: kapalı).")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="429 yanıtlarındaki Retry-After (saniye).")
+    parser.add_argument("--tracks-per-album", type=int, default=DEFAULT_TRACKS_PER_ALBUM)
+    args = parser.parse_args()
+
+    server = FakeSpotifyServer(
+        (args.host, args.port), latency=args.latency_ms / 1000, rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after, tracks_per_album=args.tracks_per_album
+    )
+    print(server.base_url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
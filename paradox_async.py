@@ -0,0 +1,219 @@
+import asyncio
+import importlib.util
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+import requests
+from spotipy import SpotifyException
+
+from paradox_cache import MetadataCache, TrackRecord, slim_album
+from paradox_net import (
+    MAX_5XX_RETRIES, MAX_429_RETRIES, RETRY_BACKOFF_FACTOR, RETRYABLE_5XX, RequestStats, TokenBucket,
+    endpoint_name, parse_retry_after
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+API_PREFIX: str = "https://api.spotify.com/v1/"
+# Aynı anda uçuşta olabilecek en fazla istek. Coroutine'ler thread açmaz; toplam hız yine
+# paylaşılan TokenBucket ile sınırlıdır, bu değer sadece bekleyen bağlantı sayısını sınırlar.
+ASYNC_MAX_IN_FLIGHT: int = 64
+ASYNC_TIMEOUT: float = 10.0
+
+PAGE_SIZE: int = 50
+ALBUM_CHUNK_SIZE: int = 20  # Spotify "Get Several Albums" limiti
+
+
+def async_available() -> bool:
+    # httpx opsiyoneldir ve ilk async toplamada yüklenir; yoksa toplama thread havuzuyla yapılır
+    return importlib.util.find_spec("httpx") is not None
+
+
+class AsyncSpotifyClient:
+    """
+    Okuma uç noktaları için httpx tabanlı asenkron istemci. İstekler paylaşılan TokenBucket'tan
+    geçer; 429 ve geçici 5xx yanıtları RateLimitedAdapter ile aynı kurallarla tekrarlanır.
+    Hatalar senkron yolla aynı tiplerde (SpotifyException, requests bağlantı hataları) yükseltilir.
+    Parametreler spotipy'nin gönderdikleriyle aynıdır, böylece iki yol aynı yanıtları alır.
+    """
+
+    def __init__(self, token_manager, bucket: TokenBucket, max_in_flight: int = ASYNC_MAX_IN_FLIGHT,
+                 request_stats: Optional[RequestStats] = None, api_prefix: str = API_PREFIX):
+        self.token_manager = token_manager
+        self.bucket = bucket
+        self.max_in_flight = max_in_flight
+        self.request_stats = request_stats
+        self.api_prefix = api_prefix
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncSpotifyClient":
+        import httpx
+
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._client = httpx.AsyncClient(
+            base_url=self.api_prefix, timeout=ASYNC_TIMEOUT,
+            limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    async def get(self, path: str, **params) -> dict:
+        import httpx
+
+        params = {key: value for key, value in params.items() if value is not None}
+        async with self._semaphore:
+            rate_limited = 0
+            server_errors = 0
+            while True:
+                await self.bucket.acquire_async()
+                # Token süresi dolmak üzereyse yenileme kısa bir süre event loop'u bekletir (saatte bir)
+                headers = {'Authorization': f"Bearer {self.token_manager.get_access_token()}"}
+                started = time.monotonic()
+                try:
+                    response = await self._client.get(path, params=params, headers=headers)
+                except httpx.TimeoutException as ex:
+                    raise requests.exceptions.Timeout(str(ex)) from ex
+                except httpx.TransportError as ex:
+                    raise requests.exceptions.ConnectionError(str(ex)) from ex
+                if self.request_stats:
+                    # Coroutine'ler tek thread'de çalışır; istekler prefetch'i çağıranın aşamasına yazılır
+                    self.request_stats.record(
+                        response.status_code, is_retry=bool(rate_limited or server_errors),
+                        endpoint=endpoint_name("GET", str(response.url)), latency=time.monotonic() - started,
+                        size=len(response.content)
+                    )
+
+                status = response.status_code
+                if status == 429 and rate_limited < MAX_429_RETRIES:
+                    rate_limited += 1
+                    self.bucket.pause(parse_retry_after(response.headers.get('Retry-After')))
+                elif status in RETRYABLE_5XX and server_errors < MAX_5XX_RETRIES:
+                    server_errors += 1
+                    await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** (server_errors - 1)))
+                elif status >= 400:
+                    try:
+                        message = response.json()['error']['message']
+                    except (ValueError, KeyError, TypeError):
+                        message = response.text or "error"
+                    raise SpotifyException(status, -1, f"{response.url}:\n {message}", headers=dict(response.headers))
+                else:
+                    return response.json() if response.content else {}
+
+    async def artist_albums(self, artist_id: str, album_type: str, limit: int = PAGE_SIZE, offset: int = 0) -> dict:
+        return await self.get(
+            f"artists/{artist_id}/albums", album_type=album_type, country='from_token', limit=limit, offset=offset
+        )
+
+    async def albums(self, album_ids: List[str]) -> dict:
+        return await self.get("albums/", ids=",".join(album_ids))
+
+    async def album_tracks(self, album_id: str, limit: int = PAGE_SIZE, offset: int = 0) -> dict:
+        return await self.get(f"albums/{album_id}/tracks", limit=limit, offset=offset)
+
+    async def artist_top_tracks(self, artist_id: str) -> dict:
+        return await self.get(f"artists/{artist_id}/top-tracks", country='from_token')
+
+
+class AsyncHarvester:
+    """
+    Okuma aşamasının yüksek dağılımlı kısmını (sanatçı albümleri, albüm parçaları, Top parçalar)
+    tek thread'de eşzamanlı coroutine'lerle yürütür. Sayfalar `next` bağlantıları takip edilmek
+    yerine toplam sayıdan hesaplanan offset'lerle aynı anda istenir. Sonuçlar MetadataCache'e senkron
+    motorla aynı biçimde yazılır; ardından çalışan PlaylistEngine bu veriyi önbellekten okur.
+    """
+
+    def __init__(self, token_manager, bucket: TokenBucket, metadata_cache: MetadataCache,
+                 log: Optional[Callable[[str, str], None]] = None, max_in_flight: int = ASYNC_MAX_IN_FLIGHT,
+                 request_stats: Optional[RequestStats] = None, api_prefix: str = API_PREFIX):
+        if not async_available():
+            raise RuntimeError("Async toplama için httpx gerekli (pip install httpx).")
+        self.token_manager = token_manager
+        self.bucket = bucket
+        self.metadata_cache = metadata_cache
+        self.max_in_flight = max_in_flight
+        self.request_stats = request_stats
+        # Benchmark'taki sahte sunucu gibi farklı bir API adresi için
+        self.api_prefix = api_prefix
+        self._log = log or (lambda message, type="info": None)
+
+    def prefetch(self, artist_types: Iterable[Tuple[str, str]], top_track_artists: Iterable[str] = ()):
+        """
+        (sanatçı, albüm tipi) çiftlerinin albümlerini, bu albümlerin parçalarını ve verilen sanatçıların
+        Top parçalarını önbelleğe alır. Çağıran thread'de kendi event loop'unu çalıştırır; UI işçi
+        thread'inden veya CLI'dan aynı şekilde çağrılır.
+        """
+        asyncio.run(self._prefetch(list(dict.fromkeys(artist_types)), list(dict.fromkeys(top_track_artists))))
+
+    async def _prefetch(self, artist_types: List[Tuple[str, str]], top_track_artists: List[str]):
+        async with AsyncSpotifyClient(
+            self.token_manager, self.bucket, self.max_in_flight, self.request_stats, self.api_prefix
+        ) as client:
+            cached_tops = self.metadata_cache.get_many('artist_top_tracks', top_track_artists)
+            # Top parçalar albümlerle aynı anda toplanır; tek gather, biri hata verirse diğerinin de beklenmesini sağlar
+            await asyncio.gather(
+                self._prefetch_albums(client, artist_types),
+                *(self._fetch_top_tracks(client, artist_id)
+                  for artist_id in top_track_artists if artist_id not in cached_tops),
+            )
+
+    async def _prefetch_albums(self, client: AsyncSpotifyClient, artist_types: List[Tuple[str, str]]):
+        keys = [f"{artist_id}:{album_type}" for artist_id, album_type in artist_types]
+        album_lists = self.metadata_cache.get_many('artist_albums', keys)
+        fetched = await asyncio.gather(*(
+            self._fetch_artist_albums(client, artist_id, album_type)
+            for (artist_id, album_type), key in zip(artist_types, keys) if key not in album_lists
+        ))
+        album_ids = list(dict.fromkeys(
+            album['id'] for albums in list(album_lists.values()) + fetched for album in albums
+        ))
+        cached_albums = self.metadata_cache.get_many('album_tracks', album_ids)
+        missing = [album_id for album_id in album_ids if album_id not in cached_albums]
+        self._log(
+            f"Async toplama: {len(album_ids)} albüm ({len(missing)} tanesi ağdan), "
+            f"en fazla {self.max_in_flight} eşzamanlı istek.", "cyan"
+        )
+        await asyncio.gather(*(
+            self._fetch_album_chunk(client, missing[i:i + ALBUM_CHUNK_SIZE])
+            for i in range(0, len(missing), ALBUM_CHUNK_SIZE)
+        ))
+
+    async def _fetch_pages(self, first: dict, fetch_page: Callable[[int], Awaitable[dict]]) -> List[dict]:
+        """İlk sayfadaki toplam sayıya göre kalan sayfaları aynı anda ister; öğeleri sırasıyla döndürür."""
+        step = first.get('limit') or PAGE_SIZE
+        rest = await asyncio.gather(*(fetch_page(offset) for offset in range(step, first.get('total', 0), step)))
+        return [item for page in [first, *rest] for item in page.get('items', [])]
+
+    async def _fetch_artist_albums(self, client: AsyncSpotifyClient, artist_id: str, album_type: str) -> List[dict]:
+        first = await client.artist_albums(artist_id, album_type)
+        items = await self._fetch_pages(first, lambda offset: client.artist_albums(artist_id, album_type, offset=offset))
+        albums = [slim_album(item) for item in items if item]
+        self.metadata_cache.put('artist_albums', f"{artist_id}:{album_type}", albums)
+        return albums
+
+    async def _fetch_album_chunk(self, client: AsyncSpotifyClient, album_ids: List[str]):
+        results = await client.albums(album_ids)
+        albums = dict(zip(album_ids, results.get('albums', [])))
+
+        async def album_tracks(album_id: str) -> List[TrackRecord]:
+            page = (albums.get(album_id) or {}).get('tracks')
+            if not page:
+                return []
+            items = await self._fetch_pages(page, lambda offset: client.album_tracks(album_id, offset=offset))
+            return [TrackRecord.from_api(track) for track in items if track and track.get('uri')]
+
+        # Erişilemeyen albümler de boş liste olarak saklanır (senkron yolla aynı)
+        tracks = await asyncio.gather(*(album_tracks(album_id) for album_id in album_ids))
+        popularity = {
+            album_id: album['popularity'] for album_id, album in albums.items()
+            if album and album.get('popularity') is not None
+        }
+        self.metadata_cache.put_album_tracks(dict(zip(album_ids, tracks)), popularity)
+
+    async def _fetch_top_tracks(self, client: AsyncSpotifyClient, artist_id: str):
+        results = await client.artist_top_tracks(artist_id)
+        tracks = [TrackRecord.from_api(track) for track in results.get('tracks', []) if track and track.get('uri')]
+        self.metadata_cache.put_artist_top_tracks(artist_id, tracks)
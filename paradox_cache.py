@@ -0,0 +1,321 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Uygulama dosyaları kullanıcı dizininde tutulur. Yollar burada tanımlıdır ki arayüz açılırken
+# spotipy/requests yüklenmeden (log dosyası gibi) bu yollara erişilebilsin.
+SETTINGS_STORE: Path = Path.home() / ".paradox_flet_spotipy_cache"
+METADATA_CACHE_STORE: Path = SETTINGS_STORE.with_name(".paradox_flet_metadata.sqlite")
+COVER_CACHE_STORE: Path = SETTINGS_STORE.with_name(".paradox_flet_covers")
+
+HOUR: int = 60 * 60
+DAY: int = 24 * HOUR
+
+# Tür bazlı geçerlilik süreleri: popülerlik hızlı değişir, albüm parça listeleri neredeyse hiç değişmez.
+CACHE_TTLS: Dict[str, int] = {
+    'artist_albums': 1 * DAY,
+    'album_tracks': 30 * DAY,
+    # Sadece yaklaşık popülerlik budaması (JobSpec.approximate_popularity) için tahmini üst sınır
+    'album_popularity': 7 * DAY,
+    'track_popularity': 6 * HOUR,
+    'artist_top_tracks': 1 * DAY,
+    'playlist_snapshot': 30 * DAY,
+    # Toplu içe aktarmada ad -> sanatçı çözümlemeleri (bulunamayanlar da saklanır)
+    'artist_search': 30 * DAY,
+    # Type-ahead arama sorgusu -> aday sanatçılar
+    'artist_candidates': 7 * DAY,
+    # Kapak görseli URL'si -> içerik özeti ve kaynak özetleri -> üretilmiş kapak (görseller paradox_cover deposunda)
+    'cover_source': 30 * DAY,
+    'cover_render': 30 * DAY,
+}
+DEFAULT_TTL: int = 1 * DAY
+
+CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+# Sınır aşılınca bu orana inene kadar en uzun süredir kullanılmayan kayıtlar silinir
+CACHE_EVICT_TARGET: float = 0.9
+
+SQLITE_MAX_VARIABLES: int = 500
+
+# Yarım kalan yazma kayıtları bu süreden eskiyse yok sayılır (playlist o arada elle değişmiş olabilir)
+CHECKPOINT_MAX_AGE: int = 1 * DAY
+
+ALBUM_FIELDS = ('id', 'name', 'album_type', 'album_group', 'release_date', 'release_date_precision', 'total_tracks')
+
+
+def slim_album(item: dict) -> dict:
+    """Önbellekte saklamak için albüm nesnesinden sadece kullanılan alanları bırakır."""
+    return {field: item.get(field) for field in ALBUM_FIELDS}
+
+
+def slim_artist(item: dict) -> dict:
+    """Arama adayları için sanatçı nesnesini (aynı yapıda) ad, takipçi ve ilk görsele indirger."""
+    return {
+        'id': item.get('id'),
+        'name': item.get('name'),
+        'followers': {'total': (item.get('followers') or {}).get('total', 0)},
+        'images': (item.get('images') or [])[:1],
+    }
+
+
+class TrackRecord:
+    """
+    Hattın kullandığı parça alanlarını tutan sabit alanlı (`__slots__`) kayıt. Spotify yanıtları
+    geldikleri anda bu kayda indirgenir; pazar listeleri, görseller, bağlantılar gibi hiç okunmayan
+    alanlar bellekte tutulmaz. Önbellekte `to_cache()` ile sözlük olarak saklanır.
+    """
+
+    __slots__ = (
+        'id', 'uri', 'name', 'isrc', 'popularity', 'duration_ms', 'explicit',
+        'disc_number', 'track_number', 'album_id', 'release_date', 'artist_id'
+    )
+
+    def __init__(self, id: Optional[str], uri: str, name: str = "", isrc: Optional[str] = None,
+                 popularity: Optional[int] = None, duration_ms: int = 0, explicit: bool = False,
+                 disc_number: int = 1, track_number: int = 0, album_id: Optional[str] = None,
+                 release_date: str = "", artist_id: Optional[str] = None):
+        self.id = id
+        self.uri = uri
+        self.name = name or ""
+        self.isrc = isrc
+        self.popularity = popularity
+        self.duration_ms = duration_ms or 0
+        self.explicit = bool(explicit)
+        self.disc_number = disc_number
+        self.track_number = track_number
+        self.album_id = album_id
+        self.release_date = release_date or ""
+        self.artist_id = artist_id  # parçanın ilk (ana) sanatçısı
+
+    @classmethod
+    def from_api(cls, track: dict) -> "TrackRecord":
+        """
+        Spotify parça nesnesini kayda indirger. ISRC ve albüm bilgisi sadece tam parça nesnelerinde
+        (örn. top tracks) bulunur; albüm içi parçalarda albüm, yüklenirken atanır.
+        """
+        album = track.get('album') or {}
+        artists = track.get('artists') or [{}]
+        return cls(
+            id=track.get('id'),
+            uri=track['uri'],
+            name=track.get('name'),
+            isrc=(track.get('external_ids') or {}).get('isrc'),
+            popularity=track.get('popularity'),
+            duration_ms=track.get('duration_ms'),
+            explicit=track.get('explicit'),
+            disc_number=track.get('disc_number'),
+            track_number=track.get('track_number'),
+            album_id=album.get('id'),
+            release_date=album.get('release_date'),
+            artist_id=artists[0].get('id'),
+        )
+
+    @classmethod
+    def from_cache(cls, data: dict, album_id: Optional[str] = None,
+                   artist_id: Optional[str] = None) -> "TrackRecord":
+        """`artist_id`, sanatçı alanı olmadan önbelleğe yazılmış eski kayıtlar için yedek değerdir."""
+        record = cls(**{field: data[field] for field in cls.__slots__ if field in data})
+        if album_id:
+            record.album_id = album_id
+        if record.artist_id is None:
+            record.artist_id = artist_id
+        return record
+
+    def to_cache(self) -> dict:
+        """Boş alanlar atlanır (albüm içi parçalarda albüm zaten önbellek anahtarıdır)."""
+        return {field: getattr(self, field) for field in self.__slots__ if getattr(self, field) not in (None, "")}
+
+    def __repr__(self) -> str:
+        return f"TrackRecord({self.uri!r}, {self.name!r})"
+
+
+class MetadataCache:
+    """
+    Sanatçı/albüm/parça yanıtları için SQLite tabanlı kalıcı önbellek.
+    Kayıtlar (kind, key) ile tutulur; tür bazlı TTL ve boyut sınırlı LRU silme uygulanır.
+    Tüm işçi thread'leri aynı nesneyi paylaşabilir.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES, ttls: Optional[Dict[str, int]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path.as_posix(), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (kind, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        # Artımlı mod için (playlist, sanatçı) başına işlenmiş albümler; önbellek değil kalıcı durumdur
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            " playlist_id TEXT NOT NULL, artist_id TEXT NOT NULL, value TEXT NOT NULL,"
+            " updated_at REAL NOT NULL, PRIMARY KEY (playlist_id, artist_id))"
+        )
+        # Yarım kalan playlist yazımlarının kaldığı yer; iş bitince silinir
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._total_bytes: int = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        return self.get_many(kind, [key]).get(key)
+
+    def get_many(self, kind: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Süresi dolmamış kayıtları döndürür; bulunamayan veya bayat anahtarlar sonuçta yer almaz."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        if not keys:
+            return found
+
+        now = time.time()
+        min_fetched_at = now - self.ttls.get(kind, DEFAULT_TTL)
+        with self._lock:
+            for i in range(0, len(keys), SQLITE_MAX_VARIABLES):
+                chunk = keys[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE kind = ? AND fetched_at >= ? AND key IN ({placeholders})",
+                    (kind, min_fetched_at, *chunk)
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = json.loads(value)
+            if found:
+                self._conn.executemany(
+                    "UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?",
+                    [(now, kind, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put(self, kind: str, key: str, value: Any):
+        self.put_many(kind, {key: value})
+
+    def put_many(self, kind: str, items: Dict[str, Any]):
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            encoded = json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+            rows.append((kind, key, encoded, len(encoded), now, now))
+
+        with self._lock:
+            keys = list(items.keys())
+            for i in range(0, len(keys), SQLITE_MAX_VARIABLES):
+                chunk = keys[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                self._total_bytes -= self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE kind = ? AND key IN ({placeholders})",
+                    (kind, *chunk)
+                ).fetchone()[0]
+            self._conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._total_bytes += sum(row[3] for row in rows)
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+            self._conn.commit()
+
+    def put_album_tracks(self, album_tracks: Dict[str, List[TrackRecord]], album_popularity: Dict[str, int]):
+        """Albüm parça listelerini ve (Buzdağı budaması için ipucu olan) albüm popülerliklerini saklar."""
+        self.put_many('album_tracks', {
+            album_id: [track.to_cache() for track in tracks] for album_id, tracks in album_tracks.items()
+        })
+        self.put_many('album_popularity', album_popularity)
+
+    def put_artist_top_tracks(self, artist_id: str, tracks: List[TrackRecord]):
+        self.put('artist_top_tracks', artist_id, [track.to_cache() for track in tracks])
+        # Top parçalar popülerlik bilgisini de taşır; ayrıca istenmesin diye saklanır
+        self.put_many('track_popularity', {track.id: track.popularity for track in tracks if track.id})
+
+    def _evict_locked(self):
+        target = int(self.max_bytes * CACHE_EVICT_TARGET)
+        # Önce süresi dolmuş kayıtlar, sonra en uzun süredir okunmayanlar silinir
+        now = time.time()
+        for kind, ttl in self.ttls.items():
+            self._conn.execute("DELETE FROM entries WHERE kind = ? AND fetched_at < ?", (kind, now - ttl))
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        while self._total_bytes > target:
+            rows: List[tuple] = self._conn.execute(
+                "SELECT kind, key, size FROM entries ORDER BY accessed_at LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for kind, key, size in rows:
+                victims.append((kind, key))
+                self._total_bytes -= size
+                if self._total_bytes <= target:
+                    break
+            self._conn.executemany("DELETE FROM entries WHERE kind = ? AND key = ?", victims)
+
+    def get_watermarks(self, playlist_id: str, artist_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Artımlı mod için sanatçı başına watermark'ları döndürür (işlenmiş albüm ID'leri, albüm tipleri
+        ve en yeni çıkış tarihi). Watermark'lar TTL ve LRU silmesine tabi değildir.
+        """
+        artist_ids = list(dict.fromkeys(artist_ids))
+        found: Dict[str, dict] = {}
+        with self._lock:
+            for i in range(0, len(artist_ids), SQLITE_MAX_VARIABLES):
+                chunk = artist_ids[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT artist_id, value FROM watermarks WHERE playlist_id = ? AND artist_id IN ({placeholders})",
+                    (playlist_id, *chunk)
+                ).fetchall()
+                for artist_id, value in rows:
+                    found[artist_id] = json.loads(value)
+        return found
+
+    def put_watermarks(self, playlist_id: str, watermarks: Dict[str, dict]):
+        if not watermarks:
+            return
+        now = time.time()
+        rows = [
+            (playlist_id, artist_id, json.dumps(value, separators=(',', ':'), ensure_ascii=False), now)
+            for artist_id, value in watermarks.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def get_checkpoint(self, key: str) -> Optional[dict]:
+        """Yarım kalan yazma kaydını döndürür; CHECKPOINT_MAX_AGE'den eski kayıtlar yok sayılır."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM checkpoints WHERE key = ? AND updated_at >= ?",
+                (key, time.time() - CHECKPOINT_MAX_AGE)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_checkpoint(self, key: str, value: dict):
+        now = time.time()
+        encoded = json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)", (key, encoded, now))
+            self._conn.execute("DELETE FROM checkpoints WHERE updated_at < ?", (now - CHECKPOINT_MAX_AGE,))
+            self._conn.commit()
+
+    def delete_checkpoint(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
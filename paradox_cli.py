@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+import requests
+import spotipy
+from spotipy import SpotifyException
+
+from paradox_async import AsyncHarvester, async_available
+from paradox_cache import METADATA_CACHE_STORE, MetadataCache
+from paradox_engine import (
+    ALBUM_TYPES, COVER_STYLES, DEDUPE_RULES, HARVEST_WORKERS, PLAYLIST_MODES, SORT_TYPES,
+    JobReport, JobSpec, PlaylistEngine, artist_id_from_input, build_auth_manager, build_spotify_client, print_log
+)
+from paradox_net import AdaptivePacer, RequestStats, TokenBucket, build_spotify_session
+
+EXIT_OK: int = 0
+EXIT_JOB_FAILED: int = 1
+EXIT_USAGE: int = 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="paradox_cli",
+        description="PARADOX playlist hattını arayüz olmadan (cron/sunucu) çalıştırır."
+    )
+    parser.add_argument(
+        "--job", action="append", default=[],
+        help="JSON iş tanımı dosyası; tek iş veya iş listesi içerebilir, birden fazla verilebilir (README'ye bakın)."
+    )
+    parser.add_argument("--artist", action="append", default=[], help="Sanatçı ID/URI/URL (birden fazla verilebilir).")
+    parser.add_argument("--types", default="album,single", help=f"Albüm tipleri, virgülle ayrılmış ({','.join(ALBUM_TYPES)}).")
+    parser.add_argument("--sort", default="TRACK", choices=SORT_TYPES, help="Sıralama tipi.")
+    parser.add_argument("--mode", default="NEW", choices=PLAYLIST_MODES, help="Playlist modu.")
+    parser.add_argument("--name", default="", help="Yeni playlist adı (NEW modu).")
+    parser.add_argument("--playlist", help="Mevcut playlist ID/URL (OVERWRITE/APPEND/INCREMENTAL modları).")
+    parser.add_argument("--private", action="store_true", help="Playlist'i gizli oluştur.")
+    parser.add_argument("--max-tracks", type=int, help="Playlist'e eklenecek en fazla parça sayısı.")
+    parser.add_argument(
+        "--dedupe", default="ORIGINAL", choices=DEDUPE_RULES,
+        help="Aynı kaydın sürümlerinden (deluxe, remaster, single) hangisinin tutulacağı; NONE sadece aynı URI'yi eler."
+    )
+    parser.add_argument("--include-short", action="store_true", help="60 saniyeden kısa parçaları da ekle.")
+    parser.add_argument("--no-cover", action="store_true", help="Playlist kapağını yükleme.")
+    parser.add_argument(
+        "--cover-style", default="ARTIST", choices=COVER_STYLES,
+        help="Kapak: son sanatçının görseli (ARTIST) veya ilk 4 sanatçıdan mozaik (MOSAIC)."
+    )
+    parser.add_argument(
+        "--approx-popularity", action="store_true",
+        help="Buzdağı gibi stratejilerde popülerlik sorgularını albüm popülerliğiyle buda (daha az istek, yaklaşık seçim). "
+             "Verilmezse seçim kesindir ve önbellekte olmayan her adayın popülerliği istenir (istek sayısı değişmez)."
+    )
+    parser.add_argument("--workers", type=int, default=HARVEST_WORKERS, help="Paralel işçi sayısı.")
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="Albüm/parça okumalarını thread'ler yerine eşzamanlı coroutine'lerle yap (httpx gerekir)."
+    )
+    parser.add_argument("--client-id", default=os.environ.get("SPOTIPY_CLIENT_ID"), help="Spotify Client ID (varsayılan: $SPOTIPY_CLIENT_ID).")
+    parser.add_argument("--client-secret", default=os.environ.get("SPOTIPY_CLIENT_SECRET"), help="Spotify Client Secret (varsayılan: $SPOTIPY_CLIENT_SECRET).")
+    parser.add_argument("--login", action="store_true", help="Önbellekte token yoksa tarayıcıda yetkilendirme başlat.")
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="İstek profilini (aşama/uç nokta bazında gecikme, boyut, tekrar, 429) yaz; .folded uzantısı flamegraph, diğerleri JSON. "
+             "Toplu işlerde her iş ayrı dosyaya yazılır (profil.1.json, ...; ortak ön toplama profil.prefetch.json)."
+    )
+    parser.add_argument("--quiet", action="store_true", help="Sadece uyarı ve hataları yazdır.")
+    return parser
+
+
+def load_jobs(args: argparse.Namespace) -> List[JobSpec]:
+    if args.job:
+        jobs: List[JobSpec] = []
+        for path in args.job:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            jobs.extend(JobSpec.from_dict(item) for item in (data if isinstance(data, list) else [data]))
+        return jobs
+
+    job = JobSpec(
+        artists={artist_id_from_input(value): "" for value in args.artist},
+        album_types=[t.strip() for t in args.types.split(",") if t.strip()],
+        sort_type=args.sort,
+        playlist_mode=args.mode,
+        playlist_name=args.name,
+        existing_playlist=args.playlist,
+        is_public=not args.private,
+        exclude_short=not args.include_short,
+        max_tracks=args.max_tracks,
+        upload_cover=not args.no_cover,
+        cover_style=args.cover_style,
+        dedupe_rule=args.dedupe,
+        approximate_popularity=args.approx_popularity,
+    )
+    job.validate()
+    return [job]
+
+
+def print_batch_report(reports: List[JobReport]):
+    print(f"{'İş':<40} {'Durum':<10} {'Parça':>7} {'Süre (sn)':>10} {'İstek':>7}")
+    for report in reports:
+        if report.error:
+            status = "HATA"
+        elif report.result:
+            status = "OK"
+        else:
+            status = "-"
+        tracks = report.result.track_count if report.result else "-"
+        print(f"{report.name[:40]:<40} {status:<10} {tracks:>7} {report.seconds:>10.1f} {report.requests:>7}")
+    print(f"{'TOPLAM':<40} {'':<10} {'':>7} {sum(r.seconds for r in reports):>10.1f} {sum(r.requests for r in reports):>7}")
+
+
+def connect(args: argparse.Namespace, session) -> Optional[spotipy.Spotify]:
+    """
+    Önbellekteki token ile bağlanır; token yoksa sadece --login verildiyse tarayıcı akışı başlatılır.
+    İstemci token'ı süresi dolmadan kendisi yeniler, uzun toplu işler yarıda kesilmez.
+    """
+    auth_manager = build_auth_manager(args.client_id, args.client_secret, open_browser=args.login)
+    token_info = auth_manager.validate_token(auth_manager.cache_handler.get_cached_token())
+    if not token_info:
+        if not args.login:
+            return None
+        token_info = auth_manager.get_access_token(check_cache=False)
+    return build_spotify_client(auth_manager, token_info, session)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    def log(message: str, type: str = "info"):
+        if not args.quiet or type in ("error", "warn"):
+            print_log(message, type)
+
+    if not args.client_id or not args.client_secret:
+        log("Client ID ve Client Secret gerekli (--client-id/--client-secret veya SPOTIPY_* ortam değişkenleri).", "error")
+        return EXIT_USAGE
+    if args.use_async and not async_available():
+        log("--async için httpx gerekli (pip install httpx).", "error")
+        return EXIT_USAGE
+
+    try:
+        jobs = load_jobs(args)
+    except (OSError, ValueError) as ex:
+        log(f"İş tanımı hatası: {ex}", "error")
+        return EXIT_USAGE
+
+    rate_limiter = TokenBucket()
+    write_pacer = AdaptivePacer()
+    request_stats = RequestStats()
+    session = build_spotify_session(rate_limiter, pool_size=args.workers, write_pacer=write_pacer, request_stats=request_stats)
+
+    try:
+        sp = connect(args, session)
+        if sp is None:
+            log("Önbellekte geçerli token yok. Bir kez --login ile veya arayüzden bağlanın.", "error")
+            return EXIT_USAGE
+        user_id = sp.current_user()['id']
+    except SpotifyException as ex:
+        log(f"Bağlantı/Yetkilendirme Hatası: {ex}", "error")
+        return EXIT_USAGE
+
+    metadata_cache = MetadataCache(METADATA_CACHE_STORE)
+    async_harvester = AsyncHarvester(
+        sp.auth_manager, rate_limiter, metadata_cache, log=log, request_stats=request_stats
+    ) if args.use_async else None
+    engine = PlaylistEngine(
+        sp, user_id, metadata_cache, write_pacer, log=log, workers=args.workers, async_harvester=async_harvester,
+        request_stats=request_stats, profile_path=args.profile
+    )
+
+    if len(jobs) > 1:
+        try:
+            reports = engine.run_batch(jobs, request_stats)
+        except SpotifyException as ex:
+            log(f"Spotify API Hatası (ön toplama): {ex.http_status} - {ex.msg}", "error")
+            return EXIT_JOB_FAILED
+        except requests.exceptions.RequestException as ex:
+            log(f"Bağlantı Hatası (ön toplama): {ex}", "error")
+            return EXIT_JOB_FAILED
+        finally:
+            metadata_cache.close()
+        print_batch_report(reports)
+        return EXIT_JOB_FAILED if any(report.error for report in reports) else EXIT_OK
+
+    started = time.perf_counter()
+    try:
+        result = engine.run(jobs[0])
+    except SpotifyException as ex:
+        log(f"Spotify API Hatası: {ex.http_status} - {ex.msg}", "error")
+        return EXIT_JOB_FAILED
+    except ValueError as ex:
+        log(f"Kullanıcı Girişi Hatası: {ex}", "error")
+        return EXIT_JOB_FAILED
+    except requests.exceptions.RequestException as ex:
+        log(f"Bağlantı Hatası: {ex}", "error")
+        return EXIT_JOB_FAILED
+    finally:
+        metadata_cache.close()
+
+    log(f"Playlist: {result.playlist.get('external_urls', {}).get('spotify', result.playlist_id)} "
+        f"({result.track_count} parça, {time.perf_counter() - started:.1f} sn, "
+        f"{request_stats.snapshot()['requests']} istek)", "succ")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import importlib.util
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import requests
+
+from paradox_cache import MetadataCache
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Spotify görselleri en fazla 640 px döner; kapak bu boyutta kare üretilir
+COVER_SIZE: int = 640
+# Spotify kapak yükleme sınırı base64 kodlanmış JPEG için 256 KB'tır
+COVER_MAX_BYTES: int = 256 * 1024
+# Kalite araması bu aralıkta yapılır; en düşük kalite de sığmazsa görsel küçültülür
+JPEG_MIN_QUALITY: int = 40
+JPEG_MAX_QUALITY: int = 95
+COVER_DOWNSCALE_STEP: float = 0.8
+COVER_DOWNLOAD_TIMEOUT: float = 10.0
+# Önbellek klasöründe tutulan en fazla dosya (indirilen + üretilen); fazlası en eskiden silinir
+COVER_CACHE_MAX_FILES: int = 500
+
+# Mozaik kapak 2x2 ızgaradır; daha az görsel varsa çapraz tekrarlanır
+MOSAIC_TILES: int = 4
+MOSAIC_LAYOUTS = {2: (0, 1, 1, 0), 3: (0, 1, 2, 0), 4: (0, 1, 2, 3)}
+
+
+def cover_available() -> bool:
+    # Pillow opsiyoneldir ve ilk kapak üretilirken yüklenir; yoksa kapak yüklenmez, playlist yine oluşturulur
+    return importlib.util.find_spec("PIL") is not None
+
+
+def base64_length(size: int) -> int:
+    return 4 * ((size + 2) // 3)
+
+
+@dataclass
+class EncodedCover:
+    payload: str  # playlist_upload_cover_image için base64 JPEG
+    size: int  # piksel (kare)
+    quality: int
+    bytes: int  # base64 yük boyutu
+    from_cache: bool = False
+
+
+class ImageStore:
+    """
+    İçerik adresli görsel deposu: her dosya içeriğinin SHA-256 özetiyle adlandırılır. Aynı görsel
+    farklı URL'lerden gelse de bir kez saklanır; dosya adı içerikle doğrulandığı için bayatlamaz.
+    """
+
+    def __init__(self, directory: Path, max_files: int = COVER_CACHE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+
+    def get(self, digest: str) -> Optional[bytes]:
+        try:
+            return (self.directory / digest).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.directory / digest
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp = path.with_name(f"{digest}.{os.getpid()}.tmp")
+            temp.write_bytes(data)
+            os.replace(temp, path)
+            self._prune()
+        return digest
+
+    def _prune(self):
+        files = sorted(self.directory.iterdir(), key=lambda item: item.stat().st_mtime)
+        for item in files[:max(len(files) - self.max_files, 0)]:
+            item.unlink(missing_ok=True)
+
+
+class CoverPipeline:
+    """
+    Playlist kapağı üretimi: kaynak görselleri indirir (önbellekten), JPEG'leri `Image.draft` ile
+    doğrudan küçültülmüş çözer, tek görselden veya birden fazla sanatçıdan mozaik kare kapak oluşturur
+    ve yükleme sınırına sığan en yüksek JPEG kalitesini ikili aramayla bulur. Aynı kaynaklardan
+    üretilmiş kapak tekrar kodlanmaz. Spotify'a istek atmaz; yükleme motorda yapılır.
+    """
+
+    def __init__(self, metadata_cache: MetadataCache, directory: Path, size: int = COVER_SIZE,
+                 max_bytes: int = COVER_MAX_BYTES):
+        self.metadata_cache = metadata_cache
+        self.store = ImageStore(directory)
+        self.size = size
+        self.max_bytes = max_bytes
+        # Görsel CDN'i API hız sınırına tabi değildir; Spotify oturumundan ayrı tutulur
+        self.session = requests.Session()
+
+    def fetch(self, url: str) -> Tuple[str, bytes]:
+        """Kaynak görseli (özet, içerik) olarak döndürür; URL daha önce indirildiyse ağa çıkmaz."""
+        entry = self.metadata_cache.get('cover_source', url)
+        if entry:
+            data = self.store.get(entry['digest'])
+            if data is not None:
+                return entry['digest'], data
+        response = self.session.get(url, timeout=COVER_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        digest = self.store.put(response.content)
+        self.metadata_cache.put('cover_source', url, {'digest': digest})
+        return digest, response.content
+
+    def build(self, image_urls: List[str]) -> EncodedCover:
+        """
+        Tek URL için o görselden, birden fazla URL için (en fazla MOSAIC_TILES) mozaik kapak üretir.
+        """
+        if not cover_available():
+            raise RuntimeError("Kapak üretimi için Pillow gerekli (pip install pillow).")
+        urls = list(dict.fromkeys(url for url in image_urls if url))[:MOSAIC_TILES]
+        if not urls:
+            raise ValueError("Kapak için görsel yok.")
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            sources = list(executor.map(self.fetch, urls))
+
+        render_key = hashlib.sha256(json.dumps(
+            [[digest for digest, _ in sources], self.size, self.max_bytes]
+        ).encode('utf-8')).hexdigest()
+        rendered = self.metadata_cache.get('cover_render', render_key)
+        if rendered:
+            data = self.store.get(rendered['digest'])
+            if data is not None:
+                return EncodedCover(
+                    base64.b64encode(data).decode('ascii'), rendered['size'], rendered['quality'],
+                    base64_length(len(data)), from_cache=True
+                )
+
+        image = self._compose([data for _, data in sources])
+        data, quality = self._encode(image)
+        self.metadata_cache.put('cover_render', render_key, {
+            'digest': self.store.put(data), 'size': image.width, 'quality': quality
+        })
+        return EncodedCover(base64.b64encode(data).decode('ascii'), image.width, quality, base64_length(len(data)))
+
+    @staticmethod
+    def _load_square(data: bytes, size: int) -> "Image.Image":
+        from PIL import Image
+
+        image = Image.open(BytesIO(data))
+        # JPEG'lerde DCT ölçeklemesiyle çözer: tam boyutlu bitmap hiç oluşmaz
+        image.draft('RGB', (size, size))
+        image = image.convert('RGB')
+        side = min(image.size)
+        left, top = (image.width - side) // 2, (image.height - side) // 2
+        image = image.crop((left, top, left + side, top + side))
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        return image
+
+    def _compose(self, sources: List[bytes]) -> "Image.Image":
+        from PIL import Image
+
+        if len(sources) == 1:
+            return self._load_square(sources[0], self.size)
+        tile = self.size // 2
+        tiles = [self._load_square(data, tile).resize((tile, tile)) for data in sources]
+        mosaic = Image.new('RGB', (tile * 2, tile * 2))
+        for position, index in enumerate(MOSAIC_LAYOUTS[len(tiles)]):
+            mosaic.paste(tiles[index], ((position % 2) * tile, (position // 2) * tile))
+        return mosaic
+
+    def _encode(self, image: "Image.Image") -> Tuple[bytes, int]:
+        """Sınıra sığan en yüksek kaliteyi ikili aramayla bulur; hiçbiri sığmazsa görseli küçültür."""
+        from PIL import Image
+
+        while True:
+            best: Optional[Tuple[bytes, int]] = None
+            low, high = JPEG_MIN_QUALITY, JPEG_MAX_QUALITY
+            while low <= high:
+                quality = (low + high) // 2
+                buffered = BytesIO()
+                image.save(buffered, format="JPEG", quality=quality, optimize=True)
+                if base64_length(buffered.tell()) <= self.max_bytes:
+                    best = (buffered.getvalue(), quality)
+                    low = quality + 1
+                else:
+                    high = quality - 1
+            if best:
+                return best
+            side = int(image.width * COVER_DOWNSCALE_STEP)
+            image = image.resize((side, side), Image.Resampling.LANCZOS)
@@ -0,0 +1,1726 @@
+import bisect
+import csv
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import requests
+import spotipy
+from spotipy import SpotifyException
+from spotipy.oauth2 import SpotifyOAuth
+
+from paradox_cache import (
+    COVER_CACHE_STORE, SETTINGS_STORE, MetadataCache, TrackRecord, slim_album, slim_artist
+)
+from paradox_cover import MOSAIC_TILES, CoverPipeline, EncodedCover
+from paradox_net import RETRYABLE_5XX, AdaptivePacer, RequestStats
+from paradox_select import SELECTION_STRATEGIES, CandidateTable, SelectionStrategy
+
+REDIRECT_URI: str = "http://127.0.0.1:8080/callback"
+
+SCOPES: str = "playlist-modify-private playlist-modify-public user-read-private ugc-image-upload user-read-email"
+
+# Sanatçı/albüm toplama için paralel işçi sayısı (toplam istek hızı paradox_net.SPOTIFY_MAX_RPS ile sınırlıdır)
+HARVEST_WORKERS: int = 8
+
+PLAYLIST_MODES: Tuple[str, ...] = ("NEW", "OVERWRITE", "APPEND", "INCREMENTAL")
+# Sıralama tipleri paradox_select içindeki strateji kaydından gelir
+SORT_TYPES: Tuple[str, ...] = tuple(SELECTION_STRATEGIES)
+ALBUM_TYPES: Tuple[str, ...] = ("album", "single", "compilation")
+# Aynı kaydın farklı sürümlerinden (deluxe, remaster, single...) hangisinin tutulacağı
+DEDUPE_RULES: Tuple[str, ...] = ("ORIGINAL", "POPULAR", "EXPLICIT", "CLEAN", "NONE")
+# ARTIST: son sanatçının görseli; MOSAIC: ilk sanatçıların görsellerinden 2x2 mozaik
+COVER_STYLES: Tuple[str, ...] = ("ARTIST", "MOSAIC")
+
+# Toplama bitmeden yazmaya başlanabilen playlist modları (OVERWRITE farkı tüm hedef listeyi gerektirir)
+STREAMING_MODES: Tuple[str, ...] = ("NEW", "APPEND")
+# Yazıcıyı bekleyen en fazla 100'lük grup sayısı (bellek sınırı)
+STREAM_QUEUE_CHUNKS: int = 4
+# Albüm parçaları paralel çekilirken aynı anda bekleyen en fazla 20'lik grup sayısı (bellek sınırı)
+ALBUM_CHUNK_WINDOW: int = 8
+# Yaklaşık budamada albüm popülerliği parça popülerliği için üst sınır sayılırken eklenen pay.
+# Spotify bunu garanti etmez; budama bu yüzden sadece istenince (approximate_popularity) yapılır.
+POPULARITY_BOUND_SLACK: int = 5
+# INCREMENTAL modunda `artist_albums` sayfa boyutu; yeni çıkanlar genelde ilk sayfaya sığar
+INCREMENTAL_PAGE_SIZE: int = 20
+# Type-ahead aramada gösterilen aday sayısı ve bellekte tutulan sorgu sayısı
+ARTIST_SEARCH_LIMIT: int = 8
+ARTIST_SEARCH_LRU_SIZE: int = 256
+# Erişim token'ı (1 saat geçerli) süresi dolmadan bu kadar saniye önce yenilenir
+TOKEN_REFRESH_MARGIN: int = 5 * 60
+# Bağlantı kopması/5xx gibi geçici yazma hatalarında grup başına ek deneme ve artan bekleme (saniye)
+WRITE_RETRIES: int = 3
+WRITE_RETRY_BACKOFF: float = 2.0
+
+LogCallback = Callable[[str, str], None]
+ProgressCallback = Callable[..., None]
+
+
+def playlist_id_from_input(input_str: str) -> Optional[str]:
+    if "spotify:playlist:" in input_str:
+        return input_str.split("spotify:playlist:")[-1].split("?")[0].strip()
+    if "/playlist/" in input_str:
+        return input_str.split("/playlist/")[-1].split("?")[0].strip()
+    return input_str.strip() if input_str else None
+
+
+def artist_id_from_input(input_str: str) -> Optional[str]:
+    if "spotify:artist:" in input_str:
+        return input_str.split("spotify:artist:")[-1].split("?")[0].strip()
+    if "/artist/" in input_str:
+        return input_str.split("/artist/")[-1].split("?")[0].strip()
+    return input_str.strip() if input_str else None
+
+
+SPOTIFY_ID_PATTERN = re.compile(r"[0-9A-Za-z]{22}")
+# CSV dosyalarında ilk satır bu başlıklardan biriyse atlanır
+ARTIST_LIST_HEADERS: Tuple[str, ...] = ("artist", "artists", "name", "sanatçı", "sanatçılar", "ad")
+
+
+def explicit_artist_id(entry: str) -> Optional[str]:
+    """Girdi bir sanatçı URI'si, URL'si veya çıplak ID ise ID'yi, sanatçı adıysa None döndürür."""
+    if "spotify:artist:" in entry or "/artist/" in entry:
+        return artist_id_from_input(entry)
+    entry = entry.strip()
+    return entry if SPOTIFY_ID_PATTERN.fullmatch(entry) else None
+
+
+class ArtistSearchCache:
+    """
+    Sanatçı arama sonuçları için iki katmanlı önbellek: bellekte LRU, arkasında MetadataCache
+    ('artist_candidates'). Aynı sorgunun tekrarı ağa çıkmaz. Yazarken arama gibi sık ve farklı
+    thread'lerden gelen çağrılar için thread-safe'dir.
+    """
+
+    def __init__(self, metadata_cache: MetadataCache, max_entries: int = ARTIST_SEARCH_LRU_SIZE):
+        self.metadata_cache = metadata_cache
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.split()).casefold()
+
+    def _remember(self, key: str, results: List[dict]):
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def cached(self, query: str) -> Optional[List[dict]]:
+        """Sorgunun önbellekteki adaylarını döndürür; hiç aranmamışsa None."""
+        key = self.normalize(query)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        results = self.metadata_cache.get('artist_candidates', key)
+        if results is not None:
+            self._remember(key, results)
+        return results
+
+    def search(self, sp: spotipy.Spotify, query: str, limit: int = ARTIST_SEARCH_LIMIT) -> List[dict]:
+        results = self.cached(query)
+        if results is not None:
+            return results
+        key = self.normalize(query)
+        data = sp.search(q=f'artist:{key}', type='artist', limit=limit)
+        results = [slim_artist(item) for item in (data or {}).get('artists', {}).get('items') or [] if item]
+        self.metadata_cache.put('artist_candidates', key, results)
+        self._remember(key, results)
+        return results
+
+
+def parse_artist_list(text: str, csv_format: bool = False) -> List[str]:
+    """
+    Toplu içe aktarma metnini girdilere ayırır: her satır bir sanatçı adı, ID, URI veya URL'dir
+    (`;` ile aynı satırda birden fazla verilebilir, `#` ile başlayan satırlar yok sayılır).
+    CSV biçiminde her satırın ilk sütunu alınır. Tekrarlar ilk görülme sırasıyla atılır.
+    """
+    if csv_format:
+        rows = [row[0] for row in csv.reader(text.splitlines()) if row]
+        if rows and rows[0].strip().casefold() in ARTIST_LIST_HEADERS:
+            rows = rows[1:]
+    else:
+        rows = [part for line in text.splitlines() if not line.lstrip().startswith("#") for part in line.split(";")]
+    entries = (" ".join(row.split()) for row in rows)
+    return list(dict.fromkeys(entry for entry in entries if entry))
+
+
+def build_auth_manager(client_id: str, client_secret: str, show_dialog: bool = False,
+                       open_browser: bool = True) -> SpotifyOAuth:
+    # Token istekleri (accounts.spotify.com) API oturumunu kullanmaz: spotipy'nin kendi düz oturumu
+    # bağlantıları yeniden kullanır, yazma hızlandırıcısına takılmaz ve API istatistiklerine sayılmaz
+    return SpotifyOAuth(
+        client_id=client_id,
+        client_secret=client_secret,
+        redirect_uri=REDIRECT_URI,
+        scope=SCOPES,
+        cache_path=SETTINGS_STORE.as_posix(),
+        show_dialog=show_dialog,
+        open_browser=open_browser,
+        requests_session=True
+    )
+
+
+class SharedTokenManager:
+    """
+    spotipy istemcisine `auth_manager` olarak verilen, tüm işçilerin paylaştığı token sağlayıcı.
+    Token bellekte tutulur (SpotifyOAuth her istekte önbellek dosyasını okur) ve süresi dolmadan
+    TOKEN_REFRESH_MARGIN saniye önce yenilenir; yenilemeyi tek bir thread yapar, diğerleri
+    kilitte bekleyip yeni token'ı kullanır. Böylece bir saatten uzun işler 401 ile kesilmez.
+    """
+
+    def __init__(self, oauth: SpotifyOAuth, token_info: dict, refresh_margin: int = TOKEN_REFRESH_MARGIN):
+        self.oauth = oauth
+        self.refresh_margin = refresh_margin
+        self._token_info = token_info
+        self._lock = threading.Lock()
+
+    def _expiring(self, token_info: dict) -> bool:
+        return token_info['expires_at'] - time.time() < self.refresh_margin
+
+    def get_access_token(self, as_dict: bool = False):
+        token_info = self._token_info
+        if self._expiring(token_info):
+            with self._lock:
+                token_info = self._token_info
+                if self._expiring(token_info):
+                    # Yenilenen token SpotifyOAuth tarafından önbellek dosyasına da yazılır
+                    token_info = self.oauth.refresh_access_token(token_info['refresh_token'])
+                    self._token_info = token_info
+        return token_info if as_dict else token_info['access_token']
+
+
+def build_spotify_client(oauth: SpotifyOAuth, token_info: dict, session: requests.Session) -> spotipy.Spotify:
+    """Token'ı kendiliğinden yenileyen, tüm işçilerin ortak bağlantı havuzunu kullandığı istemci."""
+    return spotipy.Spotify(auth_manager=SharedTokenManager(oauth, token_info), requests_session=session)
+
+
+def profile_stage(name: str):
+    """
+    PlaylistEngine metodunun (ve çağırdıklarının) yaptığı Spotify isteklerini profilde `name` aşamasına
+    yazar. Aşama thread'e özeldir; işçi havuzunda çalışan metotlar da kendi aşamalarını bildirir.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.request_stats is None:
+                return method(self, *args, **kwargs)
+            with self.request_stats.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def print_log(message: str, type: str = "info"):
+    timestamp = datetime.now().strftime("[%H:%M:%S]")
+    stream = sys.stderr if type in ("error", "warn") else sys.stdout
+    print(f"{timestamp} {message}", file=stream, flush=True)
+
+
+ALBUM_TYPE_ORDER: Dict[str, int] = {album_type: i for i, album_type in enumerate(ALBUM_TYPES)}
+
+
+def album_release_key(album: dict) -> Tuple[str, int, str, str]:
+    """
+    Albümleri çıkış tarihine göre (eskiden yeniye) sabit biçimde sıralamak için anahtar.
+    Sadece yıl/ay içeren tarihler aynı dönemin tam tarihlilerinden önce gelir.
+    """
+    release_date = album.get('release_date') or ""
+    parts = (release_date.split('-') + ['00', '00'])[:3]
+    return (
+        '-'.join(part.zfill(2) for part in parts),
+        ALBUM_TYPE_ORDER.get(album.get('album_type'), len(ALBUM_TYPE_ORDER)),
+        (album.get('name') or "").lower(),
+        album.get('id') or "",
+    )
+
+
+# Parça adında sadece sürümü belirten parantez/tire ekleri (örn. "(Remastered 2011)", "- Deluxe Edition")
+TITLE_VERSION_KEYWORDS: Tuple[str, ...] = (
+    "remaster", "deluxe", "edition", "anniversary", "bonus", "expanded",
+    "mono", "stereo", "album version", "single version", "explicit", "clean",
+)
+TITLE_SEGMENT_PATTERN = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]|\s+-\s+[^\(\[]*")
+# Başlığı aynı iki parçanın aynı kayıt sayılması için en fazla süre farkı. Aynı master'ın
+# single/albüm/remaster sürümleri genelde bu aralıktadır; daha geniş tolerans ayrı kayıtları
+# (örn. aynı sanatçının farklı albümlerindeki "Intro"lar) birleştirir.
+DEDUPE_DURATION_TOLERANCE_MS: int = 1000
+
+
+def normalize_title(name: Optional[str]) -> str:
+    """Sürüm eklerini atıp küçük harfe çevirerek karşılaştırılabilir parça adı üretir."""
+    def strip_version(match: "re.Match") -> str:
+        segment = match.group(0).lower()
+        return "" if any(keyword in segment for keyword in TITLE_VERSION_KEYWORDS) else match.group(0)
+
+    title = TITLE_SEGMENT_PATTERN.sub(strip_version, name or "")
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+class OrderedUriSet:
+    """Ekleme sırasını koruyan, O(1) üyelik kontrollü URI kümesi (dict tabanlı)."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, uris: Iterable[str] = ()):
+        self._items: Dict[str, None] = dict.fromkeys(uris)
+
+    def add(self, uri: str) -> bool:
+        """URI yeni eklendiyse True, zaten varsa False döndürür."""
+        if uri in self._items:
+            return False
+        self._items[uri] = None
+        return True
+
+    def update(self, uris: Iterable[str]):
+        for uri in uris:
+            self._items.setdefault(uri, None)
+
+    def difference(self, other: Iterable[str]) -> "OrderedUriSet":
+        excluded = set(other)
+        return OrderedUriSet(uri for uri in self._items if uri not in excluded)
+
+    def to_list(self) -> List[str]:
+        return list(self._items)
+
+    def __contains__(self, uri: object) -> bool:
+        return uri in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class TrackDedupeIndex:
+    """
+    Aynı kaydın farklı URI'li sürümlerini gruplar. Parçalar önce ISRC'ye (biliniyorsa), yoksa
+    aynı ana sanatçının farklı bir albümündeki normalize edilmiş ad + süreye göre eşleştirilir
+    (albüm içi parçalarda ISRC yoktur). Gruplar ilk görüldükleri sırayı korur; her gruptan
+    `rule`'a göre tek bir (kanonik) parça seçilir.
+    """
+
+    def __init__(self, rule: str = "ORIGINAL"):
+        self.rule = rule
+        self._groups: List[List[TrackRecord]] = []
+        self._group_of: Dict[str, int] = {}
+        self._by_isrc: Dict[str, int] = {}
+        self._by_title: Dict[Tuple[Optional[str], str], List[int]] = {}
+
+    def add(self, track: TrackRecord) -> bool:
+        """Parça yeni bir kayda aitse True, zaten görülmüş bir kaydın sürümüyse False döndürür."""
+        uri = track.uri
+        if uri in self._group_of:
+            return False
+
+        title = normalize_title(track.name)
+        # Farklı sanatçıların aynı adlı parçaları (örn. cover'lar) ayrı kayıtlardır
+        title_key = (track.artist_id, title)
+        group = None if self.rule == "NONE" else self._find_group(track, title_key)
+        is_new = group is None
+        if is_new:
+            group = len(self._groups)
+            self._groups.append([track])
+            if title:
+                self._by_title.setdefault(title_key, []).append(group)
+        else:
+            self._groups[group].append(track)
+
+        self._group_of[uri] = group
+        if track.isrc:
+            self._by_isrc.setdefault(track.isrc, group)
+        return is_new
+
+    def _find_group(self, track: TrackRecord, title_key: Tuple[Optional[str], str]) -> Optional[int]:
+        isrc = track.isrc
+        if isrc in self._by_isrc:
+            return self._by_isrc[isrc]
+        for group in self._by_title.get(title_key, []):
+            members = self._groups[group]
+            first = members[0]
+            if isrc and first.isrc and first.isrc != isrc:
+                continue  # ISRC'leri farklı: aynı ada sahip ayrı kayıtlar
+            if track.album_id and any(member.album_id == track.album_id for member in members):
+                continue  # bir albümde aynı kaydın iki sürümü olmaz
+            if abs(first.duration_ms - track.duration_ms) <= DEDUPE_DURATION_TOLERANCE_MS:
+                return group
+        return None
+
+    def popularity_candidates(self) -> List[str]:
+        """Kanonik sürümü seçmek için popülerliği gereken URI'ler (sadece POPULAR kuralında, çoklu gruplar)."""
+        if self.rule != "POPULAR":
+            return []
+        return [track.uri for members in self._groups if len(members) > 1 for track in members]
+
+    def canonical_uris(self, popularity: Optional[Dict[str, int]] = None,
+                       exclude_uris: Iterable[str] = ()) -> List[str]:
+        """
+        Her gruptan seçilen parçayı grupların ilk görülme sırasıyla döndürür. `exclude_uris` içindeki
+        bir sürümü barındıran gruplar tamamen atlanır.
+        """
+        excluded = {self._group_of[uri] for uri in exclude_uris if uri in self._group_of}
+        return [
+            self._choose(members, popularity or {}).uri
+            for group, members in enumerate(self._groups) if group not in excluded
+        ]
+
+    def _choose(self, members: List[TrackRecord], popularity: Dict[str, int]) -> TrackRecord:
+        # Üyeler çıkış sırasıyla eklendiğinden ilk üye orijinal sürümdür; eşitlikte o tercih edilir
+        if self.rule == "POPULAR":
+            return max(members, key=lambda track: popularity.get(track.uri, -1))
+        if self.rule == "EXPLICIT":
+            return next((track for track in members if track.explicit), members[0])
+        if self.rule == "CLEAN":
+            return next((track for track in members if not track.explicit), members[0])
+        return members[0]
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+
+@dataclass
+class JobSpec:
+    """Tek bir playlist üretim işinin tüm ayarları (UI veya CLI'dan bağımsız)."""
+    artists: Dict[str, str]  # artist_id -> sanatçı adı (bilinmiyorsa boş)
+    album_types: List[str] = field(default_factory=lambda: ['album', 'single'])
+    sort_type: str = "TRACK"
+    playlist_mode: str = "NEW"
+    playlist_name: str = ""
+    existing_playlist: Optional[str] = None
+    is_public: bool = True
+    exclude_short: bool = True
+    max_tracks: Optional[int] = None
+    upload_cover: bool = True
+    cover_image_url: Optional[str] = None
+    dedupe_rule: str = "ORIGINAL"
+    cover_style: str = "ARTIST"
+    # MOSAIC için görseller; verilmezse ilk sanatçıların görselleri kullanılır
+    cover_image_urls: List[str] = field(default_factory=list)
+    # Popülerlik sorgularını albüm popülerliğiyle buda: çok daha az istek, ama seçim kesin değil
+    approximate_popularity: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JobSpec":
+        """
+        JSON iş tanımından JobSpec oluşturur. `artists` bir ID/URI/URL listesi veya
+        {id: ad} sözlüğü olabilir. Alan tipleri kontrol edilir; hatalı alan adıyla ValueError verilir.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"İş tanımı bir JSON nesnesi olmalıdır ({type(data).__name__} verildi).")
+
+        def value(name: str, expected: type, default=None, optional: bool = False):
+            item = data.get(name, default)
+            if item is None and optional:
+                return None
+            # bool, int'in alt sınıfıdır; sayı beklenen alanda true/false kabul edilmez
+            if isinstance(item, expected) and not (expected is int and isinstance(item, bool)):
+                return item
+            raise ValueError(f"'{name}' alanı {expected.__name__} olmalıdır ({type(item).__name__} verildi).")
+
+        def strings(name: str, items) -> List[str]:
+            if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+                raise ValueError(f"'{name}' alanı metin listesi olmalıdır.")
+            return items
+
+        raw_artists = data.get('artists') or []
+        if isinstance(raw_artists, dict):
+            if not all(isinstance(key, str) and isinstance(name, (str, type(None))) for key, name in raw_artists.items()):
+                raise ValueError("'artists' sözlüğü {ID: ad} metinlerinden oluşmalıdır.")
+            artists = {artist_id_from_input(key): name or "" for key, name in raw_artists.items()}
+        else:
+            artists = {artist_id_from_input(value): "" for value in strings('artists', raw_artists)}
+
+        spec = cls(
+            artists=artists,
+            album_types=list(strings('album_types', data.get('album_types', ['album', 'single']))),
+            sort_type=value('sort_type', str, "TRACK"),
+            playlist_mode=value('playlist_mode', str, "NEW"),
+            playlist_name=value('playlist_name', str, ""),
+            existing_playlist=value('existing_playlist', str, optional=True),
+            is_public=value('is_public', bool, True),
+            exclude_short=value('exclude_short', bool, True),
+            max_tracks=value('max_tracks', int, optional=True),
+            upload_cover=value('upload_cover', bool, True),
+            cover_image_url=value('cover_image_url', str, optional=True),
+            dedupe_rule=value('dedupe_rule', str, "ORIGINAL"),
+            cover_style=value('cover_style', str, "ARTIST"),
+            cover_image_urls=list(strings('cover_image_urls', data.get('cover_image_urls') or [])),
+            approximate_popularity=value('approximate_popularity', bool, False),
+        )
+        spec.validate()
+        return spec
+
+    def validate(self):
+        if not self.artists:
+            raise ValueError("Lütfen en az bir sanatçı seçin.")
+        if self.sort_type not in SORT_TYPES:
+            raise ValueError(f"Geçersiz sıralama tipi: {self.sort_type}")
+        if self.playlist_mode not in PLAYLIST_MODES:
+            raise ValueError("Geçersiz Playlist Modu.")
+        if self.dedupe_rule not in DEDUPE_RULES:
+            raise ValueError(f"Geçersiz sürüm seçme kuralı: {self.dedupe_rule}")
+        if self.cover_style not in COVER_STYLES:
+            raise ValueError(f"Geçersiz kapak tipi: {self.cover_style}")
+        unknown_types = [t for t in self.album_types if t not in ALBUM_TYPES]
+        if unknown_types:
+            raise ValueError(f"Geçersiz albüm tipi: {', '.join(unknown_types)}")
+        if self.max_tracks is not None and self.max_tracks <= 0:
+            raise ValueError("Maksimum parça sayısı pozitif olmalıdır.")
+        # Top parça kullanan stratejiler (örn. Buzdağı) albüm olmadan da sadece Top parçalarla çalışabilir
+        if not self.album_types and not SELECTION_STRATEGIES[self.sort_type].needs_top_tracks:
+            raise ValueError("Lütfen en az bir albüm tipi seçin (Album/Single/Compilation).")
+        if self.playlist_mode == "INCREMENTAL":
+            # Yeni parçalar çıkış sırasıyla sona eklenir; sıralama/kesme watermark'ı geçersiz kılardı
+            if self.sort_type != "TRACK":
+                raise ValueError("Sadece yeni çıkanları ekleme modu yalnızca 'Albümdeki Sırasına Göre' sıralamasıyla kullanılabilir.")
+            if self.max_tracks is not None:
+                raise ValueError("Sadece yeni çıkanları ekleme modunda maksimum parça sayısı kullanılamaz.")
+
+    def checkpoint_key(self) -> str:
+        """Aynı işin tekrar çalıştırıldığını tanımak için playlist içeriğini belirleyen ayarlardan türetilen anahtar."""
+        data = asdict(self)
+        # Sanatçı adları sonradan doldurulur; sadece ID'ler (sırasıyla) işi belirler
+        data['artists'] = list(self.artists)
+        for name in ('is_public', 'upload_cover', 'cover_image_url', 'cover_style', 'cover_image_urls'):
+            data.pop(name)
+        return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+@dataclass
+class RunResult:
+    playlist_id: str
+    playlist: dict
+    added_count: int
+    track_count: int
+
+
+@dataclass
+class JobReport:
+    name: str
+    result: Optional[RunResult] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    requests: int = 0
+
+
+@dataclass
+class WriteCheckpoint:
+    """
+    Yarım kalan bir playlist yazımının diskte tutulan durumu. Her 100'lük grup eklendikten sonra
+    güncellenir; aynı iş tekrar çalıştırılınca toplama atlanır ve kalan gruplardan devam edilir.
+    """
+    playlist_id: str
+    base_total: int  # yazmaya başlamadan önce playlist'teki parça sayısı
+    uris: List[str] = field(default_factory=list)  # hedef liste (akış modunda: şimdiye kadar eklenenler)
+    committed: int = 0  # `uris` içinden playlist'e yazılmış olanların sayısı
+    pending: Optional[List[str]] = None  # gönderilmiş ama sonucu kaydedilememiş grup
+    streaming: bool = False
+    snapshot_id: Optional[str] = None
+    watermarks: Optional[Dict[str, dict]] = None  # INCREMENTAL: yazma bitince kaydedilecek watermark'lar
+
+
+class PlaylistEngine:
+    """
+    Sanatçı diskografisi toplama ve playlist yazma hattı. Flet'e bağımlı değildir;
+    arayüz ve CLI aynı motoru log/ilerleme geri çağrılarıyla kullanır.
+    """
+
+    def __init__(self, sp: spotipy.Spotify, user_id: str, metadata_cache: MetadataCache,
+                 write_pacer: AdaptivePacer, log: Optional[LogCallback] = None,
+                 progress: Optional[ProgressCallback] = None, workers: int = HARVEST_WORKERS,
+                 async_harvester=None, cover_pipeline: Optional[CoverPipeline] = None,
+                 request_stats: Optional[RequestStats] = None, profile_path: Optional[Path] = None):
+        self.sp = sp
+        self.user_id = user_id
+        self.metadata_cache = metadata_cache
+        self.write_pacer = write_pacer
+        self.workers = workers
+        # paradox_async.AsyncHarvester verilirse albüm/parça okumaları önce coroutine'lerle önbelleğe alınır
+        self.async_harvester = async_harvester
+        # Verilirse istekler aşama bazında profillenir; her çalıştırmanın sonunda özet loglanır ve
+        # `profile_path` verildiyse profil (JSON veya .folded flamegraph) dosyaya yazılır
+        self.request_stats = request_stats
+        self.profile_path = profile_path
+        self.cover_pipeline = cover_pipeline or CoverPipeline(metadata_cache, COVER_CACHE_STORE)
+        # Kapak indirme/kodlama parça toplama ve yazma ile eşzamanlı bu thread'de yürür
+        self._cover_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paradox-cover")
+        self._log_callback = log or print_log
+        self._progress_callback = progress
+
+    def _log(self, message: str, type: str = "info"):
+        self._log_callback(message, type)
+
+    def _update_flow_stats(self, step: str, current: int = 0, total: int = 1, added: int = 0, rate: Optional[float] = None):
+        if self._progress_callback:
+            self._progress_callback(step, current=current, total=total, added=added, rate=rate)
+
+    @profile_stage("artist_albums")
+    def _get_artist_albums(self, artist_id: str, album_types: List[str]) -> List[dict]:
+        albums: Dict[str, dict] = {}
+        for album_type in album_types:
+            cache_key = f"{artist_id}:{album_type}"
+            items = self.metadata_cache.get('artist_albums', cache_key)
+            if items is None:
+                items = []
+                results = self.sp.artist_albums(artist_id, album_type=album_type, country='from_token', limit=50)
+                while results:
+                    items.extend(slim_album(item) for item in results['items'])
+                    if results['next']:
+                        results = self.sp.next(results)
+                    else:
+                        results = None
+                self.metadata_cache.put('artist_albums', cache_key, items)
+
+            for item in items:
+                # Aynı albüm birden fazla tipte dönebilir; farklı sürümlerin (deluxe, remaster) aynı
+                # parçaları TrackDedupeIndex ile parça seviyesinde tekilleştirilir.
+                if item['id'] not in albums:
+                    albums[item['id']] = item
+        # API sırası tiplere göre gruplanır; sabit çıktı için çıkış tarihine göre sıralıyoruz
+        return sorted(albums.values(), key=album_release_key)
+
+    @profile_stage("artist_albums")
+    def _get_new_artist_albums(self, artist_id: str, album_types: List[str], watermark: dict) -> List[dict]:
+        """
+        Watermark'tan sonra çıkan albümleri döndürür. API her tip için en yeniden eskiye sıraladığından
+        sayfalama bilinen bir albüme (veya daha önce işlenmiş bir tipte watermark tarihinden eski bir
+        albüme) ulaşınca durur; sonuç önbelleğe yazılmaz çünkü diskografinin sadece başıdır.
+        """
+        known = set(watermark['album_ids'])
+        known_types = set(watermark['album_types'])
+        latest = watermark['latest_release_date']
+        albums: Dict[str, dict] = {}
+        for album_type in album_types:
+            results = self.sp.artist_albums(artist_id, album_type=album_type, country='from_token', limit=INCREMENTAL_PAGE_SIZE)
+            while results:
+                reached_known = False
+                for item in results['items']:
+                    if item['id'] in known or (album_type in known_types and album_release_key(item)[0] < latest):
+                        reached_known = True
+                    elif item['id'] not in albums:
+                        albums[item['id']] = slim_album(item)
+                if results['next'] and not reached_known:
+                    results = self.sp.next(results)
+                else:
+                    results = None
+        return sorted(albums.values(), key=album_release_key)
+
+    @staticmethod
+    def _advance_watermark(watermark: Optional[dict], albums: List[dict], album_types: List[str]) -> dict:
+        """Watermark'a bu çalıştırmada işlenen albümleri ekler."""
+        album_ids = OrderedUriSet(watermark['album_ids'] if watermark else [])
+        album_ids.update(album['id'] for album in albums)
+        dates = [album_release_key(album)[0] for album in albums]
+        if watermark:
+            dates.append(watermark['latest_release_date'])
+        types = OrderedUriSet(watermark['album_types'] if watermark else [])
+        types.update(album_types)
+        return {
+            'album_ids': album_ids.to_list(),
+            'album_types': types.to_list(),
+            'latest_release_date': max(dates, default=""),
+        }
+
+    def _get_tracks_from_album(self, album_id: str, exclude_short: bool) -> List[str]:
+        for _, track_uris in self._iter_tracks_from_albums([album_id], exclude_short):
+            return track_uris
+        return []
+
+    def _iter_tracks_from_albums(self, album_ids: List[str], exclude_short: bool,
+                                 executor: Optional[ThreadPoolExecutor] = None) -> Iterator[Tuple[str, List[str]]]:
+        """Albüm parçalarını (album_id, uri listesi) olarak albüm sırasıyla döndürür."""
+        for album_id, tracks in self._iter_album_tracks(album_ids, exclude_short, executor):
+            yield album_id, [track.uri for track in tracks]
+
+    def _iter_album_tracks(self, album_ids: List[str], exclude_short: bool,
+                           executor: Optional[ThreadPoolExecutor] = None) -> Iterator[Tuple[str, List[TrackRecord]]]:
+        """
+        Albüm parçalarını (album_id, parça listesi) olarak albüm sırasıyla döndürür.
+        Önbellekte taze kaydı olmayan albümler `sp.albums` ile 20'şerli gruplar halinde çekilir;
+        sadece gömülü parça sayfasına sığmayan albümler için `sp.next` ile sayfalama yapılır.
+        `executor` verilirse gruplar en fazla ALBUM_CHUNK_WINDOW grupluk bir pencereyle paralel çekilir.
+        Döndürülen albümler sözlükten çıkarılır; bellekte sadece henüz döndürülmemiş albümler kalır.
+        """
+        album_tracks: Dict[str, List[TrackRecord]] = {
+            album_id: [TrackRecord.from_cache(data, album_id) for data in tracks]
+            for album_id, tracks in self.metadata_cache.get_many('album_tracks', album_ids).items()
+        }
+        missing = [album_id for album_id in dict.fromkeys(album_ids) if album_id not in album_tracks]
+
+        chunk_size = 20  # Spotify "Get Several Albums" limiti
+        chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        chunk_of: Dict[str, int] = {album_id: n for n, chunk in enumerate(chunks) for album_id in chunk}
+        last_index = {album_id: i for i, album_id in enumerate(album_ids)}
+        futures: Dict[int, Future] = {}
+        submitted = 0
+
+        for i, album_id in enumerate(album_ids):
+            if album_id not in album_tracks:
+                n = chunk_of[album_id]
+                if executor:
+                    # Gruplar albüm sırasıyla tüketilir; pencere tüketilen grupla birlikte ilerler
+                    while submitted < min(len(chunks), n + ALBUM_CHUNK_WINDOW):
+                        futures[submitted] = executor.submit(self._fetch_album_chunk, chunks[submitted])
+                        submitted += 1
+                    album_tracks.update(futures.pop(n).result())
+                else:
+                    album_tracks.update(self._fetch_album_chunk(chunks[n]))
+            tracks = album_tracks[album_id] if last_index[album_id] > i else album_tracks.pop(album_id)
+            yield album_id, self._filter_tracks(tracks, exclude_short)
+
+    @profile_stage("album_tracks")
+    def _fetch_album_chunk(self, album_ids: List[str]) -> Dict[str, List[TrackRecord]]:
+        fetched: Dict[str, List[TrackRecord]] = {}
+        popularity: Dict[str, int] = {}
+        results = self.sp.albums(album_ids)
+        for album_id, album in zip(album_ids, results.get('albums', [])):
+            tracks: List[TrackRecord] = []
+            page = album.get('tracks') if album else None
+            while page:
+                # Yanıt sayfası hemen kayıtlara indirgenir; ham JSON saklanmaz
+                tracks.extend(TrackRecord.from_api(track) for track in page['items'] if track and track.get('uri'))
+                page = self.sp.next(page) if page.get('next') else None
+            # Erişilemeyen albümler de boş liste olarak saklanır ki her çalıştırmada tekrar istenmesin
+            fetched[album_id] = tracks
+            if album and album.get('popularity') is not None:
+                popularity[album_id] = album['popularity']
+        # Albüm popülerliği Buzdağı modunda parça popülerliği sorgularını budamak için kullanılır
+        self.metadata_cache.put_album_tracks(fetched, popularity)
+        for album_id, tracks in fetched.items():
+            for track in tracks:
+                track.album_id = album_id
+        return fetched
+
+    @staticmethod
+    def _filter_tracks(tracks: List[TrackRecord], exclude_short: bool) -> List[TrackRecord]:
+        return [
+            track for track in tracks
+            if not exclude_short or track.duration_ms >= 60000
+        ]
+
+    @staticmethod
+    def _filter_track_uris(tracks: List[TrackRecord], exclude_short: bool) -> List[str]:
+        return [track.uri for track in PlaylistEngine._filter_tracks(tracks, exclude_short)]
+
+    @profile_stage("top_tracks")
+    def _get_artist_top_tracks(self, artist_id: str) -> List[TrackRecord]:
+        cached = self.metadata_cache.get('artist_top_tracks', artist_id)
+        if cached is not None:
+            return [TrackRecord.from_cache(data, artist_id=artist_id) for data in cached]
+
+        top_tracks_data = self.sp.artist_top_tracks(artist_id, country='from_token')
+        tracks = [TrackRecord.from_api(track) for track in top_tracks_data.get('tracks', []) if track and track.get('uri')]
+        self.metadata_cache.put_artist_top_tracks(artist_id, tracks)
+        return tracks
+
+    def _get_track_popularity(self, track_uris: List[str],
+                              executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, int]:
+        """
+        Parça URI'lerinin popülerlik değerlerini döndürür. Önbellekte taze olmayanlar
+        `sp.tracks` ile 50'şerli gruplar halinde çekilir; `executor` verilirse gruplar paralel çekilir.
+        """
+        ids = {uri: uri.split(':')[-1] for uri in track_uris}
+        cached = self.metadata_cache.get_many('track_popularity', ids.values())
+        missing = [track_id for track_id in dict.fromkeys(ids.values()) if track_id not in cached]
+
+        chunk_size = 50
+        chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        results = executor.map(self._fetch_popularity_chunk, chunks) if executor else map(self._fetch_popularity_chunk, chunks)
+        for fetched in results:
+            cached.update(fetched)
+
+        return {uri: cached[track_id] for uri, track_id in ids.items() if cached.get(track_id) is not None}
+
+    @profile_stage("track_popularity")
+    def _fetch_popularity_chunk(self, track_ids: List[str]) -> Dict[str, Optional[int]]:
+        try:
+            # Spotify API'dan track detaylarını çekiyoruz (popülerlik bilgisi için)
+            results = self.sp.tracks(track_ids)
+        except SpotifyException as e:
+            self._log(f"Parça popülerlik bilgisi çekilirken hata: {e}", "error")
+            return {}
+        fetched = {
+            track_id: track.get('popularity') if track else None
+            for track_id, track in zip(track_ids, results.get('tracks', []) if results else [])
+        }
+        self.metadata_cache.put_many('track_popularity', fetched)
+        return fetched
+
+    def _get_track_popularity_pruned(self, candidates: List[str], album_of: Dict[str, dict], limit: int) -> Dict[str, int]:
+        """
+        YAKLAŞIK: sadece `JobSpec.approximate_popularity` ile, en popüler `limit` parçanın bilinmesi
+        gerektiğinde `_get_track_popularity` yerine kullanılır. Albüm popülerliği parça popülerliği için
+        gerçek bir üst sınır değildir; atlanan albümlerde daha popüler parçalar kalabilir.
+        Önbellekte popülerliği olan parçalar istek gerektirmez. Kalanlar, albüm popülerliği
+        (+ POPULARITY_BOUND_SLACK) parça popülerliği için üst sınır kabul edilerek en yüksek sınırlı
+        albümden başlanıp 50'şerli gruplarla çekilir; sınırlı yığındaki en düşük değer sıradaki albümün
+        sınırını geçtiğinde kalan albümler hiç istenmez. Eşit sınırda derlemeler en sona kalır.
+        Popülerliği bilinen (önbellekteki veya çekilen) parçaların değerlerini döndürür.
+        """
+        order = {uri: i for i, uri in enumerate(candidates)}
+        heap: List[Tuple[int, int, str]] = []
+        known: Dict[str, int] = {}
+
+        def offer(uri: str, popularity: int):
+            known[uri] = popularity
+            item = (popularity, -order[uri], uri)
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        cached = self.metadata_cache.get_many('track_popularity', (uri.split(':')[-1] for uri in candidates))
+        pending: Dict[str, List[str]] = {}
+        for uri in candidates:
+            track_id = uri.split(':')[-1]
+            if track_id in cached:
+                if cached[track_id] is not None:
+                    offer(uri, cached[track_id])
+            else:
+                pending.setdefault(album_of[uri]['id'], []).append(uri)
+
+        album_types = {album['id']: album.get('album_type') for album in album_of.values()}
+        album_popularity = self.metadata_cache.get_many('album_popularity', pending)
+
+        def bound(album_id: str) -> int:
+            popularity = album_popularity.get(album_id)
+            return 100 if popularity is None else min(100, popularity + POPULARITY_BOUND_SLACK)
+
+        album_order = sorted(
+            pending, key=lambda album_id: (-bound(album_id), ALBUM_TYPE_ORDER.get(album_types[album_id], len(ALBUM_TYPE_ORDER)))
+        )
+        # Sınırlar azalan sırada olduğundan budama kontrolü her 50'lik grubun ilk parçasında yapılır
+        queued = [(uri, bound(album_id)) for album_id in album_order for uri in pending[album_id]]
+        chunk_size = 50
+        for i in range(0, len(queued), chunk_size):
+            if len(heap) == limit and heap[0][0] > queued[i][1]:
+                skipped = {album_of[uri]['id'] for uri, _ in queued[i:]}
+                self._log(f"{len(skipped)} albümün popülerlik sorgusu atlandı (sınır: {heap[0][0]}).", "cyan")
+                break
+            for uri, popularity in self._get_track_popularity([uri for uri, _ in queued[i:i + chunk_size]]).items():
+                offer(uri, popularity)
+
+        return known
+
+    def _create_or_manage_playlist(self, mode: str, name: str, existing_id: Optional[str], is_public: bool,
+                                   artist_names: List[str]) -> str:
+        if mode == "NEW":
+            if not name:
+                raise ValueError("Yeni playlist oluşturmak için bir isim girmelisiniz.")
+            playlist = self.sp.user_playlist_create(
+                user=self.user_id,
+                name=name,
+                public=is_public,
+                description=f"PARADOX Flet tarafından oluşturuldu. Sanatçılar: {', '.join(artist_names)}"
+            )
+            self._log(f"Yeni playlist oluşturuldu: {playlist['name']} ({playlist['id']})", "succ")
+            return playlist['id']
+        
+        elif mode in ["OVERWRITE", "APPEND", "INCREMENTAL"]:
+            if not existing_id:
+                raise ValueError("Varolan bir playlist'i yönetmek için ID veya URL girmelisiniz.")
+            
+            try:
+                playlist = self.sp.playlist(existing_id)
+            except SpotifyException as e:
+                if '404' in str(e):
+                    raise SpotifyException(404, -1, f"Playlist ID '{existing_id}' bulunamadı.")
+                raise e
+
+            if mode == "OVERWRITE":
+                # Parçalar burada silinmez; _sync_playlist_tracks mevcut liste ile hedef liste arasındaki farkı uygular
+                self._log(f"Varolan playlist '{playlist['name']}' hedef listeyle eşitlenecek (overwrite).", "warn")
+
+            self._log(f"Playlist ID kullanılıyor: {playlist['name']} ({playlist['id']})", "succ")
+            return playlist['id']
+            
+        else:
+            raise ValueError("Geçersiz Playlist Modu.")
+            
+    def _add_tracks_to_playlist(self, key: str, checkpoint: WriteCheckpoint) -> int:
+        """Checkpoint'teki hedef listenin henüz yazılmamış kısmını 100'lük gruplar halinde ekler."""
+        chunk_size = 100
+        total = len(checkpoint.uris)
+        while checkpoint.committed < total:
+            chunk = checkpoint.uris[checkpoint.committed:checkpoint.committed + chunk_size]
+            self._commit_chunk(key, checkpoint, chunk)
+            self._update_flow_stats(
+                "ADDING_TRACKS", current=checkpoint.committed, total=total, added=checkpoint.committed,
+                rate=self.write_pacer.rate()
+            )
+        return checkpoint.committed
+
+    @profile_stage("checkpoint")
+    def _start_checkpoint(self, job: JobSpec, playlist_id: str, **fields) -> WriteCheckpoint:
+        if job.playlist_mode == "NEW":
+            return WriteCheckpoint(playlist_id, base_total=0, **fields)
+        info = self.sp.playlist(playlist_id, fields='tracks.total,snapshot_id')
+        return WriteCheckpoint(playlist_id, base_total=info['tracks']['total'], snapshot_id=info['snapshot_id'], **fields)
+
+    @profile_stage("checkpoint")
+    def _load_checkpoint(self, job: JobSpec) -> Optional[WriteCheckpoint]:
+        """
+        Aynı işin yarım kalmış yazımını yükler. OVERWRITE modu fark tabanlı olduğundan tekrar
+        çalıştırıldığında zaten kaldığı yerden devam eder; onun için checkpoint tutulmaz.
+        """
+        if job.playlist_mode == "OVERWRITE":
+            return None
+        data = self.metadata_cache.get_checkpoint(job.checkpoint_key())
+        if not data:
+            return None
+        checkpoint = WriteCheckpoint(**data)
+        if checkpoint.pending:
+            # Son grup gönderilmiş ama sonucu kaydedilememiş; playlist'e bakarak karar verilir
+            if self._chunk_landed(checkpoint, checkpoint.pending):
+                self._mark_committed(checkpoint, checkpoint.pending)
+            checkpoint.pending = None
+        self._log(f"Yarım kalan yazma bulundu: {checkpoint.committed} parça zaten eklenmiş, kaldığı yerden devam ediliyor.", "warn")
+        return checkpoint
+
+    def _chunk_landed(self, checkpoint: WriteCheckpoint, chunk: List[str]) -> bool:
+        """Cevabı alınamayan bir ekleme isteğinin yine de playlist'e işlenip işlenmediğini tahmin eder."""
+        info = self.sp.playlist(checkpoint.playlist_id, fields='tracks.total,snapshot_id')
+        if checkpoint.snapshot_id and info['snapshot_id'] == checkpoint.snapshot_id:
+            return False  # son onaylı yazmadan beri playlist değişmemiş
+        return info['tracks']['total'] >= checkpoint.base_total + checkpoint.committed + len(chunk)
+
+    @staticmethod
+    def _mark_committed(checkpoint: WriteCheckpoint, chunk: List[str]):
+        if checkpoint.streaming:
+            checkpoint.uris.extend(chunk)
+        checkpoint.committed += len(chunk)
+
+    @staticmethod
+    def _is_transient_error(ex: Exception) -> bool:
+        if isinstance(ex, SpotifyException):
+            return ex.http_status in RETRYABLE_5XX
+        return isinstance(ex, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    @profile_stage("write")
+    def _commit_chunk(self, key: str, checkpoint: WriteCheckpoint, chunk: List[str]):
+        """
+        Tek bir grubu ekler ve checkpoint'i diske yazar. Grup göndermeden önce "bekliyor" olarak
+        kaydedilir; geçici hatalarda tekrar göndermeden önce grubun zaten işlenip işlenmediğine
+        bakılır, böylece hiçbir grup iki kez eklenmez.
+        """
+        checkpoint.pending = chunk
+        self.metadata_cache.put_checkpoint(key, asdict(checkpoint))
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                if attempt and self._chunk_landed(checkpoint, chunk):
+                    break
+                # Bekleme/geri çekilme http_session içindeki write_pacer tarafından yönetilir
+                result = self.sp.playlist_add_items(checkpoint.playlist_id, chunk)
+                checkpoint.snapshot_id = (result or {}).get('snapshot_id')
+                break
+            except (SpotifyException, requests.exceptions.RequestException) as ex:
+                if not self._is_transient_error(ex) or attempt == WRITE_RETRIES:
+                    self._log(
+                        f"Yazma durdu ({checkpoint.committed} parça eklendi). İş tekrar çalıştırılınca kaldığı yerden devam edilir.",
+                        "warn"
+                    )
+                    raise
+                self._log(f"Geçici yazma hatası: {ex}. Tekrar deneniyor ({attempt + 1}/{WRITE_RETRIES})...", "warn")
+                time.sleep(WRITE_RETRY_BACKOFF * (attempt + 1))
+        checkpoint.pending = None
+        self._mark_committed(checkpoint, chunk)
+        self.metadata_cache.put_checkpoint(key, asdict(checkpoint))
+    
+    @profile_stage("playlist_read")
+    def _get_playlist_uris(self, playlist_id: str, skip_unremovable: bool = False) -> Optional[List[str]]:
+        """
+        Playlist'teki parça URI'lerini sırasıyla döndürür. URI ile silinemeyen öğe (yerel dosya,
+        erişilemeyen parça) varsa fark uygulanamayacağı için None döner; `skip_unremovable`
+        verilirse bu öğeler atlanır.
+        """
+        uris: List[str] = []
+        results = self.sp.playlist_items(
+            playlist_id, fields='items(track(uri)),next', limit=100, additional_types=('track',)
+        )
+        while results:
+            for item in results['items']:
+                uri = (item.get('track') or {}).get('uri')
+                if not uri or uri.startswith('spotify:local:'):
+                    if skip_unremovable:
+                        continue
+                    return None
+                uris.append(uri)
+            if results['next']:
+                results = self.sp.next(results)
+            else:
+                results = None
+        return uris
+
+    @staticmethod
+    def _longest_increasing_subsequence(seq: List[int]) -> Set[int]:
+        """`seq` içindeki en uzun artan alt dizinin değerlerini döndürür (O(n log n))."""
+        tails: List[int] = []
+        tail_idx: List[int] = []
+        prev: List[int] = [-1] * len(seq)
+        for i, value in enumerate(seq):
+            pos = bisect.bisect_left(tails, value)
+            if pos == len(tails):
+                tails.append(value)
+                tail_idx.append(i)
+            else:
+                tails[pos] = value
+                tail_idx[pos] = i
+            prev[i] = tail_idx[pos - 1] if pos > 0 else -1
+
+        result: Set[int] = set()
+        i = tail_idx[-1] if tail_idx else -1
+        while i >= 0:
+            result.add(seq[i])
+            i = prev[i]
+        return result
+
+    @profile_stage("write")
+    def _sync_playlist_tracks(self, playlist_id: str, target_uris: List[str]) -> int:
+        """
+        OVERWRITE modu: playlist'i hedef listeye en az yazma çağrısıyla eşitler.
+        Değişmeyen parçalar yerinde kalır (eklenme tarihleri korunur); sadece fazlalar silinir,
+        yeri değişenler taşınır ve yeni parçalar doğru konuma eklenir. Fark, tam yeniden yazmadan
+        daha pahalıysa `playlist_replace_items` (ilk 100) + 100'erli ekleme kullanılır.
+        Son yazılan snapshot önbellekte tutulur; playlist o zamandan beri değişmediyse mevcut
+        parçalar tekrar çekilmez. Eklenen parça sayısını döndürür.
+        """
+        chunk_size = 100
+        target_uris = OrderedUriSet(target_uris).to_list()
+        total = len(target_uris)
+
+        snapshot_id = self.sp.playlist(playlist_id, fields='snapshot_id')['snapshot_id']
+        stored = self.metadata_cache.get('playlist_snapshot', playlist_id)
+        if stored and stored.get('snapshot_id') == snapshot_id:
+            current_uris: Optional[List[str]] = stored['uris']
+            self._log("Playlist son yazımdan beri değişmemiş; mevcut parçalar önbellekten alındı.", "cyan")
+        else:
+            current_uris = self._get_playlist_uris(playlist_id)
+
+        # 1. Farkı hesapla
+        diff_calls = None
+        if current_uris is not None:
+            target_index = {uri: i for i, uri in enumerate(target_uris)}
+            counts: Dict[str, int] = {}
+            for uri in current_uris:
+                counts[uri] = counts.get(uri, 0) + 1
+            # Hedefte olmayanlar ve playlist'te birden fazla geçenler (tümü silinip tek kopya yeniden eklenir)
+            to_remove = [uri for uri in counts if uri not in target_index or counts[uri] > 1]
+            removed = set(to_remove)
+            kept = [uri for uri in current_uris if uri not in removed]
+            stable = self._longest_increasing_subsequence([target_index[uri] for uri in kept])
+            moves = [uri for uri in kept if target_index[uri] not in stable]
+            kept_set = set(kept)
+
+            runs: List[Tuple[int, List[str]]] = []
+            for i, uri in enumerate(target_uris):
+                if uri in kept_set:
+                    continue
+                if runs and runs[-1][0] + len(runs[-1][1]) == i:
+                    runs[-1][1].append(uri)
+                else:
+                    runs.append((i, [uri]))
+
+            diff_calls = (
+                -(-len(to_remove) // chunk_size) + len(moves)
+                + sum(-(-len(run) // chunk_size) for _, run in runs)
+            )
+
+        replace_calls = max(1, -(-total // chunk_size))
+
+        if diff_calls is None or diff_calls > replace_calls:
+            # 2a. Tam yeniden yazma
+            self._log(f"Playlist tamamen yeniden yazılıyor ({replace_calls} yazma çağrısı).", "warn")
+            result = self.sp.playlist_replace_items(playlist_id, target_uris[:chunk_size])
+            snapshot_id = result.get('snapshot_id', snapshot_id) if result else snapshot_id
+            added_count = len(target_uris[:chunk_size])
+            self._update_flow_stats("ADDING_TRACKS", current=added_count, total=total, added=added_count, rate=self.write_pacer.rate())
+            for i in range(chunk_size, total, chunk_size):
+                chunk = target_uris[i:i + chunk_size]
+                result = self.sp.playlist_add_items(playlist_id, chunk)
+                snapshot_id = result.get('snapshot_id', snapshot_id) if result else snapshot_id
+                added_count += len(chunk)
+                self._update_flow_stats("ADDING_TRACKS", current=added_count, total=total, added=added_count, rate=self.write_pacer.rate())
+        else:
+            # 2b. Sadece farkı uygula
+            self._log(
+                f"Playlist farkı uygulanıyor: {len(to_remove)} silme, {len(moves)} taşıma, "
+                f"{sum(len(run) for _, run in runs)} ekleme ({diff_calls} yazma çağrısı).", "warn"
+            )
+            for i in range(0, len(to_remove), chunk_size):
+                result = self.sp.playlist_remove_all_occurrences_of_items(
+                    playlist_id, to_remove[i:i + chunk_size], snapshot_id=snapshot_id
+                )
+                snapshot_id = result.get('snapshot_id', snapshot_id) if result else snapshot_id
+
+            # Taşımalar: her parça, hedef sırada kendinden önce gelen yerleşik parçanın hemen arkasına alınır
+            layout = list(kept)
+            settled = set(stable)
+            for uri in sorted(moves, key=target_index.get):
+                position = target_index[uri]
+                predecessor = max((target_index[u] for u in layout if target_index[u] in settled and target_index[u] < position), default=None)
+                insert_before = layout.index(target_uris[predecessor]) + 1 if predecessor is not None else 0
+                range_start = layout.index(uri)
+                if range_start != insert_before:
+                    result = self.sp.playlist_reorder_items(
+                        playlist_id, range_start=range_start, insert_before=insert_before, snapshot_id=snapshot_id
+                    )
+                    snapshot_id = result.get('snapshot_id', snapshot_id) if result else snapshot_id
+                    layout.pop(range_start)
+                    layout.insert(insert_before - 1 if insert_before > range_start else insert_before, uri)
+                settled.add(position)
+
+            # Eklemeler: hedef sırayla işlendiğinde her yeni grup, hedefteki konumuna doğrudan eklenebilir
+            added_count = 0
+            new_total = sum(len(run) for _, run in runs)
+            for position, run in runs:
+                for i in range(0, len(run), chunk_size):
+                    result = self.sp.playlist_add_items(playlist_id, run[i:i + chunk_size], position=position + i)
+                    snapshot_id = result.get('snapshot_id', snapshot_id) if result else snapshot_id
+                    added_count += len(run[i:i + chunk_size])
+                    self._update_flow_stats("ADDING_TRACKS", current=added_count, total=new_total, added=added_count, rate=self.write_pacer.rate())
+
+        self.metadata_cache.put('playlist_snapshot', playlist_id, {'snapshot_id': snapshot_id, 'uris': target_uris})
+        return added_count
+
+    def _start_cover(self, job: JobSpec) -> Optional["Future[EncodedCover]"]:
+        """Kapağı arka planda hazırlamaya başlar; görsel yoksa uyarır ve None döner."""
+        if not job.upload_cover:
+            return None
+        image_urls = job.cover_image_urls if job.cover_style == "MOSAIC" else [job.cover_image_url]
+        if not any(image_urls):
+            self._log("Playlist kapağı için sanatçı resmi bulunamadı.", "warn")
+            return None
+        return self._cover_executor.submit(self.cover_pipeline.build, image_urls)
+
+    @profile_stage("cover")
+    def _upload_playlist_cover(self, playlist_id: str, cover: Optional["Future[EncodedCover]"]):
+        if cover is None:
+            return
+        try:
+            encoded = cover.result()
+            self.sp.playlist_upload_cover_image(playlist_id, encoded.payload)
+            source = "önbellekten" if encoded.from_cache else f"JPEG kalite {encoded.quality}"
+            self._log(
+                f"Playlist kapağı başarıyla güncellendi ({encoded.size}px, {encoded.bytes // 1024} KB, {source}).", "succ"
+            )
+        except Exception as e:
+            self._log(f"Playlist kapağı yüklenirken hata oluştu: {e}", "error")
+
+    def _get_artists(self, artist_ids: List[str]) -> Dict[str, dict]:
+        """
+        Sanatçı nesnelerini 50'şerli `sp.artists` istekleriyle {id: sanatçı} olarak döndürür. Spotify bir
+        grubu (örn. geçersiz veya kaldırılmış bir ID yüzünden) reddederse o gruptaki ID'ler tek tek
+        sorulur; yine reddedilenler loglanır ve sonuçta yer almaz.
+        """
+        artists: Dict[str, dict] = {}
+
+        def lookup(batch: List[str]):
+            try:
+                results = self.sp.artists(batch).get('artists', [])
+            except SpotifyException as e:
+                if len(batch) > 1:
+                    for artist_id in batch:
+                        lookup([artist_id])
+                else:
+                    self._log(f"API Hatası (Sanatçı): {batch[0]}: {e}", "warn")
+                return
+            for artist in results:
+                if artist:
+                    artists[artist['id']] = artist
+
+        for i in range(0, len(artist_ids), 50):
+            lookup(artist_ids[i:i + 50])
+        return artists
+
+    @profile_stage("resolve_artists")
+    def resolve_artists(self, entries: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Toplu içe aktarma: sanatçı adlarını, ID/URI/URL'lerini çözer. ID içeren girdiler aranmaz,
+        adları `_get_artists` ile alınır; Spotify'ın reddettiği ID'ler bulunamayanlara eklenir. Adlar önce önbellekte aranır; kalanlar sınırlı
+        işçi havuzuyla paralel `sp.search` istekleriyle çözülüp (bulunamayanlar dahil) önbelleğe yazılır.
+        ({artist_id: ad} girdi sırasıyla, bulunamayan girdiler) döndürür.
+        """
+        ids = {entry: explicit_artist_id(entry) for entry in entries}
+        names = {entry: entry.casefold() for entry, artist_id in ids.items() if not artist_id}
+        found: Dict[str, dict] = self.metadata_cache.get_many('artist_search', names.values())
+        missing = list(dict.fromkeys(key for key in names.values() if key not in found))
+
+        def search(key: str) -> Tuple[str, Optional[dict]]:
+            try:
+                data = self.sp.search(q=f'artist:{key}', type='artist', limit=1)
+            except SpotifyException as e:
+                self._log(f"API Hatası (Sanatçı Arama): {key}: {e}", "error")
+                return key, None
+            items = (data or {}).get('artists', {}).get('items') or []
+            return key, {'id': items[0]['id'], 'name': items[0].get('name', key)} if items else {}
+
+        if missing:
+            self._log(f"{len(missing)} sanatçı adı aranıyor ({len(set(names.values())) - len(missing)} tanesi önbellekte)...", "cyan")
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                searched = dict(executor.map(search, missing))
+            # Hata alan aramalar saklanmaz; bir sonraki içe aktarmada tekrar denenir
+            self.metadata_cache.put_many('artist_search', {key: value for key, value in searched.items() if value is not None})
+            found.update((key, value) for key, value in searched.items() if value is not None)
+
+        direct_ids = list(dict.fromkeys(artist_id for artist_id in ids.values() if artist_id))
+        direct_names = {
+            artist_id: artist.get('name', artist_id) for artist_id, artist in self._get_artists(direct_ids).items()
+        }
+
+        resolved: Dict[str, str] = {}
+        unresolved: List[str] = []
+        for entry, artist_id in ids.items():
+            if artist_id:
+                name = direct_names.get(artist_id)
+            else:
+                match = found.get(names[entry]) or {}
+                artist_id, name = match.get('id'), match.get('name')
+            if artist_id and name:
+                resolved.setdefault(artist_id, name)
+            else:
+                unresolved.append(entry)
+        return resolved, unresolved
+
+    @profile_stage("artist_details")
+    def _fill_artist_details(self, jobs: List[JobSpec]):
+        """
+        İş tanımlarında adı veya kapak resmi eksik sanatçıların bilgilerini tüm işler için
+        tek seferde, 50'şerli `sp.artists` istekleriyle tamamlar. Spotify'ın reddettiği ID'ler sadece
+        o sanatçıyı içeren işlerde (albümleri istenirken) hataya yol açar; diğer işler etkilenmez.
+        """
+        missing: Dict[str, None] = {}
+        cover_artists: Dict[int, List[str]] = {}
+        for index, job in enumerate(jobs):
+            missing.update((artist_id, None) for artist_id, name in job.artists.items() if not name)
+            if not job.upload_cover:
+                continue
+            if job.cover_style == "MOSAIC" and not job.cover_image_urls:
+                cover_artists[index] = list(job.artists)[:MOSAIC_TILES]
+            elif job.cover_style == "ARTIST" and not job.cover_image_url:
+                cover_artists[index] = list(job.artists)[-1:]
+            missing.update((artist_id, None) for artist_id in cover_artists.get(index, []))
+
+        images: Dict[str, str] = {}
+        for artist in self._get_artists(list(missing)).values():
+            for job in jobs:
+                if artist['id'] in job.artists and not job.artists[artist['id']]:
+                    job.artists[artist['id']] = artist.get('name', artist['id'])
+            if artist.get('images'):
+                images[artist['id']] = artist['images'][0].get('url')
+
+        for index, artist_ids in cover_artists.items():
+            image_urls = [images[artist_id] for artist_id in artist_ids if images.get(artist_id)]
+            if jobs[index].cover_style == "MOSAIC":
+                jobs[index].cover_image_urls = image_urls
+            elif image_urls:
+                jobs[index].cover_image_url = image_urls[0]
+
+    @profile_stage("async_harvest")
+    def _async_prefetch(self, jobs: List[JobSpec]):
+        """
+        İşlerin sanatçı albümlerini, albüm parçalarını ve (gerekiyorsa) Top parçalarını AsyncHarvester ile
+        önbelleğe alır. Sonraki toplama adımları aynı veriyi önbellekten okur; popülerlik sorguları
+        aday kümesine (tekilleştirme, budama) bağlı olduğundan senkron yolda kalır.
+        """
+        artist_types = [(artist_id, album_type) for job in jobs for artist_id in job.artists for album_type in job.album_types]
+        top_track_artists = [
+            artist_id for job in jobs if SELECTION_STRATEGIES[job.sort_type].needs_top_tracks for artist_id in job.artists
+        ]
+        self.async_harvester.prefetch(artist_types, top_track_artists)
+
+    def _iter_job_albums(self, job: JobSpec, executor: ThreadPoolExecutor, track_count: Callable[[], int],
+                         require_albums: bool = True) -> Iterator[Tuple[str, dict, List[TrackRecord]]]:
+        """
+        İşteki sanatçıların albümlerini toplar ve (sanatçı ID, albüm, filtrelenmiş parçalar) olarak üretir.
+        Albümler tüm sanatçılar genelinde çıkış tarihine göre (eskiden yeniye) sıralanır, böylece çıktı her
+        çalıştırmada aynıdır ve yeni çıkanlar sona gelir. Ortak (feat.) albümler iş sırasında ilk sanatçıya
+        atanır. `track_count` ilerleme göstergesi için tüketicinin topladığı parça sayısını döndürür.
+        """
+        # Albüm toplama (sanatçılar paralel)
+        unique_albums: Dict[str, dict] = {}
+        album_artist: Dict[str, str] = {}
+        
+        artist_ids = list(job.artists.keys())
+        results = executor.map(lambda a_id: self._get_artist_albums(a_id, job.album_types), artist_ids)
+        for (artist_id, artist_name), albums in zip(job.artists.items(), results):
+            self._log(f"Sanatçı albümleri toplandı: {artist_name} ({len(albums)})", "cyan")
+            for album in albums:
+                if album['id'] not in unique_albums:
+                    unique_albums[album['id']] = album
+                    album_artist[album['id']] = artist_id
+        all_albums = sorted(unique_albums.values(), key=album_release_key)
+            
+        self._log(f"Toplam {len(all_albums)} benzersiz albüm/single bulundu.", "succ")
+        self._update_flow_stats("ALBUM_COUNT", current=0, total=len(all_albums), added=0)
+        
+        if not all_albums and require_albums:
+            raise ValueError("Seçili kriterlere uygun albüm/single bulunamadı.")
+        
+        # Parça toplama (20'şerli toplu albüm istekleri, gruplar paralel)
+        album_ids = [album['id'] for album in all_albums]
+        for i, (album_id, tracks) in enumerate(self._iter_album_tracks(album_ids, job.exclude_short, executor)):
+            album = unique_albums[album_id]
+            self._log(f"[{i+1}/{len(all_albums)}] Albüm parçaları toplandı: {album.get('name', 'Bilinmeyen Albüm')}", "cyan")
+            for track in tracks:
+                track.release_date = album.get('release_date') or ""
+                if track.artist_id is None:  # sanatçı alanı olmadan önbelleğe yazılmış eski kayıt
+                    track.artist_id = album_artist[album_id]
+            yield album_artist[album_id], album, tracks
+            
+            self._update_flow_stats("ALBUM_COUNT", current=i + 1, total=len(all_albums), added=0)
+            self._update_flow_stats("TRACK_COUNT", current=track_count(), total=len(all_albums), added=0)
+
+    def _iter_album_track_uris(self, job: JobSpec) -> Iterator[str]:
+        """
+        Albüm sırası akışı için sanatçıların albüm parçalarını tekrarsız olarak üretir. Aynı kaydın
+        sürümleri `job.dedupe_rule`'a göre teke indirilir.
+        Üretici olduğu için tüketici (örn. yazma aşaması) toplama bitmeden çalışmaya başlayabilir;
+        ORIGINAL/NONE dışındaki kurallarda kanonik sürüm tüm sürümler görülünce seçildiğinden
+        parçalar toplama sonunda üretilir.
+        """
+        index = TrackDedupeIndex(job.dedupe_rule)
+        streaming = index.rule in ("ORIGINAL", "NONE")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _, _, tracks in self._iter_job_albums(job, executor, track_count=lambda: len(index)):
+                for track in tracks:
+                    if index.add(track) and streaming:
+                        yield track.uri
+
+            if not streaming:
+                candidates = index.popularity_candidates()
+                popularity = self._get_track_popularity(candidates, executor) if candidates else None
+                yield from index.canonical_uris(popularity)
+
+    def _build_candidate_table(self, job: JobSpec, strategy: SelectionStrategy) -> CandidateTable:
+        """
+        Seçim stratejisi için aday tablosunu kurar: strateji gerektiriyorsa sanatçıların Top 10 parçaları,
+        ardından sürümleri tekilleştirilmiş tüm albüm parçaları ve (gerekiyorsa) popülerlikleri.
+        Strateji sanatçı başına sadece en popüler N parçayı kullanıyorsa ve iş yaklaşık popülerliğe
+        izin veriyorsa popülerlik sorguları albüm seviyesinde budanır; sorgusu atlanan parçaların
+        popülerliği boş kalır. Aksi halde tüm adayların popülerliği (önbellekten veya ağdan) alınır.
+        """
+        index = TrackDedupeIndex(job.dedupe_rule)
+        # uri -> (sanatçı ID, albüm, parça, Top sırası)
+        rows: Dict[str, Tuple[str, Optional[dict], TrackRecord, Optional[int]]] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            if strategy.needs_top_tracks:
+                for artist_id, tracks in zip(job.artists, executor.map(self._get_artist_top_tracks, job.artists)):
+                    for rank, track in enumerate(self._filter_tracks(tracks, job.exclude_short)[:10]):
+                        # Top parçalar önce eklenir ki albüm/deluxe/remaster sürümleri onların grubuna düşsün
+                        if index.add(track):
+                            rows[track.uri] = (artist_id, None, track, rank)
+            top_uris = list(rows)
+
+            albums = self._iter_job_albums(
+                job, executor, track_count=lambda: len(index), require_albums=not strategy.needs_top_tracks
+            )
+            for artist_id, album, tracks in albums:
+                for track in tracks:
+                    index.add(track)
+                    rows.setdefault(track.uri, (artist_id, album, track, None))
+
+            # Top parçaların diğer sürümleri tamamen elenir
+            candidates = index.popularity_candidates()
+            album_uris = index.canonical_uris(
+                self._get_track_popularity(candidates, executor) if candidates else None, exclude_uris=top_uris
+            )
+
+            popularity: Dict[str, int] = {}
+            if strategy.needs_popularity and strategy.popularity_per_artist and job.approximate_popularity:
+                by_artist: Dict[str, List[str]] = {}
+                for uri in album_uris:
+                    by_artist.setdefault(rows[uri][0], []).append(uri)
+                album_of = {uri: rows[uri][1] for uri in album_uris}
+                for known in executor.map(
+                    lambda uris: self._get_track_popularity_pruned(uris, album_of, strategy.popularity_per_artist),
+                    by_artist.values()
+                ):
+                    popularity.update(known)
+            elif strategy.needs_popularity:
+                popularity = self._get_track_popularity(album_uris, executor)
+
+        table = CandidateTable(list(job.artists))
+        for uri in top_uris + album_uris:
+            artist_id, album, track, top_rank = rows[uri]
+            table.append(
+                uri, artist_id,
+                album_id=track.album_id,
+                album_type=album.get('album_type') if album else None,
+                release_date=track.release_date,
+                duration_ms=track.duration_ms,
+                # Top parçalar popülerlik bilgisini zaten taşır
+                popularity=track.popularity if top_rank is not None else popularity.get(uri),
+                top_rank=top_rank,
+            )
+        return table
+
+    def _collect_incremental_uris(self, job: JobSpec, playlist_id: str) -> Tuple[List[str], Dict[str, dict]]:
+        """
+        INCREMENTAL modu: her sanatçı için bu playlist'e daha önce işlenmiş albümlerden sonra çıkanların
+        parçalarını çıkış sırasıyla toplar. Watermark'ı olan sanatçılarda sadece diskografinin başı
+        taranır; ilk kez işlenen sanatçılarda tüm diskografi taranır ve playlist'te zaten bulunan
+        parçalar atlanır. (yeni URI'ler, güncellenmiş watermark'lar) döndürür.
+        """
+        watermarks = self.metadata_cache.get_watermarks(playlist_id, job.artists)
+
+        def harvest(artist_id: str) -> List[dict]:
+            if artist_id in watermarks:
+                return self._get_new_artist_albums(artist_id, job.album_types, watermarks[artist_id])
+            return self._get_artist_albums(artist_id, job.album_types)
+
+        new_uris = OrderedUriSet()
+        new_watermarks: Dict[str, dict] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            new_albums: Dict[str, dict] = {}
+            for (artist_id, artist_name), albums in zip(job.artists.items(), executor.map(harvest, job.artists)):
+                if artist_id in watermarks:
+                    self._log(f"Yeni çıkanlar tarandı: {artist_name} ({len(albums)} yeni albüm/single)", "cyan")
+                else:
+                    self._log(f"İlk artımlı tarama (tüm diskografi): {artist_name} ({len(albums)})", "cyan")
+                new_watermarks[artist_id] = self._advance_watermark(watermarks.get(artist_id), albums, job.album_types)
+                new_albums.update((album['id'], album) for album in albums)
+
+            album_ids = [album['id'] for album in sorted(new_albums.values(), key=album_release_key)]
+            self._update_flow_stats("ALBUM_COUNT", current=0, total=len(album_ids), added=0)
+
+            existing: Set[str] = set()
+            if len(watermarks) < len(job.artists):
+                # Watermark'ı olmayan sanatçıların eski parçaları playlist'te zaten olabilir
+                existing.update(self._get_playlist_uris(playlist_id, skip_unremovable=True))
+
+            # Yeni çıkanlar kendi içinde tekilleştirilir (örn. aynı gün çıkan single + albüm)
+            index = TrackDedupeIndex(job.dedupe_rule)
+            for i, (_, tracks) in enumerate(self._iter_album_tracks(album_ids, job.exclude_short, executor)):
+                for track in tracks:
+                    if track.uri not in existing:
+                        index.add(track)
+                self._update_flow_stats("ALBUM_COUNT", current=i + 1, total=len(album_ids), added=0)
+                self._update_flow_stats("TRACK_COUNT", current=len(index), total=len(album_ids), added=0)
+
+            candidates = index.popularity_candidates()
+            new_uris.update(index.canonical_uris(self._get_track_popularity(candidates, executor) if candidates else None))
+
+        self._log(f"Toplam {len(album_ids)} yeni albüm/single, {len(new_uris)} yeni parça bulundu.", "succ")
+        return new_uris.to_list(), new_watermarks
+
+    @profile_stage("open_playlist")
+    def _open_playlist(self, job: JobSpec) -> str:
+        return self._create_or_manage_playlist(
+            mode=job.playlist_mode, 
+            name=job.playlist_name.strip(), 
+            existing_id=playlist_id_from_input(job.existing_playlist or ""), 
+            is_public=job.is_public,
+            artist_names=list(job.artists.values())
+        )
+
+    def _stream_to_playlist(self, job: JobSpec, uris: Iterator[str], key: str,
+                            checkpoint: Optional[WriteCheckpoint] = None) -> Tuple[str, int]:
+        """
+        Toplama ve yazmayı üst üste bindirir: üretilen URI'ler 100'lük gruplar halinde sınırlı bir
+        kuyruğa konur, ayrı bir yazıcı thread'i her grubu dolar dolmaz playlist'e ekler.
+        Playlist ilk grup hazır olduğunda oluşturulur; hiç parça yoksa oluşturulmaz. Yarım kalmış
+        bir yazımdan devam ediliyorsa checkpoint'teki playlist kullanılır.
+        (playlist_id, eklenen parça sayısı) döndürür.
+        """
+        chunk_size = 100
+        chunks: "queue.Queue[Optional[List[str]]]" = queue.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+        state: Dict[str, object] = {'checkpoint': checkpoint, 'error': None}
+        writer_failed = threading.Event()
+
+        def writer():
+            try:
+                while True:
+                    chunk = chunks.get()
+                    if chunk is None:
+                        return
+                    if state['checkpoint'] is None:
+                        playlist_id = self._open_playlist(job)
+                        state['checkpoint'] = self._start_checkpoint(job, playlist_id, streaming=True)
+                        self._log("Playlist hazır; parçalar toplama sürerken ekleniyor...", "warn")
+                    self._commit_chunk(key, state['checkpoint'], chunk)
+                    added = state['checkpoint'].committed
+                    self._update_flow_stats(
+                        "ADDING_TRACKS", current=added, total=max(added, collected), added=added,
+                        rate=self.write_pacer.rate()
+                    )
+            except Exception as ex:
+                state['error'] = ex
+                writer_failed.set()
+                # Üreticinin kuyrukta bloklanmaması için kalanları boşalt
+                while chunks.get() is not None:
+                    pass
+
+        collected = 0
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        writer_thread.start()
+
+        pending: List[str] = []
+        try:
+            for uri in uris:
+                if writer_failed.is_set():
+                    break
+                pending.append(uri)
+                collected += 1
+                if len(pending) == chunk_size:
+                    chunks.put(pending)
+                    pending = []
+            if pending and not writer_failed.is_set():
+                chunks.put(pending)
+        finally:
+            chunks.put(None)
+            writer_thread.join()
+
+        if state['error'] is not None:
+            raise state['error']
+        if state['checkpoint'] is None:
+            raise ValueError("Eklenecek parça bulunamadı.")
+
+        self._log(f"Toplam {collected} benzersiz parça URI toplandı ve eklendi.", "succ")
+        return state['checkpoint'].playlist_id, state['checkpoint'].committed
+
+    def _report_profile(self, profile_path: Optional[Path]):
+        if self.request_stats is None:
+            return
+        profile = self.request_stats.profile()
+        totals = profile['totals']
+        self._log(
+            f"İstek profili: {totals['requests']} istek, {totals['seconds']:.1f} sn istek süresi, "
+            f"p50/p95 {totals['p50_ms']:.0f}/{totals['p95_ms']:.0f} ms, {totals['bytes'] // 1024} KB", "cyan"
+        )
+        for stage, data in sorted(profile['stages'].items(), key=lambda item: -item[1]['seconds']):
+            self._log(
+                f"  {stage}: {data['requests']} istek, {data['seconds']:.1f} sn, "
+                f"p50/p95 {data['p50_ms']:.0f}/{data['p95_ms']:.0f} ms, {data['bytes'] // 1024} KB, "
+                f"{data['retries']} tekrar, {data['rate_limited']}x429", "cyan"
+            )
+        if profile_path:
+            try:
+                self.request_stats.export(profile_path)
+                self._log(f"Profil kaydedildi: {profile_path}", "info")
+            except OSError as ex:
+                self._log(f"Profil kaydedilemedi: {ex}", "warn")
+
+    def _batch_profile_path(self, suffix: str) -> Optional[Path]:
+        """Toplu çalıştırmada her iş kendi dosyasına yazılır: profil.json -> profil.1.json, profil.prefetch.json"""
+        if not self.profile_path:
+            return None
+        path = Path(self.profile_path)
+        return path.with_name(f"{path.stem}.{suffix}{path.suffix}")
+
+    def run(self, job: JobSpec) -> RunResult:
+        """İşi çalıştırır; iş başarısız olsa da bu işin istek profili raporlanır."""
+        return self._run_profiled(job, self.profile_path)
+
+    def _run_profiled(self, job: JobSpec, profile_path: Optional[Path]) -> RunResult:
+        if self.request_stats:
+            # Profil sadece bu işin isteklerini içerir (toplu çalıştırmada ön toplama ve önceki işler hariç)
+            self.request_stats.reset_profile()
+        try:
+            return self._run(job)
+        finally:
+            self._report_profile(profile_path)
+
+    def _run(self, job: JobSpec) -> RunResult:
+        self._log("Ana akış başlatıldı: Albüm/Parça toplama ve Playlist oluşturma.", "warn")
+
+        # 1. GEREKLİ AYARLARI AL
+        job.validate()
+        self._fill_artist_details([job])
+        strategy = SELECTION_STRATEGIES[job.sort_type]
+        key = job.checkpoint_key()
+        checkpoint = self._load_checkpoint(job)
+        streaming = strategy.streamable and job.playlist_mode in STREAMING_MODES
+        cover = self._start_cover(job)
+        if self.async_harvester and not checkpoint and job.playlist_mode != "INCREMENTAL":
+            self._async_prefetch([job])
+
+        # 2-4. PARÇALARI TOPLA VE YAZ
+        if job.playlist_mode == "INCREMENTAL":
+            # Sadece son çalıştırmadan beri çıkan albümler toplanır ve playlist'in sonuna eklenir
+            if checkpoint:
+                playlist_id, watermarks = checkpoint.playlist_id, checkpoint.watermarks or {}
+            else:
+                playlist_id = self._open_playlist(job)
+                new_uris, watermarks = self._collect_incremental_uris(job, playlist_id)
+                if new_uris:
+                    checkpoint = self._start_checkpoint(job, playlist_id, uris=new_uris, watermarks=watermarks)
+            if checkpoint:
+                self._log(f"Yeni parçalar playlist'e ekleniyor (Toplam {len(checkpoint.uris)} parça)...", "warn")
+                self._update_flow_stats("ADDING_TRACKS", current=checkpoint.committed, total=len(checkpoint.uris), added=checkpoint.committed)
+                added_count = self._add_tracks_to_playlist(key, checkpoint)
+            else:
+                self._log("Son çalıştırmadan beri yeni çıkan parça yok; playlist değiştirilmedi.", "succ")
+                added_count = 0
+            # Watermark sadece ekleme başarılı olduktan sonra ilerletilir
+            self.metadata_cache.put_watermarks(playlist_id, watermarks)
+            track_count = added_count
+        elif streaming:
+            # Sıralama gerektirmeyen modda toplama bitmeden yazmaya başlanır
+            uris = self._iter_album_track_uris(job)
+            committed = 0
+            if checkpoint:
+                # Toplama önbellekten tekrar yapılır; zaten eklenmiş parçalar atlanır
+                done = set(checkpoint.uris)
+                committed = checkpoint.committed
+                uris = (uri for uri in uris if uri not in done)
+            if job.max_tracks:
+                uris = itertools.islice(uris, max(job.max_tracks - committed, 0))
+            playlist_id, added_count = self._stream_to_playlist(job, uris, key, checkpoint)
+            track_count = added_count
+        else:
+            if checkpoint:
+                # Seçilmiş liste checkpoint'te; toplama ve seçim tekrarlanmaz
+                playlist_id, final_track_list = checkpoint.playlist_id, checkpoint.uris
+            else:
+                # Adaylar bir kez toplanır; seçim (sıralama, katmanlar, kotalar) tablo üzerinde yapılır
+                self._log(f"Seçim stratejisi: {strategy.label}", "warn")
+                table = self._build_candidate_table(job, strategy)
+                final_track_list = strategy.select(table, job.max_tracks)
+
+                if job.max_tracks:
+                    final_track_list = final_track_list[:job.max_tracks]
+
+                self._log(f"Toplam {len(final_track_list)} benzersiz parça URI seçildi ({len(table)} aday).", "succ")
+
+                if not final_track_list:
+                    raise ValueError("Eklenecek parça bulunamadı.")
+
+                # 3. PLAYLIST OLUŞTUR/YÖNET
+                playlist_id = self._open_playlist(job)
+            
+            # 4. PLAYLIST'E PARÇALARI EKLE
+            self._log(f"Parçalar playlist'e ekleniyor (Toplam {len(final_track_list)} parça)...", "warn")
+            self._update_flow_stats("ADDING_TRACKS", current=0, total=len(final_track_list), added=0)
+            
+            if job.playlist_mode == "OVERWRITE":
+                added_count = self._sync_playlist_tracks(playlist_id, final_track_list)
+            else:
+                checkpoint = checkpoint or self._start_checkpoint(job, playlist_id, uris=final_track_list)
+                added_count = self._add_tracks_to_playlist(key, checkpoint)
+            track_count = len(final_track_list)
+
+        # Yazma tamamlandı; bir sonraki çalıştırma sıfırdan başlamalı
+        if job.playlist_mode != "OVERWRITE":
+            self.metadata_cache.delete_checkpoint(key)
+        
+        # 5. (OPSİYONEL) PLAYLIST KAPAĞINI YÜKLE (toplama/yazma sırasında hazırlandı)
+        self._upload_playlist_cover(playlist_id, cover)
+        
+        # 6. SONUÇLARI DÖNDÜR
+        final_playlist_data = self.sp.playlist(playlist_id)
+        
+        self._log(f"Akış BAŞARILI. '{final_playlist_data['name']}' adlı playlist oluşturuldu/güncellendi. Toplam {added_count} parça eklendi.", "succ")
+        return RunResult(
+            playlist_id=playlist_id,
+            playlist=final_playlist_data,
+            added_count=added_count,
+            track_count=track_count
+        )
+
+    def prefetch(self, jobs: List[JobSpec]):
+        """
+        Birden fazla işin ihtiyaç duyduğu sanatçı/albüm/parça verisini tekilleştirip tek seferde
+        çeker ve önbelleğe yazar. Ardından çalışan `run()` çağrıları ağa yazma ve stratejiye özel
+        veri (Top parçalar, popülerlik) için çıkar.
+        """
+        artist_types: Dict[Tuple[str, str], None] = {}
+        # Artımlı işler sadece diskografinin başını tarar; tam ön toplama gereksiz
+        full_jobs = [job for job in jobs if job.playlist_mode != "INCREMENTAL"]
+        for job in full_jobs:
+            for artist_id in job.artists:
+                artist_types.update(((artist_id, album_type), None) for album_type in job.album_types)
+
+        self._log(
+            f"Ortak ön toplama: {len(jobs)} iş, {len({a for a, _ in artist_types})} benzersiz sanatçı, "
+            f"{len(artist_types)} sanatçı/albüm tipi çifti.", "warn"
+        )
+        self._fill_artist_details(jobs)
+
+        if self.async_harvester:
+            self._async_prefetch(full_jobs)
+        else:
+            def artist_albums(pair: Tuple[str, str]) -> List[dict]:
+                try:
+                    return self._get_artist_albums(pair[0], [pair[1]])
+                except (SpotifyException, requests.exceptions.RequestException) as ex:
+                    # Bu sanatçıyı içeren işler kendi çalıştırmalarında aynı hatayla raporlanır
+                    self._log(f"Ön toplama: {pair[0]} albümleri alınamadı: {ex}", "warn")
+                    return []
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                pairs = list(artist_types)
+                album_lists = list(executor.map(artist_albums, pairs))
+
+                artist_album_ids: Dict[str, List[str]] = {}
+                for (artist_id, _), albums in zip(pairs, album_lists):
+                    artist_album_ids.setdefault(artist_id, []).extend(album['id'] for album in albums)
+                album_ids = list(dict.fromkeys(a for ids in artist_album_ids.values() for a in ids))
+                self._log(f"Ortak ön toplama: {len(album_ids)} benzersiz albüm.", "cyan")
+
+                for _ in self._iter_album_tracks(album_ids, False, executor):
+                    pass
+        # Aday tabloları (Top parçalar, popülerlik) burada kurulmaz: her iş `run()` içinde kendi
+        # tablosunu kurar, hatası da o işin raporuna yazılır. Ortak veri zaten önbellektedir.
+
+    def run_batch(self, jobs: List[JobSpec], request_stats: Optional[RequestStats] = None) -> List[JobReport]:
+        """
+        Birden fazla playlist işini tek süreçte çalıştırır: önce ortak veri bir kez toplanır,
+        sonra her playlist sırayla yazılır. Her iş için süre ve istek sayısı raporlanır.
+        """
+        request_stats = request_stats or self.request_stats
+
+        def request_count() -> int:
+            return request_stats.snapshot()['requests'] if request_stats else 0
+
+        reports: List[JobReport] = []
+        started, requests_before = time.perf_counter(), request_count()
+        if self.request_stats:
+            self.request_stats.reset_profile()
+        try:
+            self.prefetch(jobs)
+        except Exception as ex:
+            # Ön toplama sadece hızlandırır; tamamlanamazsa her iş kendi verisini toplar ve kendi hatasını raporlar
+            self._log(f"Ortak ön toplama tamamlanamadı: {ex}", "warn")
+        finally:
+            self._report_profile(self._batch_profile_path("prefetch"))
+        reports.append(JobReport(
+            name="(ortak ön toplama)", seconds=time.perf_counter() - started,
+            requests=request_count() - requests_before
+        ))
+
+        for i, job in enumerate(jobs):
+            name = job.playlist_name or job.existing_playlist or f"iş {i + 1}"
+            self._log(f"[{i + 1}/{len(jobs)}] İş başlatılıyor: {name}", "warn")
+            started, requests_before = time.perf_counter(), request_count()
+            report = JobReport(name=name)
+            try:
+                report.result = self._run_profiled(job, self._batch_profile_path(str(i + 1)))
+            except (SpotifyException, ValueError, requests.exceptions.RequestException) as ex:
+                report.error = str(ex)
+                self._log(f"İş başarısız: {name}: {ex}", "error")
+            except Exception as ex:
+                # Beklenmeyen hatalar (önbellek, yanıt biçimi, kapak dosyası) da sadece bu işi durdurur
+                report.error = f"{type(ex).__name__}: {ex}"
+                self._log(f"İş beklenmeyen hatayla durdu: {name}: {report.error}", "error")
+            report.seconds = time.perf_counter() - started
+            report.requests = request_count() - requests_before
+            reports.append(report)
+        return reports
@@ -0,0 +1,397 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Spotify'ın resmi bir limit değeri yok (30 saniyelik kayan pencere). Bu değerler tüm
+# işçilerin toplamı için güvenli bir üst sınır olarak seçildi.
+SPOTIFY_MAX_RPS: float = 15.0
+SPOTIFY_BURST: int = 30
+
+MAX_429_RETRIES: int = 5
+MAX_5XX_RETRIES: int = 3
+RETRY_BACKOFF_FACTOR: float = 0.3
+DEFAULT_RETRY_AFTER: float = 1.0
+
+RETRYABLE_5XX: frozenset = frozenset({500, 502, 503, 504})
+WRITE_METHODS: frozenset = frozenset({'POST', 'PUT', 'DELETE'})
+# 5xx yanıtı isteğin uygulanmadığını garanti etmez; POST (parça ekleme, playlist oluşturma) tekrar
+# gönderilirse iki kez uygulanabilir. Bu istekleri, önce sonucu kontrol eden çağıran taraf tekrarlar.
+NON_IDEMPOTENT_METHODS: frozenset = frozenset({'POST'})
+# Playlist sıralama PUT'u (range_start/insert_before) göreli bir taşımadır; iki kez uygulanırsa sıra bozulur
+REORDER_BODY_MARKER: bytes = b'"range_start"'
+
+# Yazma çağrıları için uyarlanabilir aralık ayarları (saniye)
+PACER_MIN_BACKOFF: float = 0.25
+PACER_MAX_INTERVAL: float = 5.0
+PACER_SLOW_STEP: float = 0.1
+PACER_SLOW_FACTOR: float = 2.0
+PACER_DECAY: float = 0.5
+PACER_RATE_WINDOW: float = 10.0
+
+# Havuzda toplama işçilerine ek olarak tutulan bağlantılar (akış yazıcısı, kapak yükleme, token yenileme);
+# böylece hiçbir thread havuz dolu diye bağlantıyı kapatıp her çağrıda yeniden TLS el sıkışması yapmaz
+POOL_EXTRA_CONNECTIONS: int = 4
+
+# Canlı p50/p95 gecikmesi son bu kadar istekten hesaplanır
+LATENCY_WINDOW: int = 500
+# Aşama bildirilmeden yapılan istekler (örn. token yenileme, sonuç okuma) bu aşamaya yazılır
+DEFAULT_STAGE: str = "other"
+# Flamegraph (folded stack) çıktısında tüm yığınların kökü
+PROFILE_ROOT: str = "paradox"
+# Uç nokta adlarında ID'ler gruplanır: artists/0OdUWJ0sBjDrqHygGUXeCF/albums -> artists/{id}/albums
+SPOTIFY_ID_SEGMENT = re.compile(r'^[0-9A-Za-z]{22}$')
+ID_AFTER_SEGMENTS: frozenset = frozenset({'users'})
+
+
+class TokenBucket:
+    """
+    Tüm işçiler arasında paylaşılan istek bütçesi.
+    `pause()` ile (örn. 429 Retry-After) tüm işçiler aynı anda bekletilir.
+    """
+
+    def __init__(self, rate: float = SPOTIFY_MAX_RPS, capacity: int = SPOTIFY_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = float(capacity)
+        self._last: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Hak varsa birini düşüp 0, yoksa beklenmesi gereken süreyi döndürür."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """`acquire` ile aynı bütçeyi paylaşır; bekleme sırasında event loop'u bloklamaz."""
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                # Bekleme bitince patlama yapmamak için birikmiş hakları sıfırla
+                self._tokens = 0.0
+                self._last = until
+
+
+def is_retry_safe(request) -> bool:
+    """5xx sonrası isteğin tekrar gönderilebilir olup olmadığı: POST ve playlist sıralama PUT'u hariç."""
+    if request.method in NON_IDEMPOTENT_METHODS:
+        return False
+    if request.method == 'PUT' and request.body:
+        body = request.body if isinstance(request.body, bytes) else request.body.encode('utf-8')
+        return REORDER_BODY_MARKER not in body
+    return True
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class AdaptivePacer:
+    """
+    Yazma çağrıları (parça ekleme/silme, kapak yükleme) için uyarlanabilir bekleme aralığı.
+    Normalde beklemeden gönderir; 429 gelince aralığı katlar, gecikme ortalamanın belirgin
+    üstüne çıkınca aralığı biraz açar, sorunsuz yanıtlarda aralığı tekrar sıfıra doğru daraltır.
+    """
+
+    def __init__(self):
+        self.interval: float = 0.0
+        self._latency_ewma: Optional[float] = None
+        self._next_at: float = 0.0
+        self._sent: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+        with self._lock:
+            self._sent.append(time.monotonic())
+
+    def observe(self, latency: float, status_code: int, retry_after: Optional[float] = None):
+        with self._lock:
+            if status_code == 429:
+                self.interval = min(max(self.interval * 2, PACER_MIN_BACKOFF), PACER_MAX_INTERVAL)
+                if retry_after:
+                    self._next_at = max(self._next_at, time.monotonic() + retry_after)
+                return
+
+            if self._latency_ewma is not None and latency > self._latency_ewma * PACER_SLOW_FACTOR:
+                self.interval = min(self.interval + PACER_SLOW_STEP, PACER_MAX_INTERVAL)
+            else:
+                self.interval *= PACER_DECAY
+                if self.interval < 0.01:
+                    self.interval = 0.0
+            self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+
+    def rate(self) -> float:
+        """Son PACER_RATE_WINDOW saniyedeki etkin yazma hızı (istek/sn)."""
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] > PACER_RATE_WINDOW:
+                self._sent.popleft()
+            if not self._sent:
+                return 0.0
+            span = max(now - self._sent[0], 1.0)
+            return len(self._sent) / span
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """İsteği ID'lerden arındırılmış uç nokta adına indirger (örn. 'GET albums/{id}/tracks')."""
+    path = urlsplit(url).path
+    if path.startswith('/v1/'):
+        path = path[len('/v1/'):]
+    segments: List[str] = []
+    for segment in path.strip('/').split('/'):
+        if SPOTIFY_ID_SEGMENT.match(segment) or (segments and segments[-1] in ID_AFTER_SEGMENTS):
+            segment = '{id}'
+        segments.append(segment)
+    return f"{method} {'/'.join(segments)}"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class EndpointProfile:
+    """Bir (aşama, uç nokta) çiftine giden isteklerin toplamları."""
+
+    __slots__ = ('requests', 'retries', 'rate_limited', 'errors', 'bytes', 'latencies')
+
+    def __init__(self):
+        self.requests: int = 0
+        self.retries: int = 0
+        self.rate_limited: int = 0
+        self.errors: int = 0
+        self.bytes: int = 0
+        self.latencies: List[float] = []
+
+    def add(self, status_code: int, is_retry: bool, latency: float, size: int):
+        self.requests += 1
+        self.retries += is_retry
+        self.rate_limited += status_code == 429
+        self.errors += status_code >= 400 and status_code != 429
+        self.bytes += size
+        self.latencies.append(latency)
+
+    @staticmethod
+    def summarize(profiles: List["EndpointProfile"]) -> dict:
+        latencies = sorted(latency for profile in profiles for latency in profile.latencies)
+        return {
+            'requests': sum(profile.requests for profile in profiles),
+            'retries': sum(profile.retries for profile in profiles),
+            'rate_limited': sum(profile.rate_limited for profile in profiles),
+            'errors': sum(profile.errors for profile in profiles),
+            'bytes': sum(profile.bytes for profile in profiles),
+            'seconds': round(sum(latencies), 3),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        }
+
+
+class RequestStats:
+    """
+    Oturum üzerinden gönderilen HTTP isteklerinin sayaçları (tekrar denemeler dahil) ve istek profili.
+    Her istek uç noktası, gecikmesi, yanıt boyutu, tekrar/429 durumuyla, isteği yapan thread'in o anki
+    aşamasına (`stage()`) yazılır. Aşamalar thread'e özeldir ve iç içe geçebilir; işçi havuzlarında her
+    işçi kendi aşamasını bildirir. Profil `profile()` ile JSON'a, `folded()` ile flamegraph biçimine dökülür.
+    """
+
+    def __init__(self):
+        self.requests: int = 0
+        self.rate_limited: int = 0
+        self.retries: int = 0
+        self._profiles: Dict[Tuple[Tuple[str, ...], str], EndpointProfile] = {}
+        self._recent: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def record(self, status_code: int, is_retry: bool, endpoint: str = "", latency: float = 0.0, size: int = 0):
+        stack = tuple(getattr(self._local, 'stack', None) or (DEFAULT_STAGE,))
+        with self._lock:
+            self.requests += 1
+            if status_code == 429:
+                self.rate_limited += 1
+            if is_retry:
+                self.retries += 1
+            if endpoint:
+                profile = self._profiles.get((stack, endpoint))
+                if profile is None:
+                    profile = self._profiles[(stack, endpoint)] = EndpointProfile()
+                profile.add(status_code, is_retry, latency, size)
+                self._recent.append(latency)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'requests': self.requests, 'rate_limited': self.rate_limited, 'retries': self.retries}
+
+    def latency_percentiles(self) -> Tuple[float, float]:
+        """Son LATENCY_WINDOW isteğin p50 ve p95 gecikmesi (saniye)."""
+        with self._lock:
+            latencies = sorted(self._recent)
+        return percentile(latencies, 0.50), percentile(latencies, 0.95)
+
+    def reset_profile(self):
+        """Profili (sayaçlar hariç) sıfırlar; motor her işin başında çağırır, her iş kendi profilini üretir."""
+        with self._lock:
+            self._profiles.clear()
+            self._recent.clear()
+
+    def profile(self) -> dict:
+        """Aşama ve uç nokta bazında toplamlar; aşama adı iç içe aşamalar için 'dış;iç' biçimindedir."""
+        with self._lock:
+            items = [(stack, endpoint, profile) for (stack, endpoint), profile in self._profiles.items()]
+        stages: Dict[str, Dict[str, EndpointProfile]] = {}
+        for stack, endpoint, profile in items:
+            stages.setdefault(";".join(stack), {})[endpoint] = profile
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'totals': EndpointProfile.summarize([profile for _, _, profile in items]),
+            'stages': {
+                stage: {
+                    **EndpointProfile.summarize(list(endpoints.values())),
+                    'endpoints': {
+                        endpoint: EndpointProfile.summarize([profile]) for endpoint, profile in sorted(endpoints.items())
+                    },
+                }
+                for stage, endpoints in sorted(stages.items())
+            },
+        }
+
+    def folded(self) -> str:
+        """flamegraph.pl/speedscope uyumlu 'kök;aşama;uç nokta <ms>' satırları (toplam istek süresi)."""
+        with self._lock:
+            items = [(stack, endpoint, sum(profile.latencies)) for (stack, endpoint), profile in self._profiles.items()]
+        lines = [
+            f"{';'.join((PROFILE_ROOT, *stack, endpoint))} {max(round(seconds * 1000), 1)}"
+            for stack, endpoint, seconds in sorted(items)
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def export(self, path: Path):
+        """Profili `.folded`/`.txt` uzantısında flamegraph, diğerlerinde JSON olarak yazar."""
+        path = Path(path)
+        if path.suffix in ('.folded', '.txt'):
+            path.write_text(self.folded(), encoding='utf-8')
+        else:
+            path.write_text(json.dumps(self.profile(), ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Her isteği paylaşılan TokenBucket'tan geçirir; 429 yanıtlarında Retry-After kadar
+    tüm işçileri durdurup isteği tekrarlar, geçici 5xx hatalarında kısa backoff uygular
+    (POST ve sıralama PUT'u hariç: 5xx sonrası tekrar, uygulanmış bir değişikliği yineleyebilir).
+    Yazma istekleri ayrıca paylaşılan AdaptivePacer ile hızlandırılır/yavaşlatılır.
+    """
+
+    def __init__(self, bucket: TokenBucket, write_pacer: Optional[AdaptivePacer] = None,
+                 request_stats: Optional[RequestStats] = None, **kwargs):
+        self.bucket = bucket
+        self.write_pacer = write_pacer
+        self.request_stats = request_stats
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        pacer = self.write_pacer if request.method in WRITE_METHODS else None
+        rate_limited = 0
+        server_errors = 0
+        while True:
+            if pacer:
+                pacer.wait()
+            self.bucket.acquire()
+            started = time.monotonic()
+            response = super().send(request, **kwargs)
+            latency = time.monotonic() - started
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if response.status_code == 429 else None
+            if pacer:
+                pacer.observe(latency, response.status_code, retry_after)
+            if self.request_stats:
+                # Akış isteklerinde gövde okunmaz; boyut başlıktan alınır
+                size = int(response.headers.get('Content-Length') or 0) if kwargs.get('stream') else len(response.content)
+                self.request_stats.record(
+                    response.status_code, is_retry=bool(rate_limited or server_errors),
+                    endpoint=endpoint_name(request.method, request.url), latency=latency, size=size
+                )
+
+            if response.status_code == 429 and rate_limited < MAX_429_RETRIES:
+                rate_limited += 1
+                self.bucket.pause(retry_after)
+            elif (response.status_code in RETRYABLE_5XX and server_errors < MAX_5XX_RETRIES
+                  and is_retry_safe(request)):
+                server_errors += 1
+                time.sleep(RETRY_BACKOFF_FACTOR * (2 ** (server_errors - 1)))
+            else:
+                return response
+
+            # Bağlantıyı havuza geri bırakmak için gövdeyi tüket
+            response.content
+            response.close()
+
+
+def build_spotify_session(bucket: TokenBucket, pool_size: int, write_pacer: Optional[AdaptivePacer] = None,
+                          request_stats: Optional[RequestStats] = None) -> requests.Session:
+    """
+    Tüm işçilerin paylaştığı keep-alive oturumu. Havuz, eşzamanlı tüm thread'lerin bağlantılarını
+    açık tutabilecek büyüklüktedir; `pool_connections` farklı host sayısını (api, accounts, i.scdn) karşılar.
+    """
+    session = requests.Session()
+    adapter = RateLimitedAdapter(
+        bucket, write_pacer, request_stats, pool_connections=POOL_EXTRA_CONNECTIONS,
+        pool_maxsize=pool_size + POOL_EXTRA_CONNECTIONS
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,223 @@
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Buzdağı katman boyutları: (Top, Orta, Derin)
+ICEBERG_TIERS: Tuple[int, int, int] = (10, 10, 20)
+# Dönem/albüm kotası stratejilerinde maks. parça sayısı verilmediğinde grup başına alınan parça
+DEFAULT_DECADE_QUOTA: int = 10
+DEFAULT_ALBUM_QUOTA: int = 3
+
+
+class CandidateTable:
+    """
+    Toplanmış aday parçaların sütun bazlı tablosu. Her sütun satır sırasıyla hizalı bir listedir;
+    seçim stratejileri Spotify'a tekrar gitmeden satır indeksleri üzerinde filtreler ve sıralar.
+    Satır sırası "albüm sırası"dır: önce sanatçıların Top parçaları (iş sırasıyla), sonra tüm
+    albüm parçaları çıkış tarihine göre (eskiden yeniye).
+    """
+
+    COLUMNS: Tuple[str, ...] = (
+        'uri', 'artist_id', 'album_id', 'album_type', 'release_date', 'duration_ms', 'popularity', 'top_rank'
+    )
+
+    def __init__(self, artist_ids: List[str]):
+        self.artist_ids = artist_ids
+        self.uri: List[str] = []
+        self.artist_id: List[str] = []
+        self.album_id: List[Optional[str]] = []
+        self.album_type: List[Optional[str]] = []
+        self.release_date: List[str] = []
+        self.duration_ms: List[int] = []
+        self.popularity: List[Optional[int]] = []
+        self.top_rank: List[Optional[int]] = []
+
+    def append(self, uri: str, artist_id: str, album_id: Optional[str] = None, album_type: Optional[str] = None,
+               release_date: str = "", duration_ms: int = 0, popularity: Optional[int] = None,
+               top_rank: Optional[int] = None):
+        self.uri.append(uri)
+        self.artist_id.append(artist_id)
+        self.album_id.append(album_id)
+        self.album_type.append(album_type)
+        self.release_date.append(release_date or "")
+        self.duration_ms.append(duration_ms or 0)
+        self.popularity.append(popularity)
+        self.top_rank.append(top_rank)
+
+    def __len__(self) -> int:
+        return len(self.uri)
+
+    def all(self) -> List[int]:
+        return list(range(len(self.uri)))
+
+    def where(self, column: str, predicate: Callable[[object], bool], rows: Optional[List[int]] = None) -> List[int]:
+        """`column` değeri `predicate`'i sağlayan satırları (sıra korunarak) döndürür."""
+        values = getattr(self, column)
+        return [i for i in (self.all() if rows is None else rows) if predicate(values[i])]
+
+    def rank(self, rows: List[int], column: str = 'popularity', limit: Optional[int] = None,
+             keep_missing: bool = False) -> List[int]:
+        """
+        Satırları `column` değerine göre azalan sıralar (eşitlikte satır sırası korunur). Değeri olmayan
+        satırlar `keep_missing` ise sona eklenir, değilse atlanır. `limit` verilirse sınırlı yığın kullanılır.
+        """
+        values = getattr(self, column)
+        known = [i for i in rows if values[i] is not None]
+        key = lambda i: (values[i], -i)
+        if limit is not None and limit < len(known):
+            ranked = heapq.nlargest(limit, known, key=key)
+        else:
+            ranked = sorted(known, key=key, reverse=True)
+        if keep_missing:
+            ranked.extend(i for i in rows if values[i] is None)
+        return ranked[:limit]
+
+    def group_by(self, column: str, rows: Optional[List[int]] = None) -> Dict[object, List[int]]:
+        """Satırları `column` değerine göre gruplar; gruplar ilk görülme sırasıyla döner."""
+        values = getattr(self, column)
+        groups: Dict[object, List[int]] = {}
+        for i in (self.all() if rows is None else rows):
+            groups.setdefault(values[i], []).append(i)
+        return groups
+
+    def uris(self, rows: List[int]) -> List[str]:
+        return [self.uri[i] for i in rows]
+
+
+class SelectionStrategy:
+    """
+    Aday tablosundan playlist parçalarını seçen strateji. Alt sınıflar hangi verinin toplanması
+    gerektiğini sınıf nitelikleriyle bildirir; `select` sadece tablo üzerinde çalışır.
+    """
+
+    label: str = ""
+    # Popülerlik sütunu doldurulmalı mı
+    needs_popularity: bool = False
+    # Sanatçıların Top 10 parçaları tabloya eklenmeli mi
+    needs_top_tracks: bool = False
+    # Sanatçı başına sadece en popüler N parça önemliyse N (iş yaklaşık popülerliğe izin verirse
+    # popülerlik sorguları albüm seviyesinde budanabilir)
+    popularity_per_artist: Optional[int] = None
+    # Seçim albüm sırasını koruyorsa parçalar toplama sürerken yazılabilir
+    streamable: bool = False
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        raise NotImplementedError
+
+
+SELECTION_STRATEGIES: Dict[str, SelectionStrategy] = {}
+
+
+def register_strategy(name: str, strategy: SelectionStrategy) -> SelectionStrategy:
+    """Stratejiyi `sort_type` adıyla kaydeder; arayüz ve CLI seçenekleri bu kayıttan üretilir."""
+    SELECTION_STRATEGIES[name] = strategy
+    return strategy
+
+
+class AlbumOrderStrategy(SelectionStrategy):
+    label = "Albümdeki Sırasına Göre"
+    streamable = True
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        return table.uris(table.all()[:limit])
+
+
+class PopularityStrategy(SelectionStrategy):
+    label = "Popülerliğe Göre (Azalan)"
+    needs_popularity = True
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        # Popülerliği bilinmeyen parçalar listenin sonuna düşer
+        return table.uris(table.rank(table.all(), limit=limit, keep_missing=True))
+
+
+class TopTracksFirstStrategy(SelectionStrategy):
+    label = "Spotify Top 10 Tracks (Önce)"
+    needs_top_tracks = True
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        top = table.where('top_rank', lambda rank: rank is not None)
+        rest = table.where('top_rank', lambda rank: rank is None)
+        return table.uris((top + rest)[:limit])
+
+
+class TieredStrategy(SelectionStrategy):
+    """
+    Buzdağı modeli: her sanatçıdan Top parçalar, ardından kalanların en popülerleri
+    (orta katman) ve onları izleyen derin kesimler.
+    """
+
+    needs_popularity = True
+    needs_top_tracks = True
+
+    def __init__(self, label: str, top: int, mid: int, deep: int):
+        self.label = label
+        self.top, self.mid, self.deep = top, mid, deep
+        self.popularity_per_artist = mid + deep
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        rows: List[int] = []
+        by_artist = table.group_by('artist_id')
+        for artist_id in table.artist_ids:
+            artist_rows = by_artist.get(artist_id, [])
+            top = table.where('top_rank', lambda rank: rank is not None, artist_rows)[:self.top]
+            rest = table.where('top_rank', lambda rank: rank is None, artist_rows)
+            rows.extend(top + table.rank(rest, limit=self.mid + self.deep))
+        return table.uris(rows[:limit])
+
+
+class DecadeStrategy(SelectionStrategy):
+    """
+    Her on yıldan en popüler parçalar, on yıllar eskiden yeniye. Limit on yıllara sırayla (turlar halinde)
+    dağıtılır: her turda her on yıldan sıradaki en popüler parça alınır, limite sığmayan son turda turun
+    en popülerleri seçilir. Adayı biten on yılın payı diğerlerine kalır; böylece yeterli aday varsa
+    liste limite tam ulaşır.
+    """
+
+    label = "On Yıllara Göre Dengeli (En Popülerler)"
+    needs_popularity = True
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        by_decade: Dict[str, List[int]] = {}
+        for i in table.where('release_date', bool):
+            by_decade.setdefault(table.release_date[i][:3], []).append(i)
+        if not by_decade:
+            return []
+        if not limit:
+            return table.uris([
+                i for decade in sorted(by_decade) for i in table.rank(by_decade[decade], limit=DEFAULT_DECADE_QUOTA)
+            ])
+
+        ranked = {decade: table.rank(rows, limit=limit) for decade, rows in by_decade.items()}
+        taken = dict.fromkeys(ranked, 0)
+        remaining = limit
+        depth = 0
+        while remaining > 0:
+            heads = [rows[depth] for rows in ranked.values() if depth < len(rows)]
+            if not heads:
+                break
+            for i in table.rank(heads)[:remaining]:
+                taken[table.release_date[i][:3]] += 1
+            remaining -= min(remaining, len(heads))
+            depth += 1
+        return table.uris([i for decade in sorted(ranked) for i in ranked[decade][:taken[decade]]])
+
+
+class AlbumQuotaStrategy(SelectionStrategy):
+    """Her albümden en popüler birkaç parça, albüm sırasıyla."""
+
+    label = f"Albüm Başına En Popüler {DEFAULT_ALBUM_QUOTA} Parça"
+    needs_popularity = True
+
+    def select(self, table: CandidateTable, limit: Optional[int]) -> List[str]:
+        albums = table.group_by('album_id', table.where('album_id', bool))
+        rows = [i for album_rows in albums.values() for i in table.rank(album_rows, limit=DEFAULT_ALBUM_QUOTA)]
+        return table.uris(rows[:limit])
+
+
+register_strategy("TRACK", AlbumOrderStrategy())
+register_strategy("POPULARITY", PopularityStrategy())
+register_strategy("TOP_TRACKS", TopTracksFirstStrategy())
+register_strategy("ICEBERG", TieredStrategy("Buzdağı (Max 40 Şarkı, Katmanlı)", *ICEBERG_TIERS))
+register_strategy("ICEBERG_WIDE", TieredStrategy("Geniş Buzdağı (5 Top, 15 Orta, 30 Derin)", 5, 15, 30))
+register_strategy("DECADE", DecadeStrategy())
+register_strategy("ALBUM_QUOTA", AlbumQuotaStrategy())
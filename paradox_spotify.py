@@ -1,41 +1,154 @@
-import base64
+import time
+
+# Açılış ölçümü bu modülün yüklenmeye başladığı andan itibarendir (yorumlayıcının kendi açılışı hariç)
+STARTUP_STARTED: float = time.perf_counter()
+
+import importlib
 import json
 import urllib.parse
 import webbrowser
 import sys
 import threading
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Set, Any
-from io import BytesIO
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple, Dict, Any
 from datetime import datetime, timedelta
 import asyncio
-import time
 
-import requests
-from PIL import Image
 import flet as ft
 
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
-from spotipy import SpotifyException
+# Ağ katmanı (spotipy, requests, httpx, Pillow) burada yüklenmez: pencere açılırken arka planda
+# preload_backend ile, gerekirse ilk kullanımda yüklenir. Buradaki modüller sadece stdlib kullanır.
+from paradox_cache import SETTINGS_STORE
+from paradox_select import SELECTION_STRATEGIES
+
+if TYPE_CHECKING:
+    import spotipy
+    from paradox_cache import MetadataCache
+    from paradox_engine import ArtistSearchCache, JobSpec, PlaylistEngine
+    from paradox_net import AdaptivePacer, RequestStats, TokenBucket
+
+STARTUP_MODULES_LOADED: float = time.perf_counter()
 
 CLIENT_ID: str = "SPOTIFY_CLIENT_ID_BURAYA"
 CLIENT_SECRET: str = "SPOTIFY_CLIENT_SECRET_BURAYA"
 
-REDIRECT_URI: str = "http://127.0.0.1:8080/callback"
-SETTINGS_STORE: Path = Path.home() / ".paradox_flet_spotipy_cache"
+# Log/ilerleme/durum güncellemeleri saniyede en fazla bu kadar kez ekrana basılır
+UI_FLUSH_HZ: float = 10.0
+# Log panelinde tutulan en fazla satır; tam log LOG_FILE_STORE dosyasına yazılır
+LOG_VIEW_MAX_LINES: int = 300
+LOG_FILE_STORE: Path = SETTINGS_STORE.with_name(".paradox_flet.log")
+LOG_FILE_MAX_BYTES: int = 5 * 1024 * 1024
+# Son akışın istek profili (aşama/uç nokta bazında gecikme, boyut, tekrar, 429)
+PROFILE_STORE: Path = SETTINGS_STORE.with_name(".paradox_flet_profile.json")
+# Yazarken arama: son tuş vuruşundan bu kadar sonra aranır; daha kısa sorgular aranmaz
+SEARCH_DEBOUNCE_SECONDS: float = 0.3
+ARTIST_SEARCH_MIN_CHARS: int = 2
+# Soğuk açılış hedefi: modül yükleme + ilk etkileşimli ekranın çizilmesi (Flet penceresinin açılmasını
+# beklerken geçen süre hariç). Aşılırsa açılış raporu uyarı olarak yazılır; ölçüm: benchmarks.bench_startup
+STARTUP_TARGET_SECONDS: float = 1.0
+
+LOG_COLORS: Dict[str, str] = {
+    "info": ft.Colors.GREY_400, "succ": ft.Colors.LIGHT_GREEN_ACCENT_400,
+    "error": ft.Colors.RED_ACCENT_700, "warn": ft.Colors.YELLOW_ACCENT_400,
+    "cyan": ft.Colors.CYAN_ACCENT_400
+}
+
+
+class UiUpdateScheduler:
+    """
+    İşçi thread'lerinden gelen log satırlarını ve arayüz güncellemelerini biriktirip ayrı bir thread'de
+    sabit hızla (UI_FLUSH_HZ) tek bir `page.update()` ile basar. Anahtarlı güncellemelerde (durum,
+    ilerleme) sadece en son istenen uygulanır; log paneli son LOG_VIEW_MAX_LINES satırı tutar,
+    tüm satırlar ayrıca log dosyasına eklenir.
+    """
+
+    def __init__(self, page: ft.Page, log_container: ft.Column, hz: float = UI_FLUSH_HZ,
+                 max_lines: int = LOG_VIEW_MAX_LINES, log_path: Optional[Path] = LOG_FILE_STORE):
+        self.page = page
+        self.log_container = log_container
+        self.interval = 1.0 / hz
+        self.max_lines = max_lines
+        self._lines: List[Tuple[str, str]] = []
+        self._updates: Dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._log_file = self._open_log_file(log_path) if log_path else None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @staticmethod
+    def _open_log_file(path: Path):
+        try:
+            if path.exists() and path.stat().st_size > LOG_FILE_MAX_BYTES:
+                path.replace(path.with_name(path.name + ".1"))
+            return open(path, "a", encoding="utf-8")
+        except OSError:
+            return None  # Log dosyası yazılamıyorsa sadece panel kullanılır
+
+    def log(self, line: str, type: str = "info"):
+        with self._lock:
+            self._lines.append((line, type))
+        self._wake.set()
+
+    def request(self, key: str, update: Callable[[], None]):
+        """`update` bir sonraki basımda çalışır; aynı anahtarla bekleyen eski güncellemenin yerini alır."""
+        with self._lock:
+            # Son istenen en son uygulanır (örn. önizleme, bekleyen ilerleme güncellemesinden sonra)
+            self._updates.pop(key, None)
+            self._updates[key] = update
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception as ex:
+                print(f"Arayüz güncellemesi başarısız: {ex}", file=sys.stderr)
+            # Bu aralıkta gelenler bir sonraki basımda topluca uygulanır
+            time.sleep(self.interval)
+
+    def _flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+            updates, self._updates = list(self._updates.values()), {}
+        if not lines and not updates:
+            return
+
+        if lines:
+            if self._log_file:
+                self._log_file.write("".join(f"{line}\n" for line, _ in lines))
+                self._log_file.flush()
+            controls = self.log_container.controls
+            controls.extend(
+                ft.Text(line, color=LOG_COLORS.get(type, ft.Colors.GREY_400), size=12)
+                for line, type in lines[-self.max_lines:]
+            )
+            if len(controls) > self.max_lines:
+                del controls[:len(controls) - self.max_lines]
+            self.log_container.scroll_to(offset=-1)
+        for update in updates:
+            update()
+        self.page.update()
+
+
+def preload_backend():
+    """Ağ katmanı modüllerini yükler; Flet penceresi açılırken ayrı bir thread'de çağrılır."""
+    for module in ("paradox_async", "paradox_engine"):
+        importlib.import_module(module)
 
-SCOPES: str = "playlist-modify-private playlist-modify-public user-read-private ugc-image-upload user-read-email"
 
 class MainApp:
     
     def __init__(self, page: ft.Page):
+        # Açılış aşamalarının zaman damgaları (time.perf_counter); rapor token kontrolünden sonra yazılır
+        self._startup_marks: Dict[str, float] = {"window": time.perf_counter()}
         self.page = page
         self.page.title = "PARADOX Flet: Spotify Masterpiece (Spotipy)"
         self.page.theme_mode = ft.ThemeMode.DARK
         self.page.vertical_alignment = ft.MainAxisAlignment.START
         
-        self.sp: Optional[spotipy.Spotify] = None
+        self.sp: Optional["spotipy.Spotify"] = None
         self.client_id: str = CLIENT_ID
         self.client_secret: str = CLIENT_SECRET
         self.current_user_id: Optional[str] = None
@@ -47,9 +160,25 @@ class MainApp:
         self.current_playlist_url: Optional[str] = None
         self.is_connected: bool = False
 
+        # Ağ katmanı nesneleri ilk ekran çizildikten sonra _load_backend ile kurulur
+        self.rate_limiter: Optional["TokenBucket"] = None
+        self.write_pacer: Optional["AdaptivePacer"] = None
+        self.request_stats: Optional["RequestStats"] = None
+        self.http_session = None
+        self.metadata_cache: Optional["MetadataCache"] = None
+        self.artist_search: Optional["ArtistSearchCache"] = None
+        self._async_supported: bool = False
+        self._backend_ready = threading.Event()
+        # Her tuş vuruşunda artar; eski sorguların sonuçları bu sayıyla ayırt edilip atılır
+        self._search_generation: int = 0
+        self._search_timer: Optional[threading.Timer] = None
+
         self.log_text = ft.Text("Hazır. Kimlik bilgilerini girin ve bağlanın.", color=ft.Colors.GREY_400)
         self.status_text = ft.Text("Bağlantı Bekleniyor", color=ft.Colors.YELLOW_ACCENT_400, weight=ft.FontWeight.BOLD)
         self.log_container = ft.Column(scroll=ft.ScrollMode.ADAPTIVE, height=150)
+        # İşçilerden gelen log/ilerleme güncellemeleri olay başına değil, sabit hızda topluca basılır
+        self.ui_updates = UiUpdateScheduler(self.page, self.log_container)
+        self._flow_header: Optional[ft.Text] = None
         
         self.user_profile_image = ft.Container(
             content=ft.Icon(ft.Icons.PERSON, size=50, color=ft.Colors.GREY_700),
@@ -63,9 +192,11 @@ class MainApp:
         self.stats_text_total_album = ft.Text("Toplam Albüm: 0", color=ft.Colors.CYAN_ACCENT_100)
         self.stats_text_total_track = ft.Text("Toplanan Parça: 0", color=ft.Colors.LIME_ACCENT_400)
         self.stats_text_added_track = ft.Text("Eklenen Parça: 0", color=ft.Colors.GREEN_ACCENT_400)
+        self.stats_text_write_rate = ft.Text("Yazma Hızı: -", color=ft.Colors.AMBER_ACCENT_200)
+        self.stats_text_latency = ft.Text("İstek Gecikmesi: -", color=ft.Colors.AMBER_ACCENT_100)
         
         self.flow_stats_container = ft.Column(
-            [self.stats_text_total_album, self.stats_text_total_track, self.stats_text_added_track, self.progress_bar],
+            [self.stats_text_total_album, self.stats_text_total_track, self.stats_text_added_track, self.stats_text_write_rate, self.stats_text_latency, self.progress_bar],
             spacing=10, visible=True, alignment=ft.MainAxisAlignment.START
         )
         
@@ -122,13 +253,47 @@ class MainApp:
             can_reveal_password=True
         )
         
-        self.artist_search_entry = ft.TextField(label="Sanatçı Adı (Örn: Daft Punk)", width=300, on_submit=self._quick_search_artist_click)
+        self.artist_search_entry = ft.TextField(
+            label="Sanatçı Adı (Örn: Daft Punk)", width=300,
+            on_submit=self._quick_search_artist_click, on_change=self._artist_query_changed
+        )
+        self.artist_candidates_column = ft.Column(spacing=0, visible=False, width=350)
         self.artist_search_button = ft.IconButton(
             icon=ft.Icons.SEARCH, 
             tooltip="Sanatçıyı Ara ve Seçili Listeye Ekle", 
             on_click=self._quick_search_artist_click,
             icon_color=ft.Colors.GREEN_ACCENT_700
         )
+        self.bulk_import_button = ft.IconButton(
+            icon=ft.Icons.PLAYLIST_ADD,
+            tooltip="Toplu Sanatçı Ekle (liste, .txt/.csv dosyası veya URL'ler)",
+            on_click=self._open_bulk_import_click,
+            icon_color=ft.Colors.GREEN_ACCENT_700
+        )
+        self.bulk_artist_entry = ft.TextField(
+            label="Her satıra bir sanatçı adı, ID, URI veya URL", multiline=True, min_lines=8, max_lines=12, width=450
+        )
+        self.artist_file_picker = ft.FilePicker(on_result=self._artist_file_picked)
+        self.page.overlay.append(self.artist_file_picker)
+        self.bulk_import_dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Toplu Sanatçı Ekle"),
+            content=ft.Column(
+                [
+                    self.bulk_artist_entry,
+                    ft.TextButton(
+                        "📂 Dosyadan Yükle (.txt/.csv)",
+                        on_click=lambda e: self.artist_file_picker.pick_files(allowed_extensions=["txt", "csv"])
+                    ),
+                ],
+                tight=True
+            ),
+            actions=[
+                ft.TextButton("Ekle", on_click=self._bulk_import_click),
+                ft.TextButton("İptal", on_click=lambda e: self.page.close(self.bulk_import_dialog)),
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
         
         self.selected_artists_column = ft.Column(
             [ft.Text("Seçili Sanatçılar (0)", weight=ft.FontWeight.BOLD)],
@@ -143,21 +308,35 @@ class MainApp:
             ft.dropdown.Option("NEW", "Yeni Oluştur"),
             ft.dropdown.Option("OVERWRITE", "Varolanı Silip Yeniden Yaz"),
             ft.dropdown.Option("APPEND", "Varolana Ekle"),
+            ft.dropdown.Option("INCREMENTAL", "Varolana Sadece Yeni Çıkanları Ekle"),
         ], width=350)
         
+        # Seçenekler strateji kaydından gelir; yeni stratejiler burada otomatik görünür
         self.sort_combo = ft.Dropdown(label="Sıralama Tipi", value="TRACK", options=[
-            ft.dropdown.Option("TRACK", "Albümdeki Sırasına Göre"),
-            ft.dropdown.Option("POPULARITY", "Popülerliğe Göre (Azalan)"),
-            ft.dropdown.Option("TOP_TRACKS", "Spotify Top 10 Tracks (Önce)"),
-            # YENİ BUZDAĞI SEÇENEĞİ
-            ft.dropdown.Option("ICEBERG", "Buzdağı (Max 40 Şarkı, Katmanlı)")
+            ft.dropdown.Option(name, strategy.label) for name, strategy in SELECTION_STRATEGIES.items()
+        ], width=350)
+
+        self.dedupe_combo = ft.Dropdown(label="Tekrar Eden Sürümler", value="ORIGINAL", options=[
+            ft.dropdown.Option("ORIGINAL", "İlk Çıkan Sürümü Tut"),
+            ft.dropdown.Option("POPULAR", "En Popüler Sürümü Tut"),
+            ft.dropdown.Option("EXPLICIT", "Explicit Sürümü Tercih Et"),
+            ft.dropdown.Option("CLEAN", "Clean Sürümü Tercih Et"),
+            ft.dropdown.Option("NONE", "Tüm Sürümleri Tut"),
         ], width=350)
 
+        self.max_tracks_entry = ft.TextField(
+            label="Maks. Parça Sayısı (Opsiyonel)", width=350, keyboard_type=ft.KeyboardType.NUMBER
+        )
+
         self.album_check = ft.Checkbox(label="Albums", value=True)
         self.single_check = ft.Checkbox(label="Singles", value=True)
         self.compilation_check = ft.Checkbox(label="Compilations", value=False)
         self.exclude_short_check = ft.Checkbox(label="Exclude tracks < 60s", value=True)
         self.public_check = ft.Checkbox(label="Public Playlist", value=True)
+        self.mosaic_cover_check = ft.Checkbox(label="Mozaik kapak (ilk 4 sanatçı)", value=False)
+        # httpx kuruluysa okumalar yüzlerce thread yerine tek thread'de coroutine'lerle yapılabilir;
+        # kullanılabilirliği ağ katmanı yüklenince belirlenir
+        self.async_check = ft.Checkbox(label="Async toplama (httpx)", value=False, disabled=True)
         
         self.connect_button = ft.ElevatedButton(text="🔗 Spotify'a Bağlan", on_click=self._connect_to_spotify_click, width=350)
         
@@ -187,7 +366,9 @@ class MainApp:
         self.artist_followers_label = ft.Text("")
         
         self._init_layout()
-        self.page.run_thread(self._check_initial_connection)
+        self._startup_marks["interactive"] = time.perf_counter()
+        # Ekran bu noktada kullanılabilir; ağ katmanı ve kayıtlı token kontrolü arka planda yürür
+        self.page.run_thread(self._startup_worker)
 
 
     def _init_layout(self):
@@ -202,7 +383,11 @@ class MainApp:
                 
                 ft.Text("Sanatçı ve Playlist Ayarları", size=18, weight=ft.FontWeight.BOLD),
                 
-                ft.Row([self.artist_search_entry, self.artist_search_button], alignment=ft.MainAxisAlignment.START, spacing=5),
+                ft.Row(
+                    [self.artist_search_entry, self.artist_search_button, self.bulk_import_button],
+                    alignment=ft.MainAxisAlignment.START, spacing=5
+                ),
+                self.artist_candidates_column,
                 
                 ft.Container(
                     content=self.selected_artists_column,
@@ -217,8 +402,12 @@ class MainApp:
                 self.existing_playlist_entry,
                 self.playlist_mode_combo,
                 self.sort_combo,
+                self.dedupe_combo,
+                self.max_tracks_entry,
                 ft.Row([self.album_check, self.single_check, self.compilation_check]),
                 ft.Row([self.exclude_short_check, self.public_check]), 
+                self.mosaic_cover_check,
+                self.async_check,
                 ft.Divider(height=20, color=ft.Colors.WHITE30),
                 self.start_flow_button,
                 self.check_button,
@@ -336,31 +525,13 @@ class MainApp:
     # ... (Diğer helper fonksiyonlar burada devam eder)
 
     def playlist_id_from_input(self, input_str: str) -> Optional[str]:
-        if "spotify:playlist:" in input_str:
-            return input_str.split("spotify:playlist:")[-1].split("?")[0].strip()
-        if "/playlist/" in input_str:
-            return input_str.split("/playlist/")[-1].split("?")[0].strip()
-        return input_str.strip() if input_str else None
+        from paradox_engine import playlist_id_from_input
+
+        return playlist_id_from_input(input_str)
     
     def _log(self, message: str, type: str = "info"):
-        color_map = {
-            "info": ft.Colors.GREY_400, "succ": ft.Colors.LIGHT_GREEN_ACCENT_400,
-            "error": ft.Colors.RED_ACCENT_700, "warn": ft.Colors.YELLOW_ACCENT_400,
-            "cyan": ft.Colors.CYAN_ACCENT_400
-        }
         timestamp = datetime.now().strftime("[%H:%M:%S]")
-        log_entry = ft.Text(f"{timestamp} {message}", color=color_map.get(type, ft.Colors.GREY_400), size=12)
-        
-        def update_log_ui():
-            self.log_container.controls.append(log_entry)
-            self.log_container.scroll_to(offset=-1) 
-            self.page.update()
-
-        if threading.current_thread() == threading.main_thread():
-             update_log_ui()
-        else:
-             self.page.run_thread(update_log_ui) 
-
+        self.ui_updates.log(f"{timestamp} {message}", type)
 
     def _update_status(self, message: str, type: str = "info"):
         color_map = {
@@ -370,12 +541,8 @@ class MainApp:
         def update_status_ui():
             self.status_text.value = message
             self.status_text.color = color_map.get(type, ft.Colors.LIGHT_BLUE_ACCENT_100)
-            self.page.update()
-            
-        if threading.current_thread() == threading.main_thread():
-             update_status_ui()
-        else:
-             self.page.run_thread(update_status_ui)
+
+        self.ui_updates.request("status", update_status_ui)
             
     def _update_credentials(self, e: ft.ControlEvent):
         self.client_id = self.client_id_entry.value
@@ -409,28 +576,40 @@ class MainApp:
         
         self.page.run_thread(self.page.update)
     
-    def _update_flow_stats(self, step: str, current: int = 0, total: int = 1, added: int = 0):
+    def _update_flow_stats(self, step: str, current: int = 0, total: int = 1, added: int = 0, rate: Optional[float] = None):
+        # Değerler hemen güncellenir; ekrana basma bir sonraki karede tek seferde yapılır
+        self.progress_bar.value = current / total if total > 0 else 0
+
+        if rate is not None:
+            self.stats_text_write_rate.value = f"Yazma Hızı: {rate:.1f} istek/sn"
+        p50, p95 = self.request_stats.latency_percentiles()
+        counts = self.request_stats.snapshot()
+        self.stats_text_latency.value = (
+            f"İstek Gecikmesi p50/p95: {p50 * 1000:.0f}/{p95 * 1000:.0f} ms · {counts['requests']} istek · {counts['rate_limited']}x429"
+        )
+
+        if step == "ALBUM_COUNT":
+            self.stats_text_total_album.value = f"Toplam Albüm: {total}"
+            self._flow_header = ft.Text(f"Albüm Taranıyor: {current}/{total}", color=ft.Colors.YELLOW_ACCENT_400)
+        elif step == "TRACK_COUNT":
+            self.stats_text_total_track.value = f"Toplanan Parça: {current}"
+        elif step == "ADDING_TRACKS":
+            self.stats_text_added_track.value = f"Eklenen Parça: {added}/{total}"
+            self._flow_header = ft.Text(f"Parçalar Ekleniyor: {added}/{total}", color=ft.Colors.GREEN_ACCENT_400)
+
         def update_ui():
             self.playlist_preview_container.visible = False
-            self.flow_stats_wrapper.visible = True 
-            
-            self.progress_bar.value = current / total if total > 0 else 0
-            
-            controls = [self.stats_text_total_album, self.stats_text_total_track, self.stats_text_added_track, self.progress_bar]
-
-            if step == "ALBUM_COUNT":
-                self.stats_text_total_album.value = f"Toplam Albüm: {total}"
-                controls.insert(0, ft.Text(f"Albüm Taranıyor: {current}/{total}", color=ft.Colors.YELLOW_ACCENT_400))
-            elif step == "TRACK_COUNT":
-                self.stats_text_total_track.value = f"Toplanan Parça: {current}"
-            elif step == "ADDING_TRACKS":
-                self.stats_text_added_track.value = f"Eklenen Parça: {added}/{total}"
-                controls.insert(0, ft.Text(f"Parçalar Ekleniyor: {added}/{total}", color=ft.Colors.GREEN_ACCENT_400))
-            
+            self.flow_stats_wrapper.visible = True
+            controls = [self.stats_text_total_album, self.stats_text_total_track, self.stats_text_added_track, self.stats_text_write_rate, self.stats_text_latency, self.progress_bar]
+            if self._flow_header is not None:
+                controls.insert(0, self._flow_header)
             self.flow_stats_container.controls = controls
-            self.page.update()
-            
-        self.page.run_thread(update_ui)
+
+        self.ui_updates.request("flow", update_ui)
+
+    def _hide_flow_stats(self):
+        # Bekleyen ilerleme güncellemesinin paneli tekrar açmaması için aynı anahtarla istenir
+        self.ui_updates.request("flow", lambda: setattr(self.flow_stats_wrapper, 'visible', False))
         
     def _update_playlist_preview(self, playlist_data: Optional[dict], cover_url: Optional[str] = None):
         def update_ui():
@@ -459,9 +638,8 @@ class MainApp:
                 self.playlist_preview_container.visible = False
                 
             self.flow_stats_wrapper.visible = False
-            self.page.update()
-            
-        self.page.run_thread(update_ui)
+
+        self.ui_updates.request("preview", update_ui)
         
     def _open_playlist_link(self, e):
         if self.current_playlist_url:
@@ -509,7 +687,7 @@ class MainApp:
         if artist_data:
             name = artist_data.get('name', 'Bilinmiyor')
             followers = artist_data.get('followers', {}).get('total', 0)
-            image_url = artist_data.get('images', [{}])[0].get('url')
+            image_url = (artist_data.get('images') or [{}])[0].get('url')
             
             self.artist_name_label.value = f"Son Aranan: {name}"
             self.artist_followers_label.value = f"Takipçi: {followers:,}"
@@ -533,13 +711,14 @@ class MainApp:
             self.client_id_entry, self.client_secret_entry, self.artist_search_entry, 
             self.connect_button, self.check_button, self.delete_playlist_button,
             self.playlist_name_entry, self.existing_playlist_entry, 
-            self.playlist_mode_combo, self.sort_combo, self.album_check, 
+            self.playlist_mode_combo, self.sort_combo, self.dedupe_combo, self.max_tracks_entry, self.album_check, 
             self.single_check, self.compilation_check, self.exclude_short_check, 
-            self.public_check, self.artist_search_button
+            self.public_check, self.mosaic_cover_check, self.async_check, self.artist_search_button, self.bulk_import_button
         ]
         
         for control in controls_to_disable:
             control.disabled = not enabled
+        self.async_check.disabled = self.async_check.disabled or not self._async_supported
             
         if enabled:
             if self.is_connected:
@@ -551,25 +730,84 @@ class MainApp:
         
         self.page.run_thread(self.page.update)
 
+    def _startup_worker(self):
+        """Açılışın arka plan kısmı: ağ katmanını kurar, kayıtlı token'ı kontrol eder ve açılış raporunu yazar."""
+        try:
+            self._load_backend()
+        except ImportError as ex:
+            self._log(f"Ağ katmanı yüklenemedi: {ex}", "error")
+            self._update_status("HATA: Bağımlılıklar eksik. Logları Kontrol Et.", "err")
+            return
+        finally:
+            self._backend_ready.set()
+        self._startup_marks["backend"] = time.perf_counter()
+        self._check_initial_connection()
+        self._startup_marks["token"] = time.perf_counter()
+        self._report_startup()
+
+    def _load_backend(self):
+        from paradox_async import async_available
+        from paradox_cache import METADATA_CACHE_STORE, MetadataCache
+        from paradox_engine import HARVEST_WORKERS, ArtistSearchCache
+        from paradox_net import AdaptivePacer, RequestStats, TokenBucket, build_spotify_session
+
+        # Tüm işçilerin paylaştığı istek bütçesi ve bağlantı havuzu
+        self.rate_limiter = TokenBucket()
+        # Yazma çağrıları (ekleme, silme, kapak yükleme) için ortak uyarlanabilir hız ayarlayıcı
+        self.write_pacer = AdaptivePacer()
+        # İstek sayaçları ve aşama bazında istek profili (canlı p50/p95 gecikme)
+        self.request_stats = RequestStats()
+        self.http_session = build_spotify_session(
+            self.rate_limiter, pool_size=HARVEST_WORKERS, write_pacer=self.write_pacer, request_stats=self.request_stats
+        )
+        # Sanatçı/albüm/parça yanıtları için kalıcı önbellek (tekrar çalıştırmalarda ağa sadece bayat kayıtlar için çıkılır)
+        self.metadata_cache = MetadataCache(METADATA_CACHE_STORE)
+        # Sanatçı arama sonuçları (bellek LRU + kalıcı önbellek); aynı sorgu ağa bir kez çıkar
+        self.artist_search = ArtistSearchCache(self.metadata_cache)
+        self._async_supported = async_available()
+
+        def update_async_check():
+            self.async_check.value = self._async_supported
+            self.async_check.disabled = not self._async_supported
+
+        self.ui_updates.request("async_check", update_async_check)
+
+    def _report_startup(self):
+        marks = self._startup_marks
+        window_wait = marks["window"] - STARTUP_MODULES_LOADED
+        interactive = marks["interactive"] - STARTUP_STARTED
+        # Flet istemcisinin açılması uygulamanın elinde değildir; hedefe sayılmaz
+        own = interactive - window_wait
+        self._log(
+            f"Açılış: modüller {STARTUP_MODULES_LOADED - STARTUP_STARTED:.2f} sn, pencere {window_wait:.2f} sn, "
+            f"arayüz {marks['interactive'] - marks['window']:.2f} sn (etkileşime hazır: {interactive:.2f} sn). "
+            f"Arka planda: ağ katmanı {marks['backend'] - marks['interactive']:.2f} sn, "
+            f"token kontrolü {marks['token'] - marks['backend']:.2f} sn.", "cyan"
+        )
+        if own > STARTUP_TARGET_SECONDS:
+            self._log(
+                f"Açılış hedefi aşıldı: {own:.2f} sn > {STARTUP_TARGET_SECONDS:.2f} sn (pencere bekleme hariç).", "warn"
+            )
+
     def _check_initial_connection(self):
+        import requests
+        from spotipy import SpotifyException
+
+        from paradox_engine import build_auth_manager, build_spotify_client
+
         if not self.client_id or not self.client_secret or self.client_id == CLIENT_ID:
             self.page.run_thread(lambda: self._update_status("Client ID/Secret Bekleniyor.", "warn"))
             return
 
         self._log("Spotipy cache kontrol ediliyor...", "cyan")
-        auth_manager = SpotifyOAuth(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=REDIRECT_URI,
-            scope=SCOPES,
-            cache_path=SETTINGS_STORE.as_posix(),
-            show_dialog=False
+        auth_manager = build_auth_manager(
+            self.client_id, self.client_secret, show_dialog=False
         )
 
         try:
             token = auth_manager.get_access_token(check_cache=True)
             if token and token.get('access_token'):
-                self.sp = spotipy.Spotify(auth=token['access_token'])
+                self.sp = build_spotify_client(auth_manager, token, self.http_session)
                 user = self.sp.current_user()
                 if user:
                     self.current_user_id = user['id']
@@ -601,20 +839,19 @@ class MainApp:
         self.page.run_thread(self._worker_connect)
 
     def _worker_connect(self):
+        # Açılıştan hemen sonra tıklanırsa ağ katmanının yüklenmesi beklenir
+        self._backend_ready.wait()
         try:
-            auth_manager = SpotifyOAuth(
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                redirect_uri=REDIRECT_URI,
-                scope=SCOPES,
-                cache_path=SETTINGS_STORE.as_posix(),
-                show_dialog=True
+            from paradox_engine import build_auth_manager, build_spotify_client
+
+            auth_manager = build_auth_manager(
+                self.client_id, self.client_secret, show_dialog=True
             )
             
             token_info = auth_manager.get_access_token(check_cache=False)
             
             if token_info and token_info.get('access_token'):
-                self.sp = spotipy.Spotify(auth=token_info['access_token'])
+                self.sp = build_spotify_client(auth_manager, token_info, self.http_session)
                 user = self.sp.current_user()
                 self.current_user_id = user['id']
                 self.is_connected = True
@@ -635,15 +872,82 @@ class MainApp:
             self.page.run_thread(lambda: setattr(self.connect_button, 'disabled', False))
             self.page.run_thread(self.page.update)
             
+    def _artist_query_changed(self, e):
+        """
+        Yazarken arama: önbellekteki sorgular anında gösterilir, diğerleri son tuş vuruşundan
+        SEARCH_DEBOUNCE_SECONDS sonra aranır. Yeni bir tuş vuruşu bekleyen aramayı iptal eder;
+        yolda olan aramanın sonucu ise gelince atılır.
+        """
+        query = (self.artist_search_entry.value or "").strip()
+        self._search_generation += 1
+        if self._search_timer:
+            self._search_timer.cancel()
+        if not self.sp or len(query) < ARTIST_SEARCH_MIN_CHARS:
+            return self._show_artist_candidates([])
+
+        cached = self.artist_search.cached(query)
+        if cached is not None:
+            return self._show_artist_candidates(cached)
+        self._search_timer = threading.Timer(
+            SEARCH_DEBOUNCE_SECONDS, self._worker_type_ahead, args=(query, self._search_generation)
+        )
+        self._search_timer.daemon = True
+        self._search_timer.start()
+
+    def _worker_type_ahead(self, query: str, generation: int):
+        import requests
+        from spotipy import SpotifyException
+
+        if generation != self._search_generation:
+            return
+        try:
+            results = self.artist_search.search(self.sp, query)
+        except (SpotifyException, requests.exceptions.RequestException) as ex:
+            self._log(f"Sanatçı arama hatası: {ex}", "warn")
+            return
+        if generation == self._search_generation:
+            self._show_artist_candidates(results)
+
+    def _show_artist_candidates(self, artists: List[dict]):
+        def update_ui():
+            self.artist_candidates_column.controls = [
+                ft.ListTile(
+                    dense=True,
+                    leading=ft.CircleAvatar(
+                        foreground_image_src=(artist.get('images') or [{}])[0].get('url'),
+                        content=ft.Text((artist.get('name') or "?")[:1])
+                    ),
+                    title=ft.Text(artist.get('name', ''), size=13),
+                    subtitle=ft.Text(f"Takipçi: {artist.get('followers', {}).get('total', 0):,}", size=11),
+                    on_click=lambda e, a=artist: self._pick_artist_candidate(a),
+                )
+                for artist in artists
+            ]
+            self.artist_candidates_column.visible = bool(artists)
+
+        self.ui_updates.request("artist_candidates", update_ui)
+
+    def _pick_artist_candidate(self, artist: dict):
+        self._search_generation += 1
+        self.artist_search_entry.value = ""
+        self._show_artist_candidates([])
+        self.current_artist_id = artist['id']
+        self._add_selected_artist(artist['id'], artist.get('name'))
+        self._update_artist_info(artist)
+
     def _quick_search_artist_click(self, e):
         if not self.sp: return self._log("Bağlı değilsiniz.", "error")
         search_term = self.artist_search_entry.value.strip()
         if search_term:
-            self.set_ui_enabled(False)
+            # Arayüz kilitlenmez; ilk aday eklenir
+            self._search_generation += 1
+            self._show_artist_candidates([])
             self._update_status(f"Sanatçı aranıyor: {search_term}", "info")
-            threading.Thread(target=self._worker_search_artist, args=(search_term,)).start()
+            threading.Thread(target=self._worker_search_artist, args=(search_term,), daemon=True).start()
 
     def _worker_search_artist(self, search_term: str):
+        from spotipy import SpotifyException
+
         try:
             data = self.search_artist(search_term)
             if data:
@@ -660,22 +964,77 @@ class MainApp:
             self._update_status("Arama Hatası.", "err")
         except Exception as e:
             self._log(f"Beklenmeyen arama hatası: {e}", "error")
+
+    def _open_bulk_import_click(self, e):
+        if not self.sp: return self._log("Bağlı değilsiniz.", "error")
+        self.page.open(self.bulk_import_dialog)
+
+    def _artist_file_picked(self, e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        path = Path(e.files[0].path)
+        try:
+            text = path.read_text(encoding="utf-8-sig")
+        except (OSError, UnicodeDecodeError) as ex:
+            self._log(f"Dosya okunamadı: {ex}", "error")
+            return
+        from paradox_engine import parse_artist_list
+
+        entries = parse_artist_list(text, csv_format=path.suffix.lower() == ".csv")
+        self.bulk_artist_entry.value = "\n".join(entries)
+        self._log(f"{path.name}: {len(entries)} sanatçı girdisi yüklendi.", "cyan")
+        self.page.update()
+
+    def _bulk_import_click(self, e):
+        from paradox_engine import parse_artist_list
+
+        entries = parse_artist_list(self.bulk_artist_entry.value or "")
+        self.page.close(self.bulk_import_dialog)
+        if not entries:
+            return self._log("İçe aktarılacak sanatçı yok.", "warn")
+        self.set_ui_enabled(False)
+        self._update_status(f"{len(entries)} sanatçı çözülüyor...", "info")
+        threading.Thread(target=self._worker_bulk_import, args=(entries,)).start()
+
+    def _worker_bulk_import(self, entries: List[str]):
+        import requests
+        from spotipy import SpotifyException
+
+        try:
+            resolved, unresolved = self._create_engine().resolve_artists(entries)
+            new_artists = {artist_id: name for artist_id, name in resolved.items() if artist_id not in self.selected_artists}
+            # Tüm sonuçlar tek seferde eklenir; liste bir kez yeniden çizilir
+            self.selected_artists.update(new_artists)
+            self._log(
+                f"Toplu içe aktarma: {len(new_artists)} sanatçı eklendi, "
+                f"{len(resolved) - len(new_artists)} tanesi zaten listedeydi.", "succ"
+            )
+            if unresolved:
+                shown = ", ".join(unresolved[:10]) + (" ..." if len(unresolved) > 10 else "")
+                self._log(f"{len(unresolved)} girdi bulunamadı: {shown}", "warn")
+            self._update_status(f"{len(new_artists)} sanatçı eklendi.", "succ")
+            self.bulk_artist_entry.value = "\n".join(unresolved)
+        except (SpotifyException, requests.exceptions.RequestException) as ex:
+            self._log(f"Toplu içe aktarma hatası: {ex}", "error")
+            self._update_status("İçe Aktarma Hatası.", "err")
         finally:
-            self.page.run_thread(lambda: self.set_ui_enabled(True))
+            self._update_selected_artists_ui()
 
     def search_artist(self, name: str) -> Optional[dict]:
         if not self.sp: return None
+        from spotipy import SpotifyException
+
         try:
-            data = self.sp.search(q=f'artist:{name}', type='artist', limit=1)
-            if data and data.get("artists", {}).get("items"):
-                return data["artists"]["items"][0]
-            return None
+            results = self.artist_search.search(self.sp, name)
+            return results[0] if results else None
         except SpotifyException as e:
             self._log(f"API Hatası (Sanatçı Arama): {e}", "error")
             raise
 
     def delete_playlist(self, playlist_id: str) -> bool:
         if not self.sp: return False
+        from spotipy import SpotifyException
+
         try:
             self.sp.playlist_unfollow(playlist_id)
             self._log(f"Playlist ID: {playlist_id} başarıyla silindi (unfollow edildi).", "succ")
@@ -752,6 +1111,8 @@ class MainApp:
         threading.Thread(target=self._worker_check_playlist, args=(playlist_id,)).start()
 
     def _worker_check_playlist(self, playlist_id: str):
+        from spotipy import SpotifyException
+
         try:
             playlist_data = self.sp.playlist(playlist_id)
             
@@ -783,324 +1144,76 @@ class MainApp:
             types.append('compilation')
         return types
 
-    def _get_artist_albums(self, artist_id: str, album_types: List[str]) -> List[dict]:
-        albums: Dict[str, dict] = {}
-        for album_type in album_types:
-            results = self.sp.artist_albums(artist_id, album_type=album_type, country='from_token', limit=50)
-            while results:
-                for item in results['items']:
-                    # Aynı albümü farklı tiplerde (örn: single/album olarak) veya pazarlarda (country)
-                    # tekrar eklememek için basit bir anahtar oluşturuyoruz.
-                    album_key = item['name'].lower() + item['album_type'] + item['album_group']
-                    if item['id'] not in albums: # ID bazlı benzersizlik kontrolü daha iyi
-                        albums[item['id']] = item
-                if results['next']:
-                    results = self.sp.next(results)
-                else:
-                    results = None
-        return list(albums.values())
-
-    def _get_tracks_from_album(self, album_id: str, exclude_short: bool) -> List[str]:
-        track_uris: List[str] = []
-        results = self.sp.album_tracks(album_id)
-        while results:
-            for track in results['items']:
-                if exclude_short and track.get('duration_ms', 0) < 60000:
-                    continue
-                track_uris.append(track['uri'])
-            if results['next']:
-                results = self.sp.next(results)
-            else:
-                results = None
-        return track_uris
-
-    def _get_artist_tracks_iceberg(self, artist_id: str, exclude_short: bool) -> List[str]:
-        """
-        Sanatçının Buzdağı modeline göre (10 Top, 10 Orta, 20 Derin) parça URI'lerini döndürür.
-        Toplam maks. 40 parça.
-        """
-        if not self.sp: return []
-        
-        # 1. Top 10 (Zirve) Parçalar (Maks. 10)
-        top_tracks_data = self.sp.artist_top_tracks(artist_id, country='from_token')
-        top_tracks = [
-            track['uri'] for track in top_tracks_data.get('tracks', []) 
-            if track and track.get('uri') and (not exclude_short or track.get('duration_ms', 0) >= 60000)
-        ][:10]
-        
-        # 2. Tüm Albüm/Single Parçalarını Topla
-        album_types = self._get_album_types()
-        all_albums = self._get_artist_albums(artist_id, album_types)
-        
-        all_album_uris: Set[str] = set()
-        
-        for album in all_albums:
-            # Sadece ID'leri çekmek için mevcut _get_tracks_from_album'ü kullanabiliriz
-            track_uris = self._get_tracks_from_album(album['id'], exclude_short)
-            all_album_uris.update(track_uris)
-
-        # Top 10'da zaten olanları hariç tut
-        non_top_uris = list(all_album_uris - set(top_tracks))
-        
-        if not non_top_uris:
-            self._log(f"Sanatçı ID: {artist_id} için Top 10 haricinde parça bulunamadı. Top 10 ile devam ediliyor.", "warn")
-            return top_tracks
-            
-        # Benzersiz parçaların tam bilgilerini ve popülerliğini almak için
-        non_top_track_details: List[dict] = []
-        chunk_size = 50
-        for i in range(0, len(non_top_uris), chunk_size):
-            chunk = non_top_uris[i:i + chunk_size]
-            try:
-                # Spotify API'dan track detaylarını çekiyoruz (popülerlik bilgisi için)
-                results = self.sp.tracks(chunk)
-                if results and results.get('tracks'):
-                    # Geçerli track'leri ve kısalık kontrolünü yaparak listeye ekle
-                    non_top_track_details.extend([
-                        track for track in results['tracks'] 
-                        if track and track.get('uri') and (not exclude_short or track.get('duration_ms', 0) >= 60000)
-                    ])
-            except SpotifyException as e:
-                self._log(f"Buzdağı parça detayları çekilirken hata: {e}", "error")
-                
-        
-        # Popülerliğe Göre Sırala (Azalan)
-        # Popülerliği bilinmeyen (None) veya 0 olan parçalar listenin sonuna düşer.
-        non_top_track_details.sort(key=lambda t: t.get('popularity', -1), reverse=True)
-        
-        # 3. Katmanlama
-        
-        # Orta Katman (10 Şarkı)
-        mid_tier_tracks = [track['uri'] for track in non_top_track_details[:10]]
-        
-        # Derin Kesim (20 Şarkı)
-        # 10. indexten başla (11. parça), maks 20 tane al
-        deep_cuts = [track['uri'] for track in non_top_track_details[10:30]] 
-
-        # 4. Sonuçları Birleştir ve Max. 40'ı Garanti Et
-        final_uris = top_tracks + mid_tier_tracks + deep_cuts
-        
-        self._log(
-            f"Buzdağı Modu Sonuç: Top {len(top_tracks)}, Orta {len(mid_tier_tracks)}, Derin {len(deep_cuts)}. Toplam: {len(final_uris)}", 
-            "cyan"
-        )
-        return final_uris
-
-    def _create_or_manage_playlist(self, mode: str, name: str, existing_id: Optional[str], is_public: bool) -> str:
-        if mode == "NEW":
-            if not name:
-                raise ValueError("Yeni playlist oluşturmak için bir isim girmelisiniz.")
-            playlist = self.sp.user_playlist_create(
-                user=self.current_user_id,
-                name=name,
-                public=is_public,
-                description=f"PARADOX Flet tarafından oluşturuldu. Sanatçılar: {', '.join(self.selected_artists.values())}"
-            )
-            self._log(f"Yeni playlist oluşturuldu: {playlist['name']} ({playlist['id']})", "succ")
-            return playlist['id']
-        
-        elif mode in ["OVERWRITE", "APPEND"]:
-            if not existing_id:
-                raise ValueError("Varolan bir playlist'i yönetmek için ID veya URL girmelisiniz.")
-            
-            try:
-                playlist = self.sp.playlist(existing_id)
-            except SpotifyException as e:
-                if '404' in str(e):
-                    raise SpotifyException(404, -1, f"Playlist ID '{existing_id}' bulunamadı.")
-                raise e
-
-            if mode == "OVERWRITE":
-                self._log(f"Varolan playlist '{playlist['name']}' siliniyor (overwrite hazırlığı)...", "warn")
-                # Overwrite için tüm parçaları temizleme:
-                if playlist['tracks']['total'] > 0:
-                    # Tüm parçaların snapshot ID'sini alıp toplu silme yapıyoruz
-                    # 100'erli çekim yapıp siliyoruz
-                    tracks_to_remove = []
-                    results = self.sp.user_playlist_tracks(self.current_user_id, existing_id, limit=100)
-                    while results:
-                        tracks_to_remove.extend([
-                            {'uri': item['track']['uri']} 
-                            for item in results['items'] 
-                            if item.get('track') and item['track'].get('uri')
-                        ])
-                        if results['next']:
-                            results = self.sp.next(results)
-                        else:
-                            results = None
-                            
-                    # Sadece tekil URI'leri al
-                    unique_uris_to_remove = list({t['uri']: t for t in tracks_to_remove}.values())
-                    
-                    if unique_uris_to_remove:
-                         self.sp.playlist_remove_all_occurrences_of_items(existing_id, unique_uris_to_remove)
-                         self._log(f"Playlist '{playlist['name']}' içerisindeki tüm parçalar ({len(unique_uris_to_remove)}) silindi.", "cyan")
-                    else:
-                        self._log(f"Playlist '{playlist['name']}' zaten boş veya parça bulunamadı.", "cyan")
-
-
-            self._log(f"Playlist ID kullanılıyor: {playlist['name']} ({playlist['id']})", "succ")
-            return playlist['id']
-            
-        else:
-            raise ValueError("Geçersiz Playlist Modu.")
-            
-    def _add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> int:
-        added_count = 0
-        chunk_size = 100
-        for i in range(0, len(track_uris), chunk_size):
-            chunk = track_uris[i:i + chunk_size]
-            self.sp.playlist_add_items(playlist_id, chunk)
-            added_count += len(chunk)
-            self._update_flow_stats("ADDING_TRACKS", current=i, total=len(track_uris), added=added_count)
-            time.sleep(0.5) 
-        return added_count
-    
-    def _upload_playlist_cover(self, playlist_id: str, image_url: Optional[str]):
-        if not image_url:
-            self._log("Playlist kapağı için sanatçı resmi bulunamadı.", "warn")
-            return
-        
-        try:
-            response = requests.get(image_url, stream=True)
-            response.raise_for_status()
-            
-            img = Image.open(BytesIO(response.content))
-            img = img.resize((300, 300)) 
-
-            buffered = BytesIO()
-            img.save(buffered, format="JPEG")
-            
-            base64_image = base64.b64encode(buffered.getvalue()).decode('utf-8')
-
-            self.sp.playlist_upload_cover_image(playlist_id, base64_image)
-            self._log("Playlist kapağı başarıyla güncellendi.", "succ")
-
-        except Exception as e:
-            self._log(f"Playlist kapağı yüklenirken hata oluştu: {e}", "error")
-
     def _start_flow_click(self, e):
         if not self.sp or not self.selected_artists: return self._log("Gerekli bilgiler eksik.", "error")
         self.set_ui_enabled(False)
         self._update_status("Akış Başlatıldı...", "info")
         threading.Thread(target=self._worker_main_flow).start()
     
-    def _worker_main_flow(self):
-        self._log("Ana akış başlatıldı: Albüm/Parça toplama ve Playlist oluşturma.", "warn")
-
-        try:
-            # 1. GEREKLİ AYARLARI AL
-            album_types = self._get_album_types()
-            exclude_short = self.exclude_short_check.value
-            playlist_name = self.playlist_name_entry.value.strip()
-            existing_playlist_input = self.existing_playlist_entry.value.strip()
-            playlist_mode = self.playlist_mode_combo.value
-            is_public = self.public_check.value
-            sort_type = self.sort_combo.value
-            
-            if not self.selected_artists:
-                raise ValueError("Lütfen en az bir sanatçı seçin.")
-            if not album_types and sort_type != "ICEBERG":
-                raise ValueError("Lütfen en az bir albüm tipi seçin (Album/Single/Compilation).")
-
-            all_track_uris: Set[str] = set()
-            final_track_list: List[str] = []
-            
-            # 2. PARÇALARI TOPLA (MODA GÖRE AYIRMA)
-            
-            if sort_type == "ICEBERG":
-                self._log("Buzdağı Modu Etkin: Her sanatçıdan maks. 40 parça toplanıyor.", "warn")
-                
-                total_artists = len(self.selected_artists)
-                for i, (artist_id, artist_name) in enumerate(self.selected_artists.items()):
-                    self._log(f"[{i+1}/{total_artists}] Sanatçı için Buzdağı parçaları toplanıyor: {artist_name}", "cyan")
-                    artist_tracks = self._get_artist_tracks_iceberg(artist_id, exclude_short)
-                    all_track_uris.update(artist_tracks)
-                    
-                    self._update_flow_stats("TRACK_COUNT", current=len(all_track_uris), total=total_artists, added=0)
-                    time.sleep(0.01)
-
-                final_track_list = list(all_track_uris)
-
-            else: # Normal Akış Modları (TRACK, POPULARITY, TOP_TRACKS)
-                
-                # Albüm toplama
-                all_albums: List[dict] = []
-                
-                for artist_id, artist_name in self.selected_artists.items():
-                    self._log(f"Sanatçı albümleri toplanıyor: {artist_name}", "cyan")
-                    albums = self._get_artist_albums(artist_id, album_types)
-                    all_albums.extend(albums)
-                    
-                self._log(f"Toplam {len(all_albums)} benzersiz albüm/single bulundu.", "succ")
-                self._update_flow_stats("ALBUM_COUNT", current=0, total=len(all_albums), added=0)
-                
-                if not all_albums:
-                    raise ValueError("Seçili kriterlere uygun albüm/single bulunamadı.")
-                
-                # Parça toplama
-                for i, album in enumerate(all_albums):
-                    album_name = album.get('name', 'Bilinmeyen Albüm')
-                    self._log(f"[{i+1}/{len(all_albums)}] Albüm parçaları toplanıyor: {album_name}", "cyan")
-                    
-                    track_uris = self._get_tracks_from_album(album['id'], exclude_short)
-                    all_track_uris.update(track_uris)
-                    
-                    self._update_flow_stats("ALBUM_COUNT", current=i + 1, total=len(all_albums), added=0)
-                    self._update_flow_stats("TRACK_COUNT", current=len(all_track_uris), total=len(all_albums), added=0)
-                    time.sleep(0.01)
-                    
-                final_track_list = list(all_track_uris)
+    def _create_engine(self) -> "PlaylistEngine":
+        from paradox_async import AsyncHarvester
+        from paradox_engine import HARVEST_WORKERS, PlaylistEngine
+
+        async_harvester = None
+        if self.async_check.value and self._async_supported:
+            async_harvester = AsyncHarvester(
+                self.sp.auth_manager, self.rate_limiter, self.metadata_cache, log=self._log, request_stats=self.request_stats
+            )
+        return PlaylistEngine(
+            self.sp, self.current_user_id, self.metadata_cache, self.write_pacer,
+            log=self._log, progress=self._update_flow_stats, workers=HARVEST_WORKERS,
+            async_harvester=async_harvester, request_stats=self.request_stats, profile_path=PROFILE_STORE
+        )
 
-                # Not: POPULARITY veya TOP_TRACKS sıralama mantığı burada uygulanabilir.
-            
-            self._log(f"Toplam {len(final_track_list)} benzersiz parça URI toplandı.", "succ")
+    def _build_job_spec(self) -> "JobSpec":
+        from paradox_engine import JobSpec
+
+        max_tracks_input = (self.max_tracks_entry.value or "").strip()
+        if max_tracks_input and not max_tracks_input.isdigit():
+            raise ValueError("Maks. parça sayısı bir tam sayı olmalıdır.")
+
+        return JobSpec(
+            artists=dict(self.selected_artists),
+            album_types=self._get_album_types(),
+            sort_type=self.sort_combo.value,
+            playlist_mode=self.playlist_mode_combo.value,
+            playlist_name=self.playlist_name_entry.value.strip(),
+            existing_playlist=self.existing_playlist_entry.value.strip(),
+            is_public=self.public_check.value,
+            exclude_short=self.exclude_short_check.value,
+            max_tracks=int(max_tracks_input) if max_tracks_input else None,
+            cover_image_url=self.current_artist_image_url,
+            dedupe_rule=self.dedupe_combo.value,
+            cover_style="MOSAIC" if self.mosaic_cover_check.value else "ARTIST",
+        )
 
-            if not final_track_list:
-                raise ValueError("Eklenecek parça bulunamadı.")
+    def _worker_main_flow(self):
+        from spotipy import SpotifyException
 
-            # 3. PLAYLIST OLUŞTUR/YÖNET
-            playlist_id = self._create_or_manage_playlist(
-                mode=playlist_mode, 
-                name=playlist_name, 
-                existing_id=self.playlist_id_from_input(existing_playlist_input), 
-                is_public=is_public
-            )
-            self.current_playlist_id = playlist_id
-            
-            # 4. PLAYLIST'E PARÇALARI EKLE
-            self._log(f"Parçalar playlist'e ekleniyor (Toplam {len(final_track_list)} parça)...", "warn")
-            self._update_flow_stats("ADDING_TRACKS", current=0, total=len(final_track_list), added=0)
-            
-            added_count = self._add_tracks_to_playlist(playlist_id, final_track_list)
-            
-            # 5. (OPSİYONEL) PLAYLIST KAPAĞINI YÜKLE
-            self._upload_playlist_cover(playlist_id, self.current_artist_image_url)
-            
-            # 6. SONUÇLARI GÖSTER
-            final_playlist_data = self.sp.playlist(playlist_id)
+        try:
+            result = self._create_engine().run(self._build_job_spec())
+            self.current_playlist_id = result.playlist_id
             
-            self._log(f"Akış BAŞARILI. '{final_playlist_data['name']}' adlı playlist oluşturuldu/güncellendi. Toplam {added_count} parça eklendi.", "succ")
             self._update_status("AKIM TAMAMLANDI.", "succ")
             
-            self.page.run_thread(self._update_playlist_preview, final_playlist_data, self.current_artist_image_url)
+            self._update_playlist_preview(result.playlist, self.current_artist_image_url)
 
         except SpotifyException as ex:
             error_msg = f"Spotify API Hatası: {ex.http_status} - {ex.msg}"
             self._log(error_msg, "error")
             self._update_status("API HATASI! Logları Kontrol Edin.", "err")
-            self.page.run_thread(lambda: setattr(self.flow_stats_wrapper, 'visible', False))
+            self._hide_flow_stats()
 
         except ValueError as ex:
             error_msg = f"Kullanıcı Girişi Hatası: {ex}"
             self._log(error_msg, "error")
             self._update_status("GİRİŞ HATASI! Logları Kontrol Edin.", "err")
-            self.page.run_thread(lambda: setattr(self.flow_stats_wrapper, 'visible', False)) 
+            self._hide_flow_stats()
             
         except Exception as ex:
             self._log(f"Ana Akışta Kritik Hata: {ex}", "error")
             self._update_status("KRİTİK HATA! Logları kontrol edin.", "err")
-            self.page.run_thread(lambda: setattr(self.flow_stats_wrapper, 'visible', False)) 
+            self._hide_flow_stats()
 
         finally:
             self.page.run_thread(lambda: self.set_ui_enabled(True))
@@ -1118,5 +1231,7 @@ if __name__ == "__main__":
     if sys.platform.startswith('win'):
         import multiprocessing
         multiprocessing.freeze_support()
-        
+
+    # Flet istemcisi açılırken ağ katmanı paralel yüklenir; pencere bu modülleri beklemez
+    threading.Thread(target=preload_backend, daemon=True).start()
     ft.app(target=main)
\ No newline at end of file